@@ -1,8 +1,7 @@
 import sys
 from pathlib import Path
 import streamlit as st
-import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import time
@@ -15,7 +14,19 @@ ROOT = Path(__file__).resolve().parent
 sys.path.append(str(ROOT))
 
 # Import your enhanced prediction module
-from predict import predict_stock_enhanced, log_to_csv
+import predict
+from predict import predict_stock_enhanced, log_to_csv, EnhancedStockPrediction, RealTimePriceFetcher
+from config import Config
+from src.prediction_store import PredictionStore
+from src.chart_data import get_chart_data, price_stats, OVERLAYS, RESOLUTION_LABELS
+from src import tracing
+from src.tracing import span
+from src.lazy_imports import plotly_go     # plotly loads on the first chart, not at startup
+
+predict.RESULT_CACHE_SOURCE = 'app'     # Reruns reuse results of unchanged inputs (src/result_cache.py)
+
+# Charts page ranges, in sessions (None = full history)
+CHART_RANGES = {"3M": 90, "6M": 126, "1Y": 252, "5Y": 1260, "Max": None}
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -780,6 +791,34 @@ def get_chart_theme():
         }
     }
 
+@st.cache_resource
+def get_prediction_store():
+    """One SQLite connection per server process (WAL lets predict.py write concurrently)"""
+    return PredictionStore()
+
+@st.cache_data(ttl=300)
+def load_eod_results():
+    """Latest EOD batch run (eod_pipeline.py) and the newest recent {symbol: prediction fields}; (None, {}) if none is recent"""
+    run = get_prediction_store().latest_batch_run()
+    if run is None:
+        return None, {}
+    cutoff = datetime.now() - timedelta(hours=Config.EOD_MAX_AGE_HOURS)
+    if datetime.strptime(run['finished_at'], '%Y-%m-%d %H:%M:%S') < cutoff:
+        return None, {}
+    return run, get_prediction_store().batch_details('eod', since=cutoff.strftime('%Y-%m-%d %H:%M:%S'))
+
+def get_prediction(stock: str):
+    """(prediction, precomputed) - the latest EOD result for universe symbols, on demand for the rest"""
+    run, results = load_eod_results()
+    if stock.upper() in results:
+        return EnhancedStockPrediction(**results[stock.upper()]), True
+    return predict_stock_enhanced(stock), False
+
+def prefetch_live_quotes(stocks):
+    """One batched quote download for the symbols get_prediction will compute on demand"""
+    run, results = load_eod_results()
+    RealTimePriceFetcher.prefetch([s for s in stocks if s.upper() not in results])
+
 # ============================================================================
 # VISITOR COUNTER DISPLAY - RESET TO START FROM LOW NUMBER
 # ============================================================================
@@ -1262,23 +1301,31 @@ def render_sidebar():
         # Stock Selection Section - ONLY 6 STOCKS
         st.markdown("### 📊 Stock Selection")
         
-        st.markdown("""
+        st.markdown(f"""
         <div style="background: rgba(138, 43, 226, 0.2); padding: 0.8rem; border-radius: 12px; 
                     margin-bottom: 1rem; border: 1px solid rgba(167, 139, 250, 0.3);">
             <div style="text-align: center; color: #a78bfa; font-size: 0.85rem; font-weight: 600;">
-                🎯 Top 6 Tech Giants
+                🎯 Universe: {Config.DEFAULT_UNIVERSE} ({len(Config.SUPPORTED_STOCKS)} stocks)
             </div>
         </div>
         """, unsafe_allow_html=True)
         
-        # FIXED LIST - Only 6 stocks
-        AVAILABLE_STOCKS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA"]
+        # Configured universe (universes/<Config.DEFAULT_UNIVERSE>.txt)
+        AVAILABLE_STOCKS = list(Config.SUPPORTED_STOCKS)
+        stock_info = {
+            "AAPL": "🍎 Apple Inc.",
+            "MSFT": "🪟 Microsoft Corp.",
+            "GOOGL": "🔍 Alphabet Inc.",
+            "AMZN": "📦 Amazon.com Inc.",
+            "NVDA": "🎮 NVIDIA Corp.",
+            "TSLA": "⚡ Tesla Inc."
+        }
         
         # Analysis mode
         analysis_mode = st.radio(
             "Analysis Mode",
-            ["Single Stock", "Portfolio Analysis (All 6)"],
-            help="Analyze one stock or all 6 stocks for comparison"
+            ["Single Stock", f"Portfolio Analysis (All {len(AVAILABLE_STOCKS)})"],
+            help=f"Analyze one stock or all {len(AVAILABLE_STOCKS)} stocks for comparison"
         )
         
         analyze_stocks = []
@@ -1288,43 +1335,34 @@ def render_sidebar():
                 "Select Stock",
                 AVAILABLE_STOCKS,
                 index=0,
-                help="Choose from the top 6 tech stocks"
+                help="Choose from the configured universe"
             )
             analyze_stocks = [ticker]
             
             # Show stock info
-            stock_info = {
-                "AAPL": "🍎 Apple Inc.",
-                "MSFT": "🪟 Microsoft Corp.",
-                "GOOGL": "🔍 Alphabet Inc.",
-                "AMZN": "📦 Amazon.com Inc.",
-                "NVDA": "🎮 NVIDIA Corp.",
-                "TSLA": "⚡ Tesla Inc."
-            }
+            info = stock_info.get(ticker, f"📈 {ticker}")
             
             st.markdown(f"""
             <div style="background: rgba(255,255,255,0.05); padding: 0.8rem; border-radius: 10px; 
                         margin-top: 0.5rem; text-align: center;">
-                <div style="font-size: 1.5rem; margin-bottom: 0.3rem;">{stock_info[ticker].split()[0]}</div>
-                <div style="color: rgba(255,255,255,0.7); font-size: 0.85rem;">{' '.join(stock_info[ticker].split()[1:])}</div>
+                <div style="font-size: 1.5rem; margin-bottom: 0.3rem;">{info.split()[0]}</div>
+                <div style="color: rgba(255,255,255,0.7); font-size: 0.85rem;">{' '.join(info.split()[1:])}</div>
             </div>
             """, unsafe_allow_html=True)
             
         else:
             # Portfolio mode - ALL 6 stocks
-            st.info("📊 Full portfolio analysis of all 6 tech giants")
+            st.info(f"📊 Full portfolio analysis of all {len(AVAILABLE_STOCKS)} stocks")
             analyze_stocks = AVAILABLE_STOCKS.copy()
             
             # Show all stocks with icons
-            st.markdown("""
-            <div style="background: rgba(255,255,255,0.05); padding: 1rem; border-radius: 10px; margin-top: 0.5rem;">
+            cells = "".join(f"<div>{stock_info.get(s, '📈').split()[0]} <strong>{s}</strong></div>"
+                            for s in AVAILABLE_STOCKS)
+            st.markdown(f"""
+            <div style="background: rgba(255,255,255,0.05); padding: 1rem; border-radius: 10px; margin-top: 0.5rem;
+                        max-height: 320px; overflow-y: auto;">
                 <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 0.5rem; font-size: 0.85rem;">
-                    <div>🍎 <strong>AAPL</strong></div>
-                    <div>🪟 <strong>MSFT</strong></div>
-                    <div>🔍 <strong>GOOGL</strong></div>
-                    <div>📦 <strong>AMZN</strong></div>
-                    <div>🎮 <strong>NVDA</strong></div>
-                    <div>⚡ <strong>TSLA</strong></div>
+                    {cells}
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -1340,22 +1378,27 @@ def render_sidebar():
             else:
                 with st.spinner("🔮 Running Enhanced LSTM Model..."):
                     st.session_state.predictions = {}
+                    computed = []       # On-demand predictions (EOD results are already logged)
                     progress_bar = st.progress(0)
                     status_text = st.empty()
+                    prefetch_live_quotes(analyze_stocks)
                     
                     for idx, stock in enumerate(analyze_stocks):
                         try:
                             status_text.text(f"Analyzing {stock}... ({idx+1}/{len(analyze_stocks)})")
                             
-                            # Run prediction
-                            pred = predict_stock_enhanced(stock)
+                            # Precomputed EOD result, or run prediction
+                            pred, precomputed = get_prediction(stock)
                             st.session_state.predictions[stock] = pred
+                            if not precomputed:
+                                computed.append(pred)
                             
                             # Update progress
                             progress_bar.progress((idx + 1) / len(analyze_stocks))
                             
                             # Small delay for visual effect
-                            time.sleep(0.3)
+                            if not precomputed:
+                                time.sleep(0.3)
                             
                         except Exception as e:
                             st.error(f"❌ Error predicting {stock}: {str(e)}")
@@ -1378,9 +1421,13 @@ def render_sidebar():
                         """)
                         
                         # Auto-log to CSV
+                        n_eod = len(st.session_state.predictions) - len(computed)
+                        if n_eod:
+                            st.caption(f"🌙 {n_eod} from the EOD run {load_eod_results()[0]['run_id']}")
                         try:
-                            log_to_csv(list(st.session_state.predictions.values()))
-                            st.caption("📝 Logged to predictions_log.csv")
+                            if computed:
+                                log_to_csv(computed)
+                                st.caption("📝 Logged to predictions.db")
                         except Exception as e:
                             st.warning(f"⚠️ Logging failed: {e}")
                     else:
@@ -2110,34 +2157,20 @@ def render_charts_page():
     """, unsafe_allow_html=True)
     
     try:
-        # Load stock data
-        csv_paths = [
-            Path(f"data/stock_data/{selected_stock}.csv"),
-            Path(f"data/{selected_stock}.csv"),
-        ]
-        
-        df = None
-        for csv_path in csv_paths:
-            if csv_path.exists():
-                df = pd.read_csv(csv_path)
-                break
-        
-        if df is not None:
-            df.columns = df.columns.str.lower()
-            
-            # Find date column
-            date_col = None
-            for col in ['date', 'datetime', 'timestamp']:
-                if col in df.columns:
-                    date_col = col
-                    break
-            
-            if date_col:
-                df[date_col] = pd.to_datetime(df[date_col])
-                df = df.set_index(date_col).sort_index()
-            
-            # Display recent data (90 days)
-            df_recent = df.tail(90)
+        # Range / resolution controls (bars come pre-aggregated and downsampled from the chart service)
+        ctrl_cols = st.columns([2, 1, 2])
+        with ctrl_cols[0]:
+            range_label = st.radio("Range", list(CHART_RANGES), index=0, horizontal=True)
+        with ctrl_cols[1]:
+            resolution = st.selectbox("Bars", ["auto", "D", "W", "M"], index=0,
+                                      format_func=lambda r: RESOLUTION_LABELS.get(r, "Auto"))
+        with ctrl_cols[2]:
+            overlays = st.multiselect("Overlays", list(OVERLAYS), default=["SMA 20", "SMA 50"])
+        
+        data = get_chart_data(selected_stock, days=CHART_RANGES[range_label], resolution=resolution)
+        
+        if data is not None:
+            go = plotly_go()
             
             # Price Chart with Targets
             st.markdown("### 📈 Price Chart with Prediction Levels")
@@ -2146,16 +2179,24 @@ def render_charts_page():
             
             # Candlestick chart
             fig.add_trace(go.Candlestick(
-                x=df_recent.index,
-                open=df_recent['open'],
-                high=df_recent['high'],
-                low=df_recent['low'],
-                close=df_recent['close'],
+                x=data['x'],
+                open=data['open'],
+                high=data['high'],
+                low=data['low'],
+                close=data['close'],
                 name='OHLC',
                 increasing_line_color='#22c55e',
                 decreasing_line_color='#ef4444'
             ))
             
+            # Cached indicator overlays
+            for name in overlays:
+                x, y = data['overlays'][name]
+                fig.add_trace(go.Scatter(
+                    x=x, y=y, mode='lines', name=name,
+                    line=dict(width=1.2, dash='dot' if name.startswith('BB') else 'solid')
+                ))
+            
             # Current price line
             fig.add_hline(
                 y=pred.current_price,
@@ -2209,13 +2250,15 @@ def render_charts_page():
             )
             
             st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{RESOLUTION_LABELS[data['resolution']]} bars • {len(data['x'])} plotted "
+                       f"from {data['n_source']} source bars")
             
             # Volume Chart
             st.markdown("### 📊 Trading Volume")
             
             fig_vol = go.Figure(data=[go.Bar(
-                x=df_recent.index,
-                y=df_recent['volume'],
+                x=data['x'],
+                y=data['volume'],
                 marker_color='#a78bfa',
                 marker_line_color='#8b5cf6',
                 marker_line_width=0.5,
@@ -2237,14 +2280,14 @@ def render_charts_page():
             
             col1, col2, col3, col4 = st.columns(4)
             
-            week_change = ((df_recent['close'].iloc[-1] - df_recent['close'].iloc[-5]) / df_recent['close'].iloc[-5] * 100) if len(df_recent) >= 5 else 0
-            month_change = ((df_recent['close'].iloc[-1] - df_recent['close'].iloc[-20]) / df_recent['close'].iloc[-20] * 100) if len(df_recent) >= 20 else 0
+            stats = price_stats(selected_stock, days=90)
+            week_change, month_change = stats['week_change'], stats['month_change']
             
             with col1:
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">90D High</div>
-                    <div class="metric-value">${df_recent['high'].max():.2f}</div>
+                    <div class="metric-value">${stats['high']:.2f}</div>
                 </div>
                 """, unsafe_allow_html=True)
             
@@ -2252,7 +2295,7 @@ def render_charts_page():
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">90D Low</div>
-                    <div class="metric-value">${df_recent['low'].min():.2f}</div>
+                    <div class="metric-value">${stats['low']:.2f}</div>
                 </div>
                 """, unsafe_allow_html=True)
             
@@ -2298,9 +2341,10 @@ def render_history_page():
     """, unsafe_allow_html=True)
     
     try:
-        log_path = Path("predictions_log.csv")
+        store = get_prediction_store()
+        summary = store.summary()
         
-        if not log_path.exists():
+        if not summary['total']:
             st.markdown("""
             <div class="glass-card" style="text-align: center; padding: 4rem 2rem;">
                 <div style="font-size: 4rem; margin-bottom: 1rem;">📝</div>
@@ -2309,22 +2353,16 @@ def render_history_page():
                     Your prediction history will appear here after you run your first analysis.
                 </p>
                 <div class="info-box" style="max-width: 600px; margin: 2rem auto;">
-                    <strong>📍 Log File Location:</strong> predictions_log.csv<br>
-                    The log file will be automatically created in the project root directory 
+                    <strong>📍 Log Location:</strong> predictions.db<br>
+                    The prediction store will be automatically created in the project root directory 
                     when you generate your first prediction.
                 </div>
             </div>
             """, unsafe_allow_html=True)
             return
         
-        # Load log data
-        log_df = pd.read_csv(log_path)
-        
-        # Convert numeric columns to proper types
-        if 'signal_score' in log_df.columns:
-            log_df['signal_score'] = pd.to_numeric(log_df['signal_score'], errors='coerce')
-        if 'risk_reward' in log_df.columns:
-            log_df['risk_reward'] = pd.to_numeric(log_df['risk_reward'], errors='coerce')
+        # Typed columns + aggregates come straight from SQL; no full-log scan per rerun
+        total = summary['total']
         
         # Summary Section
         st.markdown("### 📊 Log Summary")
@@ -2335,13 +2373,13 @@ def render_history_page():
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-label">Total Predictions</div>
-                <div class="metric-value">{len(log_df)}</div>
-                <div class="metric-subtitle">All-time</div>
+                <div class="metric-value">{total}</div>
+                <div class="metric-subtitle">All-time{f" · {summary['accuracy']:.0%} hit ({summary['resolved']} resolved)" if summary['resolved'] else ""}</div>
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
-            unique_stocks = log_df['symbol'].nunique() if 'symbol' in log_df.columns else 0
+            unique_stocks = summary['symbols']
             st.markdown(f"""
             <div class="metric-card">
                 <div class="metric-label">Unique Stocks</div>
@@ -2351,21 +2389,18 @@ def render_history_page():
             """, unsafe_allow_html=True)
         
         with col3:
-            if 'action' in log_df.columns:
-                trade_signals = log_df['action'].str.contains('BUY|SELL', case=False, na=False).sum()
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-label">Trade Signals</div>
-                    <div class="metric-value" style="color: #22c55e;">{trade_signals}</div>
-                    <div class="metric-subtitle">{trade_signals/len(log_df)*100:.1f}%</div>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.metric("Trade Signals", "N/A")
+            trade_signals = summary['trade_signals']
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-label">Trade Signals</div>
+                <div class="metric-value" style="color: #22c55e;">{trade_signals}</div>
+                <div class="metric-subtitle">{trade_signals/total*100:.1f}%</div>
+            </div>
+            """, unsafe_allow_html=True)
         
         with col4:
-            if 'signal_score' in log_df.columns:
-                avg_score = log_df['signal_score'].mean()
+            avg_score = summary['avg_score']
+            if avg_score is not None:
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">Avg Score</div>
@@ -2377,8 +2412,8 @@ def render_history_page():
                 st.metric("Avg Score", "N/A")
         
         with col5:
-            if 'risk_reward' in log_df.columns:
-                avg_rr = log_df['risk_reward'].mean()
+            avg_rr = summary['avg_rr']
+            if avg_rr is not None:
                 st.markdown(f"""
                 <div class="metric-card">
                     <div class="metric-label">Avg R:R</div>
@@ -2394,29 +2429,23 @@ def render_history_page():
         # Filters
         st.markdown("### 🔍 Filters")
         
-        filter_cols = st.columns(3)
+        filter_cols = st.columns(4)
         
         with filter_cols[0]:
-            if 'symbol' in log_df.columns:
-                selected_symbols = st.multiselect(
-                    "Filter by Symbol",
-                    options=sorted(log_df['symbol'].unique()),
-                    default=[],
-                    help="Select specific stocks to view"
-                )
-            else:
-                selected_symbols = []
+            selected_symbols = st.multiselect(
+                "Filter by Symbol",
+                options=store.distinct('symbol'),
+                default=[],
+                help="Select specific stocks to view"
+            )
         
         with filter_cols[1]:
-            if 'action' in log_df.columns:
-                selected_actions = st.multiselect(
-                    "Filter by Action",
-                    options=sorted(log_df['action'].unique()),
-                    default=[],
-                    help="Filter by trade action"
-                )
-            else:
-                selected_actions = []
+            selected_actions = st.multiselect(
+                "Filter by Action",
+                options=store.distinct('action'),
+                default=[],
+                help="Filter by trade action"
+            )
         
         with filter_cols[2]:
             show_rows = st.selectbox(
@@ -2426,24 +2455,20 @@ def render_history_page():
                 help="Number of rows to display"
             )
         
-        # Apply filters
-        filtered_df = log_df.copy()
-        if selected_symbols:
-            filtered_df = filtered_df[filtered_df['symbol'].isin(selected_symbols)]
-        if selected_actions:
-            filtered_df = filtered_df[filtered_df['action'].isin(selected_actions)]
+        # Filtering, sorting (most recent first) and paging run in SQL
+        filtered_count = store.count(selected_symbols, selected_actions)
+        page_size = filtered_count if show_rows == "All" else int(show_rows)
+        n_pages = max(1, -(-filtered_count // max(page_size, 1)))
         
-        # Sort by timestamp (most recent first)
-        if 'timestamp' in filtered_df.columns:
-            filtered_df = filtered_df.sort_values('timestamp', ascending=False)
+        with filter_cols[3]:
+            page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1,
+                                   help=f"{n_pages} page(s)")
         
         # Display dataframe
         st.markdown("### 📄 Log Data")
         
-        if show_rows == "All":
-            display_df = filtered_df
-        else:
-            display_df = filtered_df.head(int(show_rows))
+        display_df = store.query(selected_symbols, selected_actions,
+                                 limit=page_size, offset=(int(page) - 1) * page_size)
         
         st.dataframe(
             display_df,
@@ -2451,7 +2476,22 @@ def render_history_page():
             height=400
         )
         
-        st.caption(f"Showing {len(display_df)} of {len(filtered_df)} filtered records ({len(log_df)} total)")
+        st.caption(f"Showing {len(display_df)} of {filtered_count} filtered records ({total} total)")
+        
+        # Per-symbol rollups (materialized on every insert / resolution)
+        st.markdown("### 📈 Per-Symbol Summary")
+        symbol_df = store.symbol_summary()
+        symbol_df['accuracy'] = symbol_df['accuracy'] * 100
+        symbol_df['avg_realized'] = symbol_df['avg_realized'] * 100
+        st.dataframe(
+            symbol_df.rename(columns={
+                'symbol': 'Symbol', 'predictions': 'Predictions', 'buys': 'Buy', 'sells': 'Sell',
+                'no_trade': 'No Trade', 'avg_score': 'Avg Score', 'avg_rr': 'Avg R:R',
+                'resolved': 'Resolved', 'accuracy': 'Accuracy %', 'avg_realized': 'Avg Realized %'
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
         
         # Download Options
         st.markdown("### 📥 Download Options")
@@ -2459,7 +2499,7 @@ def render_history_page():
         download_cols = st.columns(2)
         
         with download_cols[0]:
-            csv_filtered = filtered_df.to_csv(index=False)
+            csv_filtered = store.query(selected_symbols, selected_actions).to_csv(index=False)
             st.download_button(
                 label="📥 Download Filtered Log",
                 data=csv_filtered,
@@ -2469,7 +2509,7 @@ def render_history_page():
             )
         
         with download_cols[1]:
-            csv_full = log_df.to_csv(index=False)
+            csv_full = store.query().to_csv(index=False)
             st.download_button(
                 label="📥 Download Full Log",
                 data=csv_full,
@@ -2479,39 +2519,36 @@ def render_history_page():
             )
         
         # Performance Insights
-        if len(log_df) >= 10 and 'signal_score' in log_df.columns:
+        if total >= 10:
             st.markdown("---")
             st.markdown("### 📊 Performance Insights")
             
             insight_cols = st.columns(3)
             
             with insight_cols[0]:
-                if 'action' in log_df.columns:
-                    st.markdown("**Action Distribution:**")
-                    action_counts = log_df['action'].value_counts()
-                    
-                    for action, count in action_counts.head(5).items():
-                        percentage = count/len(log_df)*100
-                        st.markdown(f"""
-                        <div class="glass-card" style="padding: 0.5rem; margin-bottom: 0.5rem;">
-                            <div style="display: flex; justify-content: space-between;">
-                                <span>{action[:20]}</span>
-                                <strong>{count} ({percentage:.1f}%)</strong>
-                            </div>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: {percentage}%; background: #a78bfa;"></div>
-                            </div>
+                st.markdown("**Action Distribution:**")
+                action_counts = store.value_counts('action', limit=5)
+                
+                for action, count in action_counts.items():
+                    percentage = count/total*100
+                    st.markdown(f"""
+                    <div class="glass-card" style="padding: 0.5rem; margin-bottom: 0.5rem;">
+                        <div style="display: flex; justify-content: space-between;">
+                            <span>{action[:20]}</span>
+                            <strong>{count} ({percentage:.1f}%)</strong>
                         </div>
-                        """, unsafe_allow_html=True)
+                        <div class="progress-bar">
+                            <div class="progress-fill" style="width: {percentage}%; background: #a78bfa;"></div>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
             
             with insight_cols[1]:
                 st.markdown("**Score Distribution:**")
                 
-                # Use numeric comparisons only
-                excellent = (log_df['signal_score'] >= 75).sum()
-                good = ((log_df['signal_score'] >= 65) & (log_df['signal_score'] < 75)).sum()
-                marginal = ((log_df['signal_score'] >= 55) & (log_df['signal_score'] < 65)).sum()
-                weak = (log_df['signal_score'] < 55).sum()
+                buckets = store.score_buckets()
+                excellent, good = buckets['excellent'], buckets['good']
+                marginal, weak = buckets['marginal'], buckets['weak']
                 
                 score_data = [
                     ("Excellent (≥75)", excellent, '#22c55e'),
@@ -2521,7 +2558,7 @@ def render_history_page():
                 ]
                 
                 for label, count, color in score_data:
-                    percentage = count/len(log_df)*100 if len(log_df) > 0 else 0
+                    percentage = count/total*100
                     st.markdown(f"""
                     <div class="glass-card" style="padding: 0.5rem; margin-bottom: 0.5rem;">
                         <div style="display: flex; justify-content: space-between;">
@@ -2535,23 +2572,22 @@ def render_history_page():
                     """, unsafe_allow_html=True)
             
             with insight_cols[2]:
-                if 'symbol' in log_df.columns:
-                    st.markdown("**Most Analyzed Stocks:**")
-                    top_stocks = log_df['symbol'].value_counts().head(6)
-                    
-                    for stock, count in top_stocks.items():
-                        percentage = count/len(log_df)*100
-                        st.markdown(f"""
-                        <div class="glass-card" style="padding: 0.5rem; margin-bottom: 0.5rem;">
-                            <div style="display: flex; justify-content: space-between;">
-                                <strong>{stock}</strong>
-                                <span>{count} times ({percentage:.1f}%)</span>
-                            </div>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: {percentage}%; background: #a78bfa;"></div>
-                            </div>
+                st.markdown("**Most Analyzed Stocks:**")
+                top_stocks = store.value_counts('symbol', limit=6)
+                
+                for stock, count in top_stocks.items():
+                    percentage = count/total*100
+                    st.markdown(f"""
+                    <div class="glass-card" style="padding: 0.5rem; margin-bottom: 0.5rem;">
+                        <div style="display: flex; justify-content: space-between;">
+                            <strong>{stock}</strong>
+                            <span>{count} times ({percentage:.1f}%)</span>
                         </div>
-                        """, unsafe_allow_html=True)
+                        <div class="progress-bar">
+                            <div class="progress-fill" style="width: {percentage}%; background: #a78bfa;"></div>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
     
     except Exception as e:
         st.error(f"❌ Error loading log: {str(e)}")
@@ -2566,26 +2602,27 @@ def main():
     # Render sidebar (always visible)
     render_sidebar()
     
-    # Main content area - route to appropriate page
-    if st.session_state.current_page == "home":
-        render_home_page()
+    # Main content area - route to appropriate page (timed when STOCK_TRACE=1)
+    with span('page', page=st.session_state.current_page):
+        if st.session_state.current_page == "home":
+            render_home_page()
     
-    elif st.session_state.current_page == "predictions":
-        render_predictions_page()
+        elif st.session_state.current_page == "predictions":
+            render_predictions_page()
     
-    elif st.session_state.current_page == "portfolio":
-        render_portfolio_page()
+        elif st.session_state.current_page == "portfolio":
+            render_portfolio_page()
     
-    elif st.session_state.current_page == "charts":
-        render_charts_page()
+        elif st.session_state.current_page == "charts":
+            render_charts_page()
     
-    elif st.session_state.current_page == "history":
-        render_history_page()
+        elif st.session_state.current_page == "history":
+            render_history_page()
     
-    else:
-        # Default to home page
-        st.session_state.current_page = "home"
-        render_home_page()
+        else:
+            # Default to home page
+            st.session_state.current_page = "home"
+            render_home_page()
     
     # Footer - FIXED: Direct HTML without function calls
     st.markdown("---")
@@ -2608,6 +2645,10 @@ def main():
         </p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # Spans from this rerun (page render + any predictions it triggered)
+    if tracing.is_enabled():
+        tracing.flush()
 
 # ============================================================================
 # APPLICATION ENTRY POINT
@@ -2619,8 +2660,8 @@ if __name__ == "__main__":
 with st.sidebar:
     st.markdown("### 📊 Stock Selection")
     
-    # Default portfolio stocks
-    default_stocks = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA"]
+    # Default portfolio stocks (configured universe)
+    default_stocks = list(Config.SUPPORTED_STOCKS)
     
     analysis_mode = st.radio(
         "Analysis Mode",
@@ -2656,12 +2697,16 @@ with st.sidebar:
         else:
             with st.spinner("🔮 Running Enhanced LSTM Model..."):
                 st.session_state.predictions = {}
+                computed = []
                 progress_bar = st.progress(0)
+                prefetch_live_quotes(analyze_stocks)
                 
                 for idx, stock in enumerate(analyze_stocks):
                     try:
-                        pred = predict_stock_enhanced(stock)
+                        pred, precomputed = get_prediction(stock)
                         st.session_state.predictions[stock] = pred
+                        if not precomputed:
+                            computed.append(pred)
                         progress_bar.progress((idx + 1) / len(analyze_stocks))
                     except Exception as e:
                         st.error(f"Error predicting {stock}: {str(e)}")
@@ -2670,10 +2715,11 @@ with st.sidebar:
                     st.session_state.last_analysis_time = datetime.now()
                     st.success(f"✅ Analyzed {len(st.session_state.predictions)} stocks!")
                     
-                    # Auto-log to CSV
+                    # Auto-log to CSV (EOD results are already in the store)
                     try:
-                        log_to_csv(list(st.session_state.predictions.values()))
-                        st.info("📊 Logged to predictions_log.csv")
+                        if computed:
+                            log_to_csv(computed)
+                            st.info("📊 Logged to predictions.db")
                     except Exception as e:
                         st.warning(f"Logging failed: {e}")
     
@@ -3036,6 +3082,7 @@ with tab_analysis:
                     # Price chart with targets
                     st.markdown("### 📈 Price Chart with Targets (Last 90 Days)")
                     
+                    go = plotly_go()
                     fig = go.Figure()
                     
                     # Candlestick
@@ -3128,9 +3175,9 @@ with tab_logs:
     st.subheader("📋 Prediction History")
     
     try:
-        log_path = Path("predictions_log.csv")
-        if log_path.exists():
-            log_df = pd.read_csv(log_path)
+        store = get_prediction_store()
+        if store.count():
+            log_df = store.query()
             
             # Show summary
             st.markdown("### 📊 Log Summary")
@@ -3202,7 +3249,7 @@ with tab_logs:
             if show_rows == "All":
                 st.dataframe(filtered_df, use_container_width=True, height=400)
             else:
-                st.dataframe(filtered_df.tail(int(show_rows)), use_container_width=True, height=400)
+                st.dataframe(filtered_df.head(int(show_rows)), use_container_width=True, height=400)
             
             # Download buttons
             st.markdown("### 📥 Download Options")
@@ -3264,8 +3311,8 @@ with tab_logs:
             st.info("No prediction log found. Generate predictions to create a log.")
             st.markdown("""
             <div class="info-box">
-                <strong>📝 Log File Location:</strong> predictions_log.csv<br>
-                The log file will be automatically created in the project root directory 
+                <strong>📝 Log Location:</strong> predictions.db<br>
+                The prediction store will be automatically created in the project root directory 
                 when you generate your first prediction.
             </div>
             """, unsafe_allow_html=True)
@@ -0,0 +1,4 @@
+"""
+Benchmarks - Synthetic-universe timings of the predict / train / logging hot paths
+Run: python benchmarks/run.py [--quick]
+"""
@@ -0,0 +1,154 @@
+"""
+Benchmark History - Append-only run log keyed by git commit, and noise-aware comparisons
+A scenario regresses when its median slows by more than the tolerance AND by more than
+NOISE_K robust standard deviations (MAD) of the pooled repetition times, so a single noisy
+repetition on a busy machine does not fail the gate.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+HISTORY_FILE = "history.jsonl"
+DEFAULT_TOLERANCE = 0.15
+NOISE_K = 3.0
+
+# Hot paths gated more tightly (fraction of the baseline median)
+TOLERANCES = {
+    'predict_warm': 0.10,
+    'daemon': 0.10,
+    'portfolio': 0.10,
+    'features': 0.10,
+}
+
+
+def history_path(path=None) -> Path:
+    return Path(path or Config.BENCH_DIR / HISTORY_FILE)
+
+
+def scenario_times(metrics: dict) -> list:
+    """Repetition times of a scenario result (just the median when it kept none)"""
+    return list(metrics.get('times') or [metrics['seconds']])
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+def append_history(report: dict, path=None) -> Path:
+    """One JSON line per benchmark run: commit, machine, params and per-scenario times"""
+    path = history_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        'commit': report['git']['commit'],
+        'dirty': report['git']['dirty'],
+        'timestamp': report['timestamp'],
+        'hostname': report['machine'].get('hostname'),
+        'params': report['params'],
+        'scenarios': {name: {'seconds': m['seconds'], 'times': scenario_times(m)}
+                      for name, m in report['scenarios'].items() if 'error' not in m},
+    }
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+    return path
+
+
+def load_history(path=None) -> list:
+    path = history_path(path)
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_entries(history: list, report: dict, baseline: str = 'previous') -> list:
+    """
+    History runs to compare against, restricted to the same host and parameters:
+    'previous' = the latest other commit, 'latest' = the latest run, else a commit prefix.
+    All runs of the chosen commit are pooled.
+    """
+    comparable = [e for e in history
+                  if e.get('hostname') == report['machine'].get('hostname') and e.get('params') == report['params']]
+    if not comparable:
+        return []
+    current = report['git']['commit']
+    if baseline == 'latest':
+        commit = comparable[-1]['commit']
+    elif baseline == 'previous':
+        older = [e['commit'] for e in comparable if e['commit'] != current]
+        if not older:
+            return []
+        commit = older[-1]
+    else:
+        matches = [e['commit'] for e in comparable if e['commit'].startswith(baseline)]
+        if not matches:
+            return []
+        commit = matches[-1]
+    return [e for e in comparable if e['commit'] == commit]
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+def robust_sigma(samples) -> float:
+    samples = np.asarray(samples, dtype=float)
+    return float(1.4826 * np.median(np.abs(samples - np.median(samples))))
+
+
+def compare(report: dict, baseline: list, tolerance: float = None) -> list:
+    """Per-scenario diff rows: baseline / current medians, change, noise floor, status"""
+    rows = []
+    for name, metrics in report['scenarios'].items():
+        base_times = [t for e in baseline for t in e['scenarios'].get(name, {}).get('times', [])]
+        if 'error' in metrics or not base_times:
+            rows.append({'scenario': name, 'status': 'ERROR' if 'error' in metrics else 'NEW'})
+            continue
+        cur_times = scenario_times(metrics)
+        base, cur = float(np.median(base_times)), float(np.median(cur_times))
+        tol = tolerance if tolerance is not None else TOLERANCES.get(name, DEFAULT_TOLERANCE)
+        noise = NOISE_K * max(robust_sigma(base_times), robust_sigma(cur_times))
+        delta = cur - base
+        if delta > tol * base and delta > noise:
+            status = 'REGRESSION'
+        elif -delta > tol * base and -delta > noise:
+            status = 'FASTER'
+        else:
+            status = 'OK'
+        rows.append({'scenario': name, 'baseline': base, 'current': cur, 'change': delta / base,
+                     'tolerance': tol, 'noise': noise, 'status': status})
+    return rows
+
+
+def print_comparison(rows: list, baseline_commit: str, n_runs: int):
+    print("\n" + "="*90)
+    print(f"🔍 VS BASELINE {baseline_commit[:10]} ({n_runs} run{'s' if n_runs != 1 else ''} pooled)")
+    print("="*90)
+    print(f"   {'Scenario':<14} {'Baseline':>11} {'Current':>11} {'Change':>9} {'Tol':>6} {'Noise':>10}   Status")
+    print("-"*90)
+    icons = {'OK': '✅', 'FASTER': '🚀', 'REGRESSION': '❌', 'NEW': '🆕', 'ERROR': '⚠️ '}
+    for r in rows:
+        if 'baseline' not in r:
+            print(f"   {r['scenario']:<14} {'-':>11} {'-':>11} {'-':>9} {'-':>6} {'-':>10}   {icons[r['status']]} {r['status']}")
+            continue
+        print(f"   {r['scenario']:<14} {r['baseline']:>10.4f}s {r['current']:>10.4f}s {r['change']:>+8.1%} "
+              f"{r['tolerance']:>6.0%} {r['noise']:>9.4f}s   {icons[r['status']]} {r['status']}")
+    print("="*90)
+
+
+def check_regressions(report: dict, baseline: str = 'previous', tolerance: float = None, path=None) -> int:
+    """Compare a finished run with its baseline; returns the process exit code (1 = regression)"""
+    entries = baseline_entries(load_history(path), report, baseline)
+    if not entries:
+        print(f"\n⚠️  No comparable baseline '{baseline}' in {history_path(path)} (same host + parameters)")
+        return 0
+    rows = compare(report, entries, tolerance)
+    print_comparison(rows, entries[0]['commit'], len(entries))
+    regressed = [r['scenario'] for r in rows if r['status'] == 'REGRESSION']
+    if regressed:
+        print(f"❌ Regressed: {', '.join(regressed)}")
+        return 1
+    return 0
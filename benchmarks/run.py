@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner - python benchmarks/run.py [--quick] [--scenarios ...] [--save] [--baseline]
+Runs the scenarios against a synthetic universe under runs/benchmarks/ and writes one JSON
+result file (machine metadata + per-scenario metrics); --save / --baseline keep a per-commit
+history and fail the run when a hot path regresses.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from benchmarks.history import append_history, check_regressions
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.workspace import BenchWorkspace
+
+ROOT = Path(__file__).parent.parent
+
+DEFAULTS = {'symbols': 500, 'sizes': [8, 100, 500], 'years': 20, 'repeat': 3, 'feature_symbols': 20,
+            'train_symbols': 4, 'calibration_samples': 50_000, 'log_rows': 20_000}
+QUICK = {'symbols': 20, 'sizes': [8, 20], 'years': 8, 'repeat': 3, 'feature_symbols': 8,
+         'train_symbols': 2, 'calibration_samples': 10_000, 'log_rows': 5_000}
+
+
+# ============================================================================
+# METADATA
+# ============================================================================
+def git_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True,
+                                  timeout=10).stdout.strip()
+        except Exception:
+            return ''
+    return {'commit': git('rev-parse', 'HEAD'), 'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+
+
+def machine_info() -> dict:
+    import numpy as np
+    import pandas as pd
+
+    info = {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+    try:
+        info['memory_gb'] = round(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1e9, 1)
+    except (ValueError, OSError, AttributeError):
+        pass
+    for module in ('tensorflow', 'sklearn'):
+        if module in sys.modules:
+            info[module] = sys.modules[module].__version__
+    return info
+
+
+# ============================================================================
+# RUN
+# ============================================================================
+def run_benchmarks(opts) -> dict:
+    names = opts.scenarios or list(SCENARIOS)
+    results = {}
+    started = time.perf_counter()
+
+    with BenchWorkspace(opts.workspace, opts.symbols, opts.years, opts.seed, offline=not opts.online) as ws:
+        for name in names:
+            print(f"⏱️  {name}...", end="", flush=True)
+            try:
+                results[name] = SCENARIOS[name](ws, opts)
+                print(f" {results[name]['seconds']:.3f}s")
+            except Exception as e:
+                results[name] = {'error': f"{type(e).__name__}: {e}"}
+                print(f" ❌ {e}")
+                if opts.verbose:
+                    traceback.print_exc()
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git': git_info(),
+        'machine': machine_info(),
+        'params': {k: getattr(opts, k) for k in (*DEFAULTS, 'seed', 'online')},
+        'total_seconds': time.perf_counter() - started,
+        'scenarios': results,
+    }
+
+
+def print_report(report: dict):
+    print("\n" + "="*80)
+    print(f"📊 BENCHMARKS @ {report['git']['commit'][:10] or '?'}"
+          f"{' (dirty)' if report['git']['dirty'] else ''} | {report['machine']['cpu_count']} CPUs | "
+          f"{'online' if report['params']['online'] else 'offline'}")
+    print("="*80)
+    for name, metrics in report['scenarios'].items():
+        if 'error' in metrics:
+            print(f"   {name:<14} ❌ {metrics['error']}")
+            continue
+        extras = [f"{k}={v}" if isinstance(v, bool) else f"{k}={v:,.4g}" if isinstance(v, float) else f"{k}={v:,}"
+                  for k, v in metrics.items() if k not in ('seconds', 'min', 'times') and not isinstance(v, (list, dict))]
+        print(f"   {name:<14} {metrics['seconds']:>9.3f}s   " + "  ".join(extras))
+        if metrics.get('top_imports'):
+            print("   " + " " * 25 + "heaviest imports: " +
+                  ", ".join(f"{k} {v:.2f}s" for k, v in list(metrics['top_imports'].items())[:5]))
+    print("="*80)
+
+
+def budget_failures(report: dict) -> list:
+    """'scenario: metric' for every scenario that exceeded its own budget (e.g. startup)"""
+    return [f"{name}: {item}" for name, m in report['scenarios'].items() for item in m.get('over_budget', [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks on a synthetic OHLCV universe")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), help="Subset to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Small universe / short histories (smoke run)")
+    parser.add_argument("--symbols", type=int, help=f"Universe size (default: {DEFAULTS['symbols']})")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Portfolio sizes (default: 8 100 500)")
+    parser.add_argument("--years", type=int, help=f"History per symbol (default: {DEFAULTS['years']})")
+    parser.add_argument("--repeat", type=int, help="Timed repetitions per scenario (median reported)")
+    parser.add_argument("--feature-symbols", type=int, help="Symbols in the feature throughput scenario")
+    parser.add_argument("--train-symbols", type=int, help="Symbols in the sequence / training scenarios")
+    parser.add_argument("--calibration-samples", type=int, help="Probabilities per calibration fit")
+    parser.add_argument("--log-rows", type=int, help="Rows in the log ingestion scenario")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic universe seed (default: 0)")
+    parser.add_argument("--online", action="store_true",
+                        help="Keep yfinance live-price / SPY fetches (default: offline, local data only)")
+    parser.add_argument("--workspace", help="Universe + model directory (default: runs/benchmarks/universe_<years>y_seed<seed>)")
+    parser.add_argument("--output", help="Result JSON (default: runs/benchmarks/bench_<timestamp>.json)")
+    parser.add_argument("--verbose", action="store_true", help="Print tracebacks of failing scenarios")
+    parser.add_argument("--save", action="store_true",
+                        help="Append this run to runs/benchmarks/history.jsonl (keyed by git commit)")
+    parser.add_argument("--baseline", nargs="?", const="previous", metavar="COMMIT",
+                        help="Compare with a history baseline (default: previous commit; 'latest' or a commit "
+                             "prefix) and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float,
+                        help="Allowed slowdown as a fraction for every scenario (default: per-scenario, 0.10-0.15)")
+    opts = parser.parse_args()
+
+    for key, value in (QUICK if opts.quick else DEFAULTS).items():
+        if getattr(opts, key) is None:
+            setattr(opts, key, value)
+    opts.workspace = Path(opts.workspace or Config.BENCH_DIR / f"universe_{opts.years}y_seed{opts.seed}")
+
+    report = run_benchmarks(opts)
+    print_report(report)
+
+    output = Path(opts.output or Config.BENCH_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, default=str))
+    print(f"💾 Results: {output}\n")
+    
+    status = 0
+    over = budget_failures(report)
+    if over:
+        print(f"❌ Over budget: {', '.join(over)}")
+        status = 1
+    
+    # Compare before saving, so 'latest' means the last run before this one
+    if opts.baseline:
+        status = check_regressions(report, opts.baseline, opts.tolerance) or status
+    if opts.save:
+        print(f"📚 History: {append_history(report)}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
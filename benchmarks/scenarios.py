@@ -0,0 +1,464 @@
+"""
+Benchmark Scenarios - End-to-end timings of the predict / train / logging hot paths
+Each scenario takes an open BenchWorkspace and the run options and returns a flat dict of
+metrics; `seconds` is always the median wall time of the measured call.
+"""
+
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+@contextlib.contextmanager
+def quiet():
+    """Swallow the progress prints of predict.py / train.py while timing"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed(fn, repeat: int = 1, warmup: int = 0) -> dict:
+    """Median / min / all wall times of fn() over `repeat` runs; result of the last run"""
+    for _ in range(warmup):
+        fn()
+    times, result = [], None
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return {'seconds': float(np.median(times)), 'min': float(np.min(times)),
+            'times': [round(t, 6) for t in times], 'result': result}
+
+
+def _metrics(t: dict, **extra) -> dict:
+    return {'seconds': t['seconds'], 'min': t['min'], 'times': t['times'], **extra}
+
+
+# ============================================================================
+# STARTUP
+# ============================================================================
+# Cold-start budget (seconds) for the TensorFlow-free paths; run.py fails the run when exceeded
+STARTUP_BUDGET = {'import_seconds': 1.5, 'check_seconds': 5.0}
+
+
+def parse_importtime(stderr: str) -> list:
+    """(depth, module, self_us, cumulative_us) rows of `python -X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def startup(ws, opts) -> dict:
+    """
+    `import predict` under -X importtime (total, heaviest direct imports, whether TensorFlow
+    was pulled in) and the wall time of `python predict.py --check`, against STARTUP_BUDGET
+    """
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import predict'],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = parse_importtime(out.stderr)
+    total = next(cum for depth, name, _, cum in rows if name == 'predict' and depth == 0) / 1e6
+    # Direct imports of predict (depth 1 under it) - where the startup time goes
+    direct = sorted(((cum / 1e6, name) for depth, name, _, cum in rows if depth == 1), reverse=True)
+    loaded = {name.split('.')[0] for _, name, _, _ in rows}
+
+    check = [sys.executable, str(ROOT / 'predict.py'), '--check']
+    t = timed(lambda: subprocess.run(check, cwd=ROOT, capture_output=True, check=True), opts.repeat)
+
+    over = [k for k, v in (('import_seconds', total), ('check_seconds', t['seconds'])) if v > STARTUP_BUDGET[k]]
+    if 'tensorflow' in loaded:
+        over.append('tensorflow_imported')
+    return _metrics(t, import_seconds=total, tensorflow_imported='tensorflow' in loaded,
+                    top_imports={name: round(sec, 4) for sec, name in direct[:10]},
+                    budget=STARTUP_BUDGET, over_budget=over)
+
+
+# ============================================================================
+# PREDICT
+# ============================================================================
+def cold_child():
+    """Entry point of the fresh interpreter used by predict_cold (argv: root n years seed symbol offline)"""
+    root, n, years, seed, symbol, offline = sys.argv[1:7]
+    t0 = time.perf_counter()
+    import predict
+    from benchmarks.workspace import BenchWorkspace
+    t_import = time.perf_counter() - t0
+
+    with BenchWorkspace(root, int(n), int(years), int(seed), offline=offline == '1'):
+        t1 = time.perf_counter()
+        with quiet():
+            predict.predict_stock_enhanced(symbol)
+        t_first = time.perf_counter() - t1
+    print(json.dumps({'import_seconds': t_import, 'first_predict_seconds': t_first}))
+
+
+def predict_cold(ws, opts) -> dict:
+    """Fresh interpreter: import predict (TensorFlow) + model load + one prediction"""
+    symbol = ws.symbols[0]
+    cmd = [sys.executable, '-c', 'from benchmarks.scenarios import cold_child; cold_child()',
+           str(ws.root), str(ws.n_symbols), str(ws.years), str(ws.seed), symbol, '1' if ws.offline else '0']
+
+    def run():
+        out = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    t = timed(run, opts.repeat)
+    return _metrics(t, **t['result'])
+
+
+def predict_warm(ws, opts) -> dict:
+    """predict_stock_enhanced on one symbol with the model, tracker and imports already warm"""
+    import predict
+    from src.performance import StockPerformanceTracker
+
+    tracker = StockPerformanceTracker()
+    symbol = ws.symbols[0]
+    with quiet():
+        t = timed(lambda: predict.predict_stock_enhanced(symbol, tracker), max(opts.repeat, 5), warmup=1)
+    return _metrics(t, ms=t['seconds'] * 1000)
+
+
+def compiled_inference(ws, opts) -> dict:
+    """
+    One 60-day window through the compiled tf.function (seconds) vs the model.predict baseline,
+    plus a 256-window batch through both; outputs must match
+    """
+    from src.inference import KerasBackend, KerasPredictBackend, load_compiled_model
+
+    compiled = KerasBackend(load_compiled_model(ws.model_path))
+    baseline = KerasPredictBackend(compiled.compiled)
+    rng = np.random.default_rng(ws.seed)
+    batch = rng.normal(size=(256, *compiled.model.input_shape[1:])).astype(np.float32)
+    single = batch[:1]
+
+    repeat = max(opts.repeat, 20)
+    t = timed(lambda: compiled.predict(single), repeat, warmup=3)
+    t_base = timed(lambda: baseline.predict(single), repeat, warmup=3)
+    t_batch = timed(lambda: compiled.predict(batch), opts.repeat, warmup=1)
+    t_batch_base = timed(lambda: baseline.predict(batch), opts.repeat, warmup=1)
+    diff = max(float(np.max(np.abs(a - b))) for a, b in zip(t_batch['result'], t_batch_base['result']))
+    return _metrics(t, ms=t['seconds'] * 1000, predict_ms=t_base['seconds'] * 1000,
+                    speedup=t_base['seconds'] / t['seconds'], batch_ms=t_batch['seconds'] * 1000,
+                    batch_predict_ms=t_batch_base['seconds'] * 1000, max_abs_diff=diff)
+
+
+def result_cache(ws, opts) -> dict:
+    """predict_stock_enhanced served from the result cache (seconds = hit) vs recomputed (miss)"""
+    import predict
+    from src.performance import StockPerformanceTracker
+
+    tracker = StockPerformanceTracker()
+    symbol = ws.symbols[0]
+    predict.RESULT_CACHE_ENABLED = True
+    try:
+        cache = predict.get_result_cache()
+        with quiet():
+            predict.predict_stock_enhanced(symbol, tracker)
+            miss = timed(lambda: (cache.invalidate([symbol]), predict.predict_stock_enhanced(symbol, tracker)),
+                         opts.repeat)
+            t = timed(lambda: predict.predict_stock_enhanced(symbol, tracker), max(opts.repeat, 5), warmup=1)
+        cache.invalidate()
+    finally:
+        predict.RESULT_CACHE_ENABLED = False
+    return _metrics(t, hit_ms=t['seconds'] * 1000, miss_ms=miss['seconds'] * 1000,
+                    speedup=miss['seconds'] / t['seconds'])
+
+
+def daemon(ws, opts) -> dict:
+    """Round trip of predict.py --via-daemon's request to an in-process predict_daemon on a free port"""
+    import threading
+    from http.server import ThreadingHTTPServer
+
+    import predict
+    import predict_daemon
+
+    saved = (predict.PRICE_CSV_CACHE, predict.RealTimePriceFetcher.QUOTE_TTL, predict.MarketDataFetcher.MARKET_TTL)
+    server_ref = []
+    with quiet():
+        warm = predict_daemon.PredictionDaemon()
+        warm.warm()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), predict_daemon.make_handler(warm, server_ref))
+    server_ref.append(server)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        port = server.server_address[1]
+        symbol = ws.symbols[0]
+        t = timed(lambda: predict_daemon.request_predictions([symbol], port=port), max(opts.repeat, 5), warmup=1)
+    finally:
+        server.shutdown()
+        server.server_close()
+        predict.PRICE_CSV_CACHE, predict.RealTimePriceFetcher.QUOTE_TTL, predict.MarketDataFetcher.MARKET_TTL = saved
+        predict._PRICE_CSVS.clear()
+    return _metrics(t, ms=t['seconds'] * 1000, server_ms=t['result']['elapsed_ms'])
+
+
+def portfolio(ws, opts) -> dict:
+    """predict.main's per-symbol loop over the first N symbols, for each N in opts.sizes (seconds = largest N)"""
+    import predict
+    from src.performance import StockPerformanceTracker
+
+    tracker = StockPerformanceTracker()
+    with quiet():
+        predict.predict_stock_enhanced(ws.symbols[0], tracker)
+    out = {}
+    for n in sorted(s for s in opts.sizes if s <= len(ws.symbols)):
+        symbols = ws.symbols[:n]
+        with quiet():
+            t = timed(lambda: [predict.predict_stock_enhanced(s, tracker) for s in symbols], opts.repeat)
+        out[f"n{n}_seconds"] = t['seconds']
+        out[f"n{n}_ms_per_symbol"] = t['seconds'] * 1000 / n
+        out['times'] = t['times']
+    out['seconds'] = float(np.median(out.get('times', [0.0])))
+    return out
+
+
+def batch_scoring(ws, opts) -> dict:
+    """eod_pipeline's predict.predict_batch over the same N symbols as portfolio (seconds = largest N)"""
+    import predict
+    from src.performance import StockPerformanceTracker
+
+    tracker = StockPerformanceTracker()
+    with quiet():
+        predict.predict_batch(ws.symbols[:2], tracker)
+    out = {}
+    for n in sorted(s for s in opts.sizes if s <= len(ws.symbols)):
+        symbols = ws.symbols[:n]
+        with quiet():
+            t = timed(lambda: predict.predict_batch(symbols, tracker), opts.repeat)
+        out[f"n{n}_seconds"] = t['seconds']
+        out[f"n{n}_ms_per_symbol"] = t['seconds'] * 1000 / n
+        out['times'] = t['times']
+    out['seconds'] = float(np.median(out.get('times', [0.0])))
+    return out
+
+
+def screener(ws, opts) -> dict:
+    """
+    predict.py --screen over every workspace symbol vs unscreened predict_batch; `missed` counts
+    unscreened BUY / SELL calls the screen pruned (should stay 0: the filters mirror the engine's gate)
+    """
+    import predict
+    from src.performance import StockPerformanceTracker
+
+    tracker = StockPerformanceTracker()
+    with quiet():
+        full, _ = predict.predict_batch(ws.symbols, tracker)
+        t_full = timed(lambda: predict.predict_batch(ws.symbols, tracker), opts.repeat)
+        t = timed(lambda: predict.UniverseScreener.run(ws.symbols, performance_tracker=tracker), opts.repeat)
+    _, scored, report = t['result']
+    kept = {p.symbol for p in scored}
+    missed = sum(p.symbol not in kept for p in full if 'BUY' in p.action or 'SELL' in p.action)
+    return _metrics(t, symbols=len(ws.symbols), survivors=report['survivors'],
+                    screen_seconds=report['screen_seconds'], unscreened_seconds=t_full['seconds'],
+                    speedup=t_full['seconds'] / t['seconds'], missed=missed)
+
+
+# ============================================================================
+# FEATURES / SEQUENCES / TRAINING
+# ============================================================================
+def features(ws, opts) -> dict:
+    """create_prediction_features over full synthetic histories (compute only: own-trend market proxy)"""
+    import predict
+    from benchmarks.synthetic import generate_ohlcv
+
+    frames = [generate_ohlcv(s, ws.years, ws.seed) for s in ws.symbols[:opts.feature_symbols]]
+    rows = sum(len(f) for f in frames)
+    t = timed(lambda: [predict.create_prediction_features(f.copy(), fetch_market=False) for f in frames],
+              opts.repeat)
+    return _metrics(t, symbols=len(frames), rows=rows, rows_per_second=rows / t['seconds'])
+
+
+def _training_data(ws, opts):
+    """train.py's panel -> split -> scaled windows for the first opts.train_symbols symbols (cached)"""
+    if 'training' not in ws.cache:
+        import train
+
+        symbols = ws.symbols[:opts.train_symbols]
+        with quiet():
+            t_panel = timed(lambda: train.build_feature_panel(symbols))
+            panel = t_panel['result']
+            t_split = timed(lambda: train.split_panel(panel, train_end="2023-12-31", val_end="2024-12-31",
+                                                      test_end="2025-12-22"))
+            splits = t_split['result']
+            t_seq = timed(lambda: train.prepare_sequences(*[dict(s) for s in splits]))
+        ws.cache['training'] = (t_panel, t_split, t_seq)
+    return ws.cache['training']
+
+
+def sequences(ws, opts) -> dict:
+    """Feature panel build, time split and 60-day window construction (train.prepare_sequences)"""
+    t_panel, t_split, t_seq = _training_data(ws, opts)
+    train_seq, val_seq, test_seq, _ = t_seq['result']
+    windows = len(train_seq['X']) + len(val_seq['X']) + len(test_seq['X'])
+    return {'seconds': t_seq['seconds'], 'times': t_seq['times'], 'panel_seconds': t_panel['seconds'],
+            'split_seconds': t_split['seconds'], 'windows': windows,
+            'windows_per_second': windows / max(t_seq['seconds'], 1e-9)}
+
+
+def universe_stream(ws, opts) -> dict:
+    """
+    Peak traced memory of train.py's split over opts.feature_symbols symbols: whole panel in a
+    dict (walk-forward) vs iter_feature_panel's one-symbol-at-a-time stream (load_and_split_data)
+    """
+    import tracemalloc
+    import train
+
+    symbols = ws.symbols[:opts.feature_symbols]
+    split = dict(train_end="2023-12-31", val_end="2024-12-31", test_end="2025-12-22", verbose=False)
+
+    def peak(fn):
+        tracemalloc.start()
+        try:
+            with quiet():
+                fn()
+            return tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    panel_mb = peak(lambda: train.split_panel(train.build_feature_panel(symbols), **split))
+    stream_mb = peak(lambda: train.split_panel(train.iter_feature_panel(symbols), **split))
+    with quiet():
+        t = timed(lambda: train.split_panel(train.iter_feature_panel(symbols), **split), opts.repeat)
+    return _metrics(t, symbols=len(symbols), panel_peak_mb=panel_mb, stream_peak_mb=stream_mb,
+                    memory_ratio=stream_mb / panel_mb)
+
+
+def train_epoch(ws, opts) -> dict:
+    """One epoch of train.fit_model (all callbacks, checkpoint into the workspace); never repeated"""
+    import train
+
+    train_seq, val_seq, _, _ = _training_data(ws, opts)[2]['result']
+    path = ws.root / "models" / "bench_epoch.keras"
+    t = timed(lambda: train.fit_model(train_seq, val_seq, epochs=1, batch_size=32,
+                                      checkpoint_path=path, verbose=0))
+    return _metrics(t, samples=len(train_seq['X']), samples_per_second=len(train_seq['X']) / t['seconds'])
+
+
+def calibration(ws, opts) -> dict:
+    """fit_calibrator for every method on a validation-sized set of synthetic probabilities"""
+    from src.calibration import fit_calibrator
+
+    rng = np.random.default_rng(ws.seed)
+    y = rng.integers(0, 2, opts.calibration_samples)
+    probs = 1 / (1 + np.exp(-(rng.normal(0, 1.5, len(y)) + 0.8 * (2 * y - 1))))
+    out = {'samples': len(y)}
+    for method in ('temperature', 'platt', 'isotonic'):
+        t = timed(lambda: fit_calibrator(probs, y, method), opts.repeat)
+        out[f"{method}_seconds"] = t['seconds']
+        out.setdefault('times', [0.0] * len(t['times']))
+        out['times'] = [a + b for a, b in zip(out['times'], t['times'])]
+    out['seconds'] = float(np.median(out['times']))
+    return out
+
+
+# ============================================================================
+# PREDICTION LOG
+# ============================================================================
+def synthetic_log_rows(ws, n_rows: int) -> list:
+    """Prediction-log rows on real synthetic bars (so the resolver has outcomes to score)"""
+    from src.outcome_resolver import load_price_store
+    from src.prediction_store import LOG_FIELDS
+
+    rng = np.random.default_rng(ws.seed)
+    symbols = ws.symbols[:min(len(ws.symbols), 50)]
+    closes = {s: load_price_store(s)['close'] for s in symbols}
+    rows = []
+    for i in range(n_rows):
+        symbol = symbols[i % len(symbols)]
+        close = closes[symbol]
+        k = int(rng.integers(len(close) - 260, len(close)))
+        price = float(close.iloc[k])
+        up = bool(rng.random() < 0.5)
+        atr = price * 0.02
+        row = dict.fromkeys(LOG_FIELDS, '')
+        row.update({
+            'timestamp': (close.index[k] + pd.Timedelta(hours=17)).strftime('%Y-%m-%d %H:%M:%S'),
+            'symbol': symbol, 'price_date': close.index[k].strftime('%Y-%m-%d'),
+            'current_price': price, 'week_prob_up': float(rng.random()),
+            'week_direction': "UP" if up else "DOWN", 'confidence': "MEDIUM",
+            'confidence_score': float(rng.random()),
+            'target_high': price + (3 if up else -1) * atr, 'target_low': price + (2 if up else -2) * atr,
+            'stop_loss': price - (1.5 if up else -1.5) * atr, 'risk_reward': 1.6,
+            'market_regime': "BULL", 'volatility': 0.02, 'signal_score': float(rng.uniform(0, 100)),
+            'action': str(rng.choice(["🟢 BUY", "🔴 SELL", "⚪ NO TRADE"])),
+        })
+        rows.append(row)
+    return rows
+
+
+def log_ingest(ws, opts) -> dict:
+    """PredictionStore: bulk insert, portfolio-sized runs, rollup summary, paged query, outcome resolution"""
+    from src.outcome_resolver import resolve_outcomes
+    from src.prediction_store import PredictionStore
+
+    rows = synthetic_log_rows(ws, opts.log_rows)
+    db = ws.root / "bench_log.db"
+    out = {'rows': len(rows)}
+
+    def fresh_store():
+        for suffix in ('', '-wal', '-shm'):
+            Path(f"{db}{suffix}").unlink(missing_ok=True)
+        return PredictionStore(db)
+
+    def bulk():
+        with fresh_store() as store:
+            store.insert_many(rows)
+
+    def runs():
+        with fresh_store() as store:
+            for i in range(0, len(rows), 8):
+                store.insert_many(rows[i:i + 8])
+
+    t = timed(bulk, opts.repeat)
+    out['bulk_seconds'] = t['seconds']
+    out['times'] = t['times']
+    out['rows_per_second'] = len(rows) / t['seconds']
+    t = timed(runs, opts.repeat)
+    out['runs_of_8_seconds'] = t['seconds']
+
+    with PredictionStore(db) as store:
+        out['summary_ms'] = timed(store.summary, max(opts.repeat, 5))['seconds'] * 1000
+        out['query_page_ms'] = timed(lambda: store.query(limit=50, offset=len(rows) // 2),
+                                     max(opts.repeat, 5))['seconds'] * 1000
+    with quiet():
+        t = timed(lambda: resolve_outcomes(db, verbose=False))
+    out['resolve_seconds'] = t['seconds']
+    out['resolved'] = len(t['result'])
+    out['seconds'] = out['bulk_seconds']
+    return out
+
+
+# Run order (cheap, TF-free scenarios can be picked alone with --scenarios)
+SCENARIOS = {
+    'startup': startup,
+    'predict_cold': predict_cold,
+    'predict_warm': predict_warm,
+    'compiled_inference': compiled_inference,
+    'daemon': daemon,
+    'result_cache': result_cache,
+    'portfolio': portfolio,
+    'batch_scoring': batch_scoring,
+    'screener': screener,
+    'features': features,
+    'sequences': sequences,
+    'universe_stream': universe_stream,
+    'train_epoch': train_epoch,
+    'calibration': calibration,
+    'log_ingest': log_ingest,
+}
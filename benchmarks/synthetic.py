@@ -0,0 +1,124 @@
+"""
+Synthetic OHLCV Universe - Deterministic price history for benchmarks
+Geometric Brownian motion with calm/stressed volatility regimes, overnight gaps and
+regime-scaled volume, written in the same layouts the loaders read:
+data/{SYM}.csv (yfinance multi-header, predict.py / app.py) and data/{SYM}/{SYM}_data.csv
+(src.data_loader cache, train.py).
+"""
+
+import json
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+END_DATE = "2025-12-22"
+MARKET_SYMBOL = "SPY"
+TRADING_DAYS = 252
+
+# (daily vol, mean regime length in days) for calm / stressed markets
+REGIMES = ((0.012, 180), (0.030, 40))
+GAP_PROB = 0.02
+
+
+def synthetic_symbols(n: int) -> list:
+    return [f"SYN{i:03d}" for i in range(n)]
+
+
+def _rng(symbol: str, seed: int) -> np.random.Generator:
+    # Same symbol + seed -> same series, independent of universe size or generation order
+    return np.random.default_rng([seed, zlib.crc32(symbol.encode())])
+
+
+def generate_ohlcv(symbol: str, years: int = 20, seed: int = 0, end: str = END_DATE) -> pd.DataFrame:
+    """Daily open/high/low/close/volume over `years` x 252 business days ending at `end`"""
+    rng = _rng(symbol, seed)
+    n = years * TRADING_DAYS
+    dates = pd.bdate_range(end=end, periods=n)
+
+    # Two-state Markov volatility regime: alternating geometric run lengths, calm first
+    vols = np.array([v for v, _ in REGIMES])
+    mean_len = np.array([length for _, length in REGIMES])
+    n_runs = 2 * (n // mean_len.min() + 1)
+    lengths = rng.geometric(1 / mean_len[np.arange(n_runs) % 2])
+    state = np.repeat(np.arange(n_runs) % 2, lengths)[:n]
+    sigma = vols[state] * rng.uniform(0.7, 1.4)
+
+    # GBM close-to-close log returns, split into an overnight gap and an intraday move
+    mu = rng.uniform(-0.02, 0.15) / TRADING_DAYS
+    shocks = rng.standard_normal(n)
+    gaps = np.where(rng.random(n) < GAP_PROB, rng.normal(0, 3, n) * sigma, 0.0)
+    overnight = gaps + 0.2 * sigma * rng.standard_normal(n)
+    log_ret = mu - 0.5 * sigma ** 2 + sigma * shocks + gaps
+    close = rng.uniform(20, 400) * np.exp(np.cumsum(log_ret))
+    prev_close = np.concatenate([[close[0] / np.exp(log_ret[0])], close[:-1]])
+    open_ = prev_close * np.exp(overnight)
+
+    wick = np.abs(rng.standard_normal((2, n))) * sigma * 0.5
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    base_volume = rng.uniform(5e5, 5e7)
+    volume = base_volume * np.exp(0.3 * rng.standard_normal(n)) * (sigma / vols[0]) * (1 + 20 * np.abs(log_ret))
+
+    return pd.DataFrame({
+        'open': open_, 'high': high, 'low': low, 'close': close,
+        'volume': np.round(volume).astype(np.int64),
+    }, index=pd.DatetimeIndex(dates, name='Date'))
+
+
+# ============================================================================
+# WRITERS
+# ============================================================================
+def write_price_csv(df: pd.DataFrame, symbol: str, data_dir: Path) -> Path:
+    """data/{SYM}.csv in yfinance's download layout (Price / Ticker / Date header rows)"""
+    path = Path(data_dir) / f"{symbol}.csv"
+    body = df[['close', 'high', 'low', 'open', 'volume']]
+    with open(path, 'w') as f:
+        f.write("Price,Close,High,Low,Open,Volume\n")
+        f.write("Ticker," + ",".join([symbol] * 5) + "\n")
+        f.write("Date,,,,,\n")
+        body.to_csv(f, header=False, date_format='%Y-%m-%d', float_format='%.4f')
+    return path
+
+
+def write_cache_csv(df: pd.DataFrame, symbol: str, data_dir: Path) -> Path:
+    """data/{SYM}/{SYM}_data.csv as src.data_loader caches it (exchange-local timestamps)"""
+    path = Path(data_dir) / symbol / f"{symbol}_data.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = df.copy()
+    out.index = out.index.tz_localize('America/New_York')
+    out.index.name = 'Date'
+    out.to_csv(path, float_format='%.4f')
+    return path
+
+
+def generate_universe(data_dir, n_symbols: int, years: int = 20, seed: int = 0,
+                      verbose: bool = True) -> list:
+    """
+    Write SYN000..SYN{n-1} plus SPY (market trend) in both layouts.
+    Incremental: symbols already written with the same years/seed are kept, so growing
+    a universe from 100 to 500 only generates the 400 new ones.
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    symbols = synthetic_symbols(n_symbols)
+    params = {'years': years, 'seed': seed, 'end': END_DATE}
+
+    manifest_path = data_dir / "universe.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    have = manifest.get('n_symbols', 0) if manifest.get('params') == params else -1
+    if have >= n_symbols:
+        return symbols
+
+    todo = ([MARKET_SYMBOL] if have < 0 else []) + symbols[max(have, 0):]
+    if verbose:
+        print(f"🧪 Generating {len(todo)} synthetic symbols ({years} years each) -> {data_dir}")
+    for symbol in todo:
+        df = generate_ohlcv(symbol, years, seed)
+        write_price_csv(df, symbol, data_dir)
+        write_cache_csv(df, symbol, data_dir)
+    manifest_path.write_text(json.dumps({'params': params, 'n_symbols': n_symbols}))
+    return symbols
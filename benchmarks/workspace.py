@@ -0,0 +1,113 @@
+"""
+Benchmark Workspace - Points the pipeline at a synthetic universe in a scratch directory
+Config paths, the working directory (predict.py resolves data/ and models/ relative to it)
+and, offline, the yfinance live-price / SPY fetches are redirected for the duration. The
+prediction result cache is off, so scenarios time the computation itself.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from benchmarks.synthetic import MARKET_SYMBOL, generate_universe
+
+_CONFIG_PATHS = ('DATA_DIR', 'MODEL_DIR', 'MODEL_PATH', 'CALIBRATION_PATH', 'INFERENCE_DIR',
+                 'RUNS_DIR', 'TRACE_PATH', 'PREDICTION_DB', 'LEGACY_PREDICTION_LOG', 'RESULT_CACHE_DB')
+
+
+def ensure_model(model_path: Path) -> Path:
+    """
+    Untrained network with train.build_model's architecture (same latency as the real bundle;
+    benchmarks never depend on the shipped weights)
+    """
+    if not model_path.exists():
+        import train
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        train.build_model((60, 15)).save(str(model_path))
+    return model_path
+
+
+def _local_market_trend(df, retries: int = 3):
+    """Offline MarketDataFetcher.fetch_market_trend: same SPY 200-EMA join, from data/SPY.csv"""
+    from src.outcome_resolver import load_price_store
+
+    market = load_price_store(MARKET_SYMBOL)
+    ema_200 = market['close'].ewm(span=200, adjust=False).mean()
+    trend = (market['close'] > ema_200).astype(int).rename('market_trend')
+    df = df.join(trend, how='left')
+    df['market_trend'] = df['market_trend'].ffill().fillna(1).astype(int)
+    return df
+
+
+class BenchWorkspace:
+    """
+    with BenchWorkspace(root, n_symbols=100) as ws: ... ws.symbols ...
+    The universe and model are generated once per root and reused by later runs.
+    """
+
+    def __init__(self, root, n_symbols: int, years: int = 20, seed: int = 0, offline: bool = True):
+        self.root = Path(root).resolve()
+        self.n_symbols = n_symbols
+        self.years = years
+        self.seed = seed
+        self.offline = offline
+        self.symbols = []
+        self.cache = {}             # Shared between scenarios (e.g. prepared training windows)
+        self._saved = {}
+
+    @property
+    def model_path(self) -> Path:
+        return self.root / "models" / "stock_model_fixed.keras"
+
+    @property
+    def db_path(self) -> Path:
+        return self.root / "predictions.db"
+
+    def __enter__(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.symbols = generate_universe(self.root / "data", self.n_symbols, self.years, self.seed)
+
+        self._saved['config'] = {name: getattr(Config, name) for name in _CONFIG_PATHS}
+        Config.DATA_DIR = self.root / "data"
+        Config.MODEL_DIR = self.root / "models"
+        Config.MODEL_PATH = self.model_path
+        Config.CALIBRATION_PATH = Config.MODEL_DIR / "calibration.json"
+        Config.INFERENCE_DIR = Config.MODEL_DIR / "inference"
+        Config.RUNS_DIR = self.root / "runs"
+        Config.TRACE_PATH = Config.RUNS_DIR / "traces.jsonl"
+        Config.PREDICTION_DB = self.db_path
+        Config.LEGACY_PREDICTION_LOG = self.root / "predictions_log.csv"
+        Config.RESULT_CACHE_DB = Config.RUNS_DIR / "result_cache.db"
+
+        self._saved['cwd'] = os.getcwd()
+        os.chdir(self.root)
+        ensure_model(self.model_path)
+
+        # Scenarios time the computation; the result cache is measured on its own (result_cache)
+        import predict
+        self._saved['result_cache'] = predict.RESULT_CACHE_ENABLED
+        predict.RESULT_CACHE_ENABLED = False
+
+        if self.offline:
+            import predict
+            self._saved['fetchers'] = (predict.RealTimePriceFetcher.__dict__['update_df_with_current_price'],
+                                       predict.MarketDataFetcher.__dict__['fetch_market_trend'])
+            predict.RealTimePriceFetcher.update_df_with_current_price = staticmethod(lambda df, symbol: df)
+            predict.MarketDataFetcher.fetch_market_trend = staticmethod(_local_market_trend)
+        return self
+
+    def __exit__(self, *exc):
+        if 'fetchers' in self._saved:
+            import predict
+            live, market = self._saved.pop('fetchers')
+            predict.RealTimePriceFetcher.update_df_with_current_price = live
+            predict.MarketDataFetcher.fetch_market_trend = market
+        if 'result_cache' in self._saved:
+            import predict
+            predict.RESULT_CACHE_ENABLED = self._saved.pop('result_cache')
+        os.chdir(self._saved.pop('cwd'))
+        for name, value in self._saved.pop('config').items():
+            setattr(Config, name, value)
+        return False
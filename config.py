@@ -2,18 +2,41 @@
 FIXED CONFIG - 59-60%/69-70% with PROPER METRICS
 Strong moves only + No COVID + Class weights
 """
+import os
 from pathlib import Path
 from datetime import datetime
 
+
+def read_universe_file(path) -> list:
+    """Symbols of a universe file: whitespace / comma separated, '#' comments, order kept, deduplicated"""
+    symbols = []
+    for line in Path(path).read_text().splitlines():
+        symbols += line.split('#', 1)[0].replace(',', ' ').upper().split()
+    return list(dict.fromkeys(symbols))
+
+
 class Config:
     # Paths
     BASE_DIR = Path(__file__).parent
     DATA_DIR = BASE_DIR / "data"
     MODEL_DIR = BASE_DIR / "models"
     MODEL_PATH = MODEL_DIR / "stock_model_fixed.keras"
+    CALIBRATION_PATH = MODEL_DIR / "calibration.json"
+    RUNS_DIR = BASE_DIR / "runs"
+    TRACE_PATH = RUNS_DIR / "traces.jsonl"     # --profile / STOCK_TRACE=1 span output
+    BENCH_DIR = RUNS_DIR / "benchmarks"        # Synthetic universe + benchmarks/run.py results
+    INFERENCE_DIR = MODEL_DIR / "inference"
+    PREDICTION_DB = BASE_DIR / "predictions.db"
+    LEGACY_PREDICTION_LOG = BASE_DIR / "predictions_log.csv"   # Migrated into PREDICTION_DB once
+    RESULT_CACHE_DB = RUNS_DIR / "result_cache.db"             # Memoized predictions (src/result_cache.py)
+    PIPELINE_DIR = RUNS_DIR / "pipeline"       # eod_pipeline.py stage state + feature cache
+    UNIVERSE_DIR = BASE_DIR / "universes"      # Named symbol lists (src/universe.py)
     
-    # ALL 6 STOCKS - CLEAN PERIODS ONLY
-    SUPPORTED_STOCKS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'NVDA']
+    # Universe: universes/<name>.txt; STOCK_UNIVERSE=sp500 switches every default at once
+    DEFAULT_UNIVERSE = os.environ.get("STOCK_UNIVERSE", "default")
+    SUPPORTED_STOCKS = read_universe_file(UNIVERSE_DIR / f"{DEFAULT_UNIVERSE}.txt")
+    TRAIN_UNIVERSE = os.environ.get("STOCK_TRAIN_UNIVERSE", "train")    # train.py --universe
+    UNIVERSE_CHUNK = 50             # Symbols held in memory at once by per-symbol batch stages
     START_DATE = "2015-01-01"
     END_DATE_1 = "2019-12-31"      # Pre-COVID
     START_DATE_2 = "2022-01-01"     # Post-COVID
@@ -55,9 +78,58 @@ class Config:
     
     L2_REGULARIZATION = 0.00002
     
+    # Walk-forward evaluation (train.py --walk-forward)
+    WF_MODE = "expanding"           # "expanding" or "rolling"
+    WF_N_FOLDS = 10
+    WF_STEP_MONTHS = 6              # Test window per fold (folds step by this)
+    WF_VAL_MONTHS = 6
+    WF_TRAIN_YEARS = 5              # Rolling mode only
+    WF_END_DATE = "2025-12-22"
+    WF_MIN_SPLIT_ROWS = 100         # Per-symbol rows needed to keep a split
+    WF_EPOCHS = 50
+    WF_BATCH_SIZE = 32
+    
+    # Per-symbol accuracy tracking (predict.StockPerformanceTracker)
+    PERF_MIN_OUTCOMES = 5           # Outcomes needed before accuracy affects decisions
+    PERF_WINDOW = 20                # Rolling-accuracy window (ring buffer)
+    PERF_EWMA_ALPHA = 0.1           # Weight of the newest outcome in decayed accuracy
+    
+    # Inference export (train.py --export); predict.py picks the fastest passing backend
+    INFERENCE_QUANTIZE = True       # Also export dynamic-range int8 TFLite
+    
+    # Live quotes: one multi-ticker download per batch of symbols (RealTimePriceFetcher.prefetch)
+    QUOTE_BATCH_TTL = 120           # Seconds a prefetched quote is reused;
+                                    # the daemon uses its DAEMON_QUOTE_TTL instead
+    
+    # Prediction daemon (predict_daemon.py, predict.py --via-daemon)
+    DAEMON_HOST = "127.0.0.1"
+    DAEMON_PORT = 8765
+    DAEMON_TIMEOUT = 120            # Client seconds per request (cold symbols may retry live quotes)
+    DAEMON_QUOTE_TTL = 60           # Seconds a live quote (or failed fetch) is reused
+    DAEMON_MARKET_TTL = 900         # Seconds the SPY trend frame is reused
+    
+    # End-of-day pipeline (eod_pipeline.py, src/pipeline.py); app.py ignores runs older than EOD_MAX_AGE_HOURS
+    EOD_MAX_AGE_HOURS = 36
+    PIPELINE_JOBS = 4               # Threads for per-symbol stages (update, features)
+    MARKET_CLOSE_HOUR = 16          # Local hour after which today's session counts as complete
+    
+    # Screener (predict.py --screen): cheap panel filters before inference, top-K by signal score.
+    # BUY / SELL actions need a BULL / BEAR regime and < 3% daily volatility (WeightedDecisionEngine),
+    # so the default volatility cap and regimes only drop symbols that could not trade.
+    SCREEN_TOP_K = 10
+    SCREEN_MIN_DOLLAR_VOLUME = 5_000_000    # 20-day average close x volume
+    SCREEN_VOLATILITY = (0.003, 0.03)       # Daily return std (20 days), [min, max)
+    SCREEN_REGIMES = ("BULL", "BEAR")       # Regime labels containing one of these pass
+    SCREEN_MAX_STALE_DAYS = 5               # Calendar days behind the newest bar in the panel
+    
+    # Prediction result cache (src/result_cache.py); same TTL as the daemon's SPY trend,
+    # the one input not in the cache key
+    RESULT_CACHE_TTL = 900
+    
     @staticmethod
     def create_dirs():
         Config.DATA_DIR.mkdir(parents=True, exist_ok=True)
         Config.MODEL_DIR.mkdir(parents=True, exist_ok=True)
+        Config.RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
 Config.create_dirs()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+End-of-Day Pipeline - Incremental update -> features / resolve -> predict over the universe
+    python eod_pipeline.py                      # Config.SUPPORTED_STOCKS, only what changed since the last run
+    python eod_pipeline.py --skip-update        # score the CSVs as they are (e.g. right after update_data.py)
+    python eod_pipeline.py --force predict      # re-score every symbol
+    python eod_pipeline.py -s AAPL MSFT NVDA --table
+    python eod_pipeline.py --universe sp500     # any universes/*.txt list (src/universe.py)
+Stages skip symbols whose input hashes match their last successful run (src/pipeline.py), so a
+rerun with nothing new finishes in milliseconds. Scored predictions are stored under one run id
+and registered in batch_runs; app.py serves universe symbols from the latest results.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from config import Config
+from src import tracing
+from src.pipeline import STAGES, PipelineRunner, print_summary
+from src.universe import resolve_symbols
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental nightly pipeline over the configured universe")
+    parser.add_argument("-s", "--stocks", nargs="+", help="Symbols (default: Config.SUPPORTED_STOCKS)")
+    parser.add_argument("-u", "--universe", help="Named universe, list file or comma list (see src/universe.py)")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), help="Run only these stages")
+    parser.add_argument("--skip-update", action="store_true", help="Score the CSVs as they are (no update stage)")
+    parser.add_argument("--no-resolve", action="store_true",
+                        help="Skip scoring logged predictions against the new prices")
+    parser.add_argument("--force", nargs="+", choices=list(STAGES), default=[], metavar="STAGE",
+                        help="Re-run these stages for every symbol, changed or not")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help=f"Threads for per-symbol stages (default: {Config.PIPELINE_JOBS})")
+    parser.add_argument("--verbose", action="store_true", help="Show per-symbol output of every stage")
+    parser.add_argument("--table", action="store_true", help="Print the comparative table of what was scored")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage latency table and append spans to runs/traces.jsonl")
+    args = parser.parse_args()
+
+    if args.profile:
+        tracing.enable()
+
+    stages = set(args.stages or STAGES)
+    if args.skip_update:
+        stages.discard('update')
+    if args.no_resolve:
+        stages.discard('resolve')
+    symbols = resolve_symbols(args.stocks, args.universe)
+
+    print("\n" + "="*70)
+    print("🌙 END-OF-DAY PIPELINE")
+    print("="*70)
+    print(f"⏰ {datetime.now().strftime('%A, %B %d, %Y - %I:%M %p')}")
+    print(f"📈 Universe: {len(symbols)} symbols | Stages: {', '.join(s for s in STAGES if s in stages)}")
+    print("="*70)
+
+    start = time.perf_counter()
+    runner = PipelineRunner(symbols, jobs=args.jobs, force=args.force, stages=stages, verbose=args.verbose)
+    summary = runner.run()
+    print_summary(summary, runner.failed, runner.warnings, time.perf_counter() - start)
+
+    predictions = runner.predictions
+    if predictions and args.table:
+        import predict
+        predict.print_comparative_table(predictions)
+
+    if runner.run_id:
+        print(f"\n✅ EOD run {runner.run_id}: {len(predictions)}/{len(symbols)} symbols re-scored "
+              f"({sum('BUY' in p.action for p in predictions)} BUY, "
+              f"{sum('SELL' in p.action for p in predictions)} SELL)\n")
+    elif 'predict' in stages and not runner.failed:
+        print("\n✅ Up to date - nothing to re-score\n")
+
+    if args.profile:
+        tracing.print_profile(tracing.flush())
+    return 1 if runner.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,12 +29,18 @@ import logging
 logging.getLogger('tensorflow').setLevel(logging.ERROR)
 logging.getLogger('keras').setLevel(logging.ERROR)
 
-import tensorflow as tf
+# TensorFlow, scikit-learn and yfinance load on first use (src/lazy_imports.py)
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import List, Dict
 import argparse
-import csv
+import heapq
+import json
+
+from config import Config
+from src import tracing
+from src.tracing import span, traced
+from src.lazy_imports import robust_scaler, yfinance
 
 # Suppress yfinance logs
 yf_logger = logging.getLogger('yfinance')
@@ -47,14 +53,107 @@ yf_logger.setLevel(logging.CRITICAL)
 class RealTimePriceFetcher:
     """Fetch current prices from yfinance"""
     
+    QUOTE_TTL = 0           # Seconds a quote (or a failed fetch) is reused; 0 = always fetch (CLI)
+    _quotes = {}            # symbol -> (fetched_at, quote dict or None)
+    _prefetched = {}        # symbol -> (fetched_at, quote dict) from prefetch(); QUOTE_TTL or QUOTE_BATCH_TTL
+    
+    @staticmethod
+    def _cached_quote(symbol: str):
+        hit = RealTimePriceFetcher._quotes.get(symbol)
+        if hit and time.time() - hit[0] < RealTimePriceFetcher.QUOTE_TTL:
+            return hit
+        hit = RealTimePriceFetcher._prefetched.get(symbol)
+        if hit and time.time() - hit[0] < (RealTimePriceFetcher.QUOTE_TTL or Config.QUOTE_BATCH_TTL):
+            return hit
+        return None
+    
+    @staticmethod
+    def cached_failure(symbol: str) -> bool:
+        hit = RealTimePriceFetcher._cached_quote(symbol)
+        return hit is not None and hit[1] is None
+    
     @staticmethod
     def get_current_price(symbol: str) -> Dict:
         """
-        Fetch real-time price data from yfinance
+        Fetch real-time price data from yfinance (reused for QUOTE_TTL seconds when set)
         Returns: dict with current_price, price_date, high, low, volume
         """
+        hit = RealTimePriceFetcher._cached_quote(symbol)
+        if hit is not None:
+            if hit[1] is None:
+                raise ValueError(f"Could not fetch current price for {symbol} (cached failure)")
+            return dict(hit[1])
+        
+        try:
+            quote = RealTimePriceFetcher._fetch_quote(symbol)
+        except Exception:
+            if RealTimePriceFetcher.QUOTE_TTL:
+                RealTimePriceFetcher._quotes[symbol] = (time.time(), None)
+            raise
+        if RealTimePriceFetcher.QUOTE_TTL:
+            RealTimePriceFetcher._quotes[symbol] = (time.time(), quote)
+        return dict(quote)
+    
+    @staticmethod
+    def prefetch(symbols: List[str]) -> int:
+        """
+        Latest bar of every symbol in one multi-ticker download, so the per-symbol
+        get_current_price calls that follow make no request. Nothing is recorded for a
+        symbol missing from the batch (yf.download reports per-ticker errors as empty
+        columns) or when the download fails: those fetch on their own as before, with
+        retries and the ticker.info fallback. Returns the number of quotes fetched.
+        """
+        now = time.time()
+        symbols = [s for s in dict.fromkeys(s.upper() for s in symbols)
+                   if RealTimePriceFetcher._cached_quote(s) is None]
+        if not symbols:
+            return 0
+        
+        try:
+            with span('quote_batch', symbols=len(symbols)):
+                data = yfinance().download(symbols, period="10d", group_by='ticker', auto_adjust=True,
+                                           progress=False, threads=False, timeout=10)
+        except Exception:
+            return 0
+        if data is None or data.empty:
+            return 0
+        
+        fetched = 0
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                hist = data[symbol]
+            else:
+                hist = data
+            hist = hist.dropna(subset=['Close'])
+            if not hist.empty:
+                RealTimePriceFetcher._prefetched[symbol] = (now, RealTimePriceFetcher._quote_from_history(hist))
+                fetched += 1
+        return fetched
+    
+    @staticmethod
+    def _quote_from_history(hist: pd.DataFrame) -> Dict:
+        """Quote dict from the most recent row of a yfinance OHLCV frame (tz-naive, like the CSVs)"""
+        latest_data = hist.iloc[-1]
+        latest_date = hist.index[-1]
+        if latest_date.tzinfo is not None:
+            latest_date = latest_date.tz_localize(None)
+        
+        return {
+            'current_price': float(latest_data['Close']),
+            'price_date': latest_date.strftime('%Y-%m-%d'),
+            'high': float(latest_data['High']),
+            'low': float(latest_data['Low']),
+            'open': float(latest_data['Open']),
+            'volume': float(latest_data['Volume']),
+            'datetime': latest_date
+        }
+    
+    @staticmethod
+    def _fetch_quote(symbol: str) -> Dict:
         try:
-            import yfinance as yf
+            yf = yfinance()
             
             ticker = yf.Ticker(symbol)
             
@@ -79,23 +178,13 @@ class RealTimePriceFetcher:
                     raise ValueError(f"No price data available")
             
             # Get the most recent trading day
-            latest_data = hist.iloc[-1]
-            latest_date = hist.index[-1]
-            
-            return {
-                'current_price': float(latest_data['Close']),
-                'price_date': latest_date.strftime('%Y-%m-%d'),
-                'high': float(latest_data['High']),
-                'low': float(latest_data['Low']),
-                'open': float(latest_data['Open']),
-                'volume': float(latest_data['Volume']),
-                'datetime': latest_date
-            }
+            return RealTimePriceFetcher._quote_from_history(hist)
             
         except Exception as e:
             raise ValueError(f"Could not fetch current price for {symbol}: {str(e)}")
     
     @staticmethod
+    @traced('live_price')
     def update_df_with_current_price(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
         """
         Update dataframe with most recent price from yfinance
@@ -135,7 +224,8 @@ class RealTimePriceFetcher:
                 return df
                 
             except Exception as e:
-                if attempt < max_retries - 1:
+                # A failure cached by the daemon won't change on retry
+                if attempt < max_retries - 1 and not RealTimePriceFetcher.cached_failure(symbol):
                     time.sleep(retry_delay)
                     continue
                 else:
@@ -231,6 +321,67 @@ class AdaptiveThresholds:
             'trend_consistency': trend_consistency if len(df) >= 20 else 0.5
         }
     
+    @staticmethod
+    def threshold_inputs(close) -> dict:
+        """
+        Per-date inputs of calculate_stock_threshold for a whole close series:
+        vol_ratio (NaN before 60 rows) and trend_consistency (NaN before 20 rows)
+        """
+        close = pd.Series(np.asarray(close, dtype=float))
+        returns = close.pct_change()
+        n_rows = np.arange(1, len(close) + 1)
+        
+        recent_vol = returns.rolling(60, min_periods=2).std().values
+        long_vol = returns.expanding(min_periods=2).std().values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_ratio = np.where(long_vol > 0, recent_vol / long_vol, 1.0)
+        vol_ratio = np.where(n_rows >= 60, vol_ratio, np.nan)
+        
+        positive_days = (returns > 0).astype(float).rolling(19, min_periods=19).sum().values
+        trend_consistency = np.where(n_rows >= 20, np.abs(positive_days - 10) / 10, np.nan)
+        
+        return {'vol_ratio': vol_ratio, 'trend_consistency': trend_consistency}
+    
+    @staticmethod
+    def calculate_stock_threshold_batch(vol_ratio, volatility, trend_consistency, market_regime,
+                                        historical_accuracy=None) -> dict:
+        """
+        Array version of calculate_stock_threshold for N symbols/dates.
+        NaN vol_ratio / trend_consistency mean "not enough history" (scalar fallbacks).
+        """
+        vol_ratio = np.asarray(vol_ratio, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+        trend_consistency = np.asarray(trend_consistency, dtype=float)
+        regime = np.asarray(market_regime, dtype=str)
+        acc = np.full(len(vol_ratio), np.nan) if historical_accuracy is None else np.asarray(historical_accuracy, dtype=float)
+        
+        base_threshold = np.where(acc < 0.56, 0.70, 0.55)
+        
+        vol_adj = np.where(
+            np.isnan(vol_ratio),
+            np.select([volatility > 0.04, volatility > 0.03, volatility > 0.02], [0.10, 0.06, 0.03], 0.00),
+            np.select([vol_ratio > 1.5, vol_ratio > 1.2, vol_ratio < 0.8], [0.08, 0.05, -0.02], 0.02),
+        )
+        
+        regime_adj = np.where(
+            np.isnan(trend_consistency),
+            0.02,
+            np.select([trend_consistency > 0.6, trend_consistency < 0.3], [-0.01, 0.06], 0.03),
+        )
+        has = lambda label: np.char.find(regime, label) >= 0
+        regime_adj = regime_adj + np.select(
+            [has("BULL STRONG"), has("BEAR STRONG"), has("MIXED") | has("SIDEWAYS")], [-0.01, 0.03, 0.05], 0.0
+        )
+        
+        threshold = np.clip(base_threshold + vol_adj + regime_adj, 0.55, 0.80)
+        
+        return {
+            'threshold': threshold,
+            'vol_adjustment': vol_adj,
+            'regime_adjustment': regime_adj,
+            'trend_consistency': np.where(np.isnan(trend_consistency), 0.5, trend_consistency)
+        }
+    
     @staticmethod
     def get_confidence_label(prob: float, threshold: float) -> tuple:
         """Return confidence label and score (0-100)"""
@@ -261,58 +412,8 @@ class AdaptiveThresholds:
 # ============================================================================
 # STOCK PERFORMANCE TRACKER (NEW)
 # ============================================================================
-class StockPerformanceTracker:
-    """Track historical accuracy per stock"""
-    
-    def __init__(self, log_file: str = "stock_performance.csv"):
-        self.log_file = Path(log_file)
-        self.performance = self._load_performance()
-    
-    def _load_performance(self) -> dict:
-        """Load historical performance data"""
-        if not self.log_file.exists():
-            return {}
-        
-        try:
-            df = pd.read_csv(self.log_file)
-            # Calculate accuracy per stock
-            performance = {}
-            for symbol in df['symbol'].unique():
-                stock_df = df[df['symbol'] == symbol]
-                if len(stock_df) >= 5:  # Need at least 5 predictions
-                    # Calculate accuracy from past predictions
-                    # This assumes you have an 'outcome' column tracking if prediction was correct
-                    if 'outcome' in stock_df.columns:
-                        accuracy = stock_df['outcome'].mean()
-                        performance[symbol] = accuracy
-            return performance
-        except:
-            return {}
-    
-    def get_stock_accuracy(self, symbol: str) -> float:
-        """Get historical accuracy for a stock"""
-        return self.performance.get(symbol, None)
-    
-    def update_performance(self, symbol: str, was_correct: bool):
-        """
-        Update performance after verifying prediction
-        This would be called when you verify predictions (e.g., 5 days later)
-        """
-        if not self.log_file.exists():
-            with open(self.log_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'symbol', 'outcome'])
-        
-        with open(self.log_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                symbol,
-                1 if was_correct else 0
-            ])
-        
-        # Reload performance
-        self.performance = self._load_performance()
+# Running counters + persistence live in src/performance.py (importable without TensorFlow)
+from src.performance import StockPerformanceTracker
 # ============================================================================
 # END OF PART 1/5
 # ============================================================================
@@ -404,6 +505,120 @@ class EnhancedMarketRegime:
             'volatility_regime': vol_regime,
             'vol_20d': vol_20d
         }
+    
+    @staticmethod
+    def analyze_regime_rolling(df: pd.DataFrame, window: int = 50) -> pd.DataFrame:
+        """
+        analyze_regime for every date in one pass (row t uses rows 0..t only).
+        Slope is closed-form least squares from rolling sums instead of np.polyfit.
+        """
+        close = df['close'].astype(float).reset_index(drop=True)
+        n = window
+        returns = close.pct_change()
+        
+        ma_20 = close.rolling(20).mean().values
+        ma_50 = close.rolling(n).mean().values
+        current = close.values
+        
+        vol_20d = returns.rolling(20).std().values * 100
+        
+        # slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2), x = 0..n-1 inside each window
+        i = pd.Series(np.arange(len(close)), dtype=float)
+        sum_y = close.rolling(n).sum().values
+        sum_iy = (i * close).rolling(n).sum().values
+        start = np.arange(len(close)) - (n - 1)
+        sum_xy = sum_iy - start * sum_y
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x ** 2)
+        trend_strength = np.abs(slope) / current * 100
+        
+        positive_days = (returns > 0).astype(float).rolling(n - 1).sum().values
+        half = (n - 1) / 2
+        consistency = np.abs(positive_days - half) / half
+        
+        vol_regime = np.select([vol_20d < 1.5, vol_20d < 2.5, vol_20d < 4.0],
+                               ["LOW VOL", "NORMAL VOL", "HIGH VOL"], "EXTREME VOL")
+        
+        strong = (trend_strength > 0.15) & (consistency > 0.4)
+        moderate = ~strong & (trend_strength > 0.08) & (consistency > 0.25)
+        choppy = ~strong & ~moderate & (consistency < 0.15)
+        regime = np.select(
+            [strong & (current > ma_20) & (ma_20 > ma_50) & (slope > 0),
+             strong & (current < ma_20) & (ma_20 < ma_50) & (slope < 0),
+             strong,
+             moderate & (current > ma_50) & (slope > 0),
+             moderate & (current < ma_50) & (slope < 0),
+             moderate,
+             choppy],
+            ["🚀 BULL STRONG", "📉 BEAR STRONG", "🔄 TRANSITIONING",
+             "📈 BULL", "📉 BEAR", "🔄 MIXED", "⚡ CHOPPY"],
+            "⚖️ SIDEWAYS"
+        ).astype(object)
+        
+        warmup = np.arange(len(close)) < n - 1
+        regime[warmup] = "⚠️ INSUFFICIENT DATA"
+        
+        return pd.DataFrame({
+            'regime': regime,
+            'trend_strength': np.where(warmup, 0, trend_strength),
+            'consistency': np.where(warmup, np.nan, consistency),
+            'volatility_regime': np.where(warmup, "UNKNOWN", vol_regime).astype(object),
+            'vol_20d': np.where(warmup, np.nan, vol_20d),
+        }, index=df.index)
+    
+    @staticmethod
+    def analyze_regime_panel(close: np.ndarray, window: int = 50) -> dict:
+        """
+        analyze_regime for the latest bar of many symbols at once. close is (bars x symbols),
+        most recent bar last, NaN-padded on top for short histories; every field is a length-N array.
+        """
+        c = np.asarray(close, dtype=float)[-window:]
+        n = len(c)
+        current = c[-1]
+        ma_20 = c[-20:].mean(axis=0)
+        ma_50 = c.mean(axis=0)
+        returns = c[1:] / c[:-1] - 1
+        
+        vol_20d = returns[-20:].std(axis=0, ddof=1) * 100
+        
+        # Least-squares slope over x = 0..n-1 (np.polyfit in analyze_regime)
+        x = np.arange(n) - (n - 1) / 2
+        slope = (x[:, None] * (c - ma_50)).sum(axis=0) / (x ** 2).sum()
+        trend_strength = np.abs(slope) / current * 100
+        
+        half = (n - 1) / 2
+        consistency = np.abs((returns > 0).sum(axis=0) - half) / half
+        
+        vol_regime = np.select([vol_20d < 1.5, vol_20d < 2.5, vol_20d < 4.0],
+                               ["LOW VOL", "NORMAL VOL", "HIGH VOL"], "EXTREME VOL")
+        
+        strong = (trend_strength > 0.15) & (consistency > 0.4)
+        moderate = ~strong & (trend_strength > 0.08) & (consistency > 0.25)
+        choppy = ~strong & ~moderate & (consistency < 0.15)
+        regime = np.select(
+            [strong & (current > ma_20) & (ma_20 > ma_50) & (slope > 0),
+             strong & (current < ma_20) & (ma_20 < ma_50) & (slope < 0),
+             strong,
+             moderate & (current > ma_50) & (slope > 0),
+             moderate & (current < ma_50) & (slope < 0),
+             moderate,
+             choppy],
+            ["🚀 BULL STRONG", "📉 BEAR STRONG", "🔄 TRANSITIONING",
+             "📈 BULL", "📉 BEAR", "🔄 MIXED", "⚡ CHOPPY"],
+            "⚖️ SIDEWAYS"
+        ).astype(object)
+        
+        short = (n < window) | np.isnan(c).any(axis=0)
+        regime[short] = "⚠️ INSUFFICIENT DATA"
+        
+        return {
+            'regime': regime,
+            'trend_strength': np.where(short, 0, trend_strength),
+            'consistency': np.where(short, np.nan, consistency),
+            'volatility_regime': np.where(short, "UNKNOWN", vol_regime).astype(object),
+            'vol_20d': np.where(short, np.nan, vol_20d),
+        }
 
 
 # ============================================================================
@@ -508,6 +723,69 @@ class ImprovedRiskManagement:
         }
 
 
+    @staticmethod
+    def calculate_optimal_levels_batch(current_price, atr, volatility, direction_prob, trend_strength) -> dict:
+        """Array version of calculate_optimal_levels (both branches evaluated, picked with np.where)"""
+        price = np.asarray(current_price, dtype=float)
+        atr = np.asarray(atr, dtype=float)
+        prob = np.asarray(direction_prob, dtype=float)
+        trend_multiplier = 1.0 + np.minimum(np.asarray(trend_strength, dtype=float) * 5, 0.5)
+        up = prob > 0.5
+        
+        def _rr(upside, downside):
+            return np.divide(upside, downside, out=np.zeros_like(upside), where=downside > 0)
+        
+        # UP branch
+        u_mult = (1.0 + (prob - 0.5) * 2) * trend_multiplier
+        u_high = price + (atr * 2.0 * u_mult)
+        u_low = price + (atr * 0.8 * u_mult)
+        u_stop = price - (atr * 1.2)
+        u_upside = (u_high + u_low) / 2 - price
+        u_downside = price - u_stop
+        u_adjust = (_rr(u_upside, u_downside) < 1.5) & (u_downside > 0)
+        u_stop_adj = price - u_upside / 1.5
+        u_min_stop = price - (atr * 0.8)
+        u_widen = u_adjust & (u_stop_adj > u_min_stop)
+        u_center = price + u_downside * 1.5
+        u_stop = np.where(u_widen, u_min_stop, np.where(u_adjust, u_stop_adj, u_stop))
+        u_high = np.where(u_widen, u_center + (atr * 0.6), u_high)
+        u_low = np.where(u_widen, u_center - (atr * 0.3), u_low)
+        
+        # DOWN branch
+        d_mult = (1.0 + (0.5 - prob) * 2) * trend_multiplier
+        d_low = price - (atr * 2.0 * d_mult)
+        d_high = price - (atr * 0.8 * d_mult)
+        d_stop = price + (atr * 1.2)
+        d_upside = price - (d_high + d_low) / 2
+        d_downside = d_stop - price
+        d_adjust = (_rr(d_upside, d_downside) < 1.5) & (d_downside > 0)
+        d_stop_adj = price + d_upside / 1.5
+        d_max_stop = price + (atr * 0.8)
+        d_widen = d_adjust & (d_stop_adj < d_max_stop)
+        d_center = price - d_downside * 1.5
+        d_stop = np.where(d_widen, d_max_stop, np.where(d_adjust, d_stop_adj, d_stop))
+        d_low = np.where(d_widen, d_center - (atr * 0.6), d_low)
+        d_high = np.where(d_widen, d_center + (atr * 0.3), d_high)
+        
+        target_high = np.where(up, u_high, d_high)
+        target_low = np.where(up, u_low, d_low)
+        stop_loss = np.where(up, u_stop, d_stop)
+        
+        # Final calculations
+        avg_target = (target_high + target_low) / 2
+        downside_risk = np.abs(price - stop_loss)
+        
+        return {
+            'target_high': target_high,
+            'target_low': target_low,
+            'stop_loss': stop_loss,
+            'risk_reward': _rr(np.abs(avg_target - price), downside_risk),
+            'expected_return': (avg_target - price) / price * 100,
+            'max_loss': downside_risk / price * 100,
+            'atr_pct': (atr / price) * 100
+        }
+
+
 # ============================================================================
 # WEIGHTED DECISION SCORING
 # ============================================================================
@@ -665,6 +943,157 @@ class WeightedDecisionEngine:
             'recommendation': recommendation,
             'breakdown': breakdown
         }
+    
+    @staticmethod
+    def calculate_signal_score_batch(week_prob_up, threshold, risk_reward, market_regime, week_direction,
+                                     volatility, historical_accuracy=None) -> dict:
+        """Array version of calculate_signal_score; every field comes back as a length-N array"""
+        prob = np.asarray(week_prob_up, dtype=float)
+        rr = np.asarray(risk_reward, dtype=float)
+        vol = np.asarray(volatility, dtype=float)
+        regime = np.asarray(market_regime, dtype=str)
+        is_up = np.char.find(np.asarray(week_direction, dtype=str), "UP") >= 0
+        is_down = np.char.find(np.asarray(week_direction, dtype=str), "DOWN") >= 0
+        acc = np.full(len(prob), np.nan) if historical_accuracy is None else np.asarray(historical_accuracy, dtype=float)
+        has = lambda label: np.char.find(regime, label) >= 0
+        
+        poor = acc < 0.56
+        accuracy_penalty = np.where(poor, (0.56 - acc) * 200, 0)
+        
+        # 1. Probability margin (40 points)
+        margin = prob - np.asarray(threshold, dtype=float)
+        prob_score = np.select([margin >= 0.10, margin >= 0.05, margin >= 0.02, margin >= 0, margin >= -0.03],
+                               [40, 32, 25, 18, 10], 0)
+        
+        # 2. Risk-reward (25 points)
+        rr_score = np.select([rr >= 2.5, rr >= 2.0, rr >= 1.5, rr >= 1.0], [25, 20, 15, 8], 0)
+        
+        # 3. Market alignment (20 points)
+        strong = (has("BULL STRONG") & is_up) | (has("BEAR STRONG") & is_down)
+        aligned = (has("BULL") & is_up) | (has("BEAR") & is_down)
+        choppy = has("CHOPPY") | has("MIXED")
+        sideways = has("SIDEWAYS")
+        market_score = np.select([strong, aligned, choppy, sideways], [20, 15, 5, 8], 0)
+        risk_level = np.where(poor, "VERY HIGH", "MODERATE").astype(object)
+        risk_level = np.select(
+            [strong | aligned, choppy, sideways], [risk_level, "HIGH", "MODERATE-HIGH"], "VERY HIGH"
+        ).astype(object)
+        
+        # 4. Volatility favorability (15 points)
+        vol_score = np.select([vol < 0.02, vol < 0.03, vol < 0.04], [15, 12, 7], 2)
+        risk_level = np.where((vol >= 0.03) & (vol < 0.04) & (risk_level == "MODERATE"), "MODERATE-HIGH", risk_level)
+        risk_level = np.where(vol >= 0.04, "VERY HIGH", risk_level).astype(object)
+        
+        score = np.maximum(0, prob_score + rr_score + market_score + vol_score - accuracy_penalty)
+        
+        low_risk = (risk_level == "LOW") | (risk_level == "MODERATE")
+        rules = [
+            (poor, "❌ AVOID - POOR HISTORICAL ACCURACY", "REJECTED", None),
+            ((score >= 75) & low_risk, np.where(is_up, "🟢 STRONG BUY", "🔴 STRONG SELL"), "EXCELLENT",
+             "High confidence trade with favorable conditions"),
+            ((score >= 70) & (risk_level == "HIGH"), "⚡ CONSIDER WITH CAUTION", "GOOD BUT RISKY",
+             "Good setup but market conditions are choppy - use tight stops"),
+            ((score >= 65) & low_risk, np.where(is_up, "🟢 BUY", "🔴 SELL"), "GOOD",
+             "Solid trade setup with acceptable risk"),
+            ((score >= 60) & ((risk_level == "MODERATE-HIGH") | (risk_level == "HIGH")), "⏸️ WAIT FOR BETTER ENTRY",
+             "MARGINAL", "Setup has potential but wait for clearer market conditions"),
+            (score >= 55, "⚡ CAUTIOUS - SMALL POSITION", "MARGINAL",
+             "Only for experienced traders with tight risk management"),
+            (score >= 45, "⏸️ WAIT", "WEAK", "Insufficient edge - wait for better opportunity"),
+        ]
+        conditions = [r[0] for r in rules]
+        action = np.select(conditions, [np.broadcast_to(r[1], prob.shape) for r in rules], "❌ AVOID TRADE")
+        signal = np.select(conditions, [r[2] for r in rules], "REJECTED")
+        poor_text = np.array([f"This stock has only {a:.1%} historical accuracy - model is not reliable here"
+                              if p else "" for a, p in zip(acc, poor)], dtype=object)
+        recommendation = np.select(conditions, [poor_text] + [r[3] for r in rules[1:]], "Poor setup - do not trade")
+        
+        return {
+            'score': score,
+            'action': action.astype(object),
+            'signal_strength': signal.astype(object),
+            'risk_level': risk_level,
+            'recommendation': recommendation.astype(object),
+            'breakdown': {
+                'probability': prob_score,
+                'risk_reward': rr_score,
+                'market_alignment': market_score,
+                'volatility': vol_score,
+                'accuracy_penalty': -accuracy_penalty,
+            }
+        }
+# ============================================================================
+# BATCH DECISION ENGINE VALIDATION
+# ============================================================================
+def validate_batch_engine(n_cases: int = 500, seed: int = 0) -> dict:
+    """Compare the *_batch decision functions and rolling regime with the scalar versions"""
+    import contextlib, io
+    
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+    df = pd.DataFrame({'close': close})
+    
+    # End rows span the <20, <60 and >=60 history branches
+    idx = rng.integers(5, len(close), n_cases)
+    regimes = np.array(["🚀 BULL STRONG", "📉 BEAR STRONG", "📈 BULL", "📉 BEAR", "🔄 MIXED",
+                        "🔄 TRANSITIONING", "⚡ CHOPPY", "⚖️ SIDEWAYS"])
+    regime = rng.choice(regimes, n_cases)
+    vol = rng.uniform(0.005, 0.06, n_cases)
+    prob = rng.uniform(0.2, 0.8, n_cases)
+    atr = close[idx] * rng.uniform(0.005, 0.05, n_cases)
+    trend = rng.uniform(0, 0.3, n_cases)
+    acc = np.where(rng.uniform(size=n_cases) < 0.3, rng.uniform(0.45, 0.7, n_cases), np.nan)
+    direction = np.where(prob > 0.5, "UP", "DOWN")
+    
+    inputs = AdaptiveThresholds.threshold_inputs(close)
+    th_b = AdaptiveThresholds.calculate_stock_threshold_batch(
+        inputs['vol_ratio'][idx], vol, inputs['trend_consistency'][idx], regime, acc)
+    rk_b = ImprovedRiskManagement.calculate_optimal_levels_batch(close[idx], atr, vol, prob, trend)
+    dc_b = WeightedDecisionEngine.calculate_signal_score_batch(
+        prob, th_b['threshold'], rk_b['risk_reward'], regime, direction, vol, acc)
+    
+    rolling_regime = EnhancedMarketRegime.analyze_regime_rolling(df)
+    # Panel: one column per case, the 60 closes up to its end row (NaN-padded when shorter)
+    panel = np.full((60, n_cases), np.nan)
+    for k, i in enumerate(idx):
+        window = close[max(0, i - 59):i + 1]
+        panel[60 - len(window):, k] = window
+    panel_regime = EnhancedMarketRegime.analyze_regime_panel(panel)
+    
+    mismatches = {'threshold': 0, 'risk': 0, 'decision': 0, 'regime': 0, 'panel_regime': 0}
+    close_enough = lambda a, b: np.isclose(a, b, rtol=1e-9, atol=1e-9)
+    for k, i in enumerate(idx):
+        hist = None if np.isnan(acc[k]) else float(acc[k])
+        with contextlib.redirect_stdout(io.StringIO()):
+            th = AdaptiveThresholds.calculate_stock_threshold(df.iloc[:i + 1], vol[k], regime[k], hist)
+        if not all(close_enough(th[key], th_b[key][k]) for key in th):
+            mismatches['threshold'] += 1
+        
+        rg = EnhancedMarketRegime.analyze_regime(df.iloc[:i + 1])
+        row = rolling_regime.iloc[i]
+        if rg['regime'] != row['regime'] or rg['volatility_regime'] != row['volatility_regime'] or \
+                not all(close_enough(rg[key], row[key]) for key in ('trend_strength', 'consistency', 'vol_20d') if key in rg):
+            mismatches['regime'] += 1
+        if rg['regime'] != panel_regime['regime'][k] or rg['volatility_regime'] != panel_regime['volatility_regime'][k] or \
+                not all(close_enough(rg[key], panel_regime[key][k]) for key in ('trend_strength', 'consistency', 'vol_20d') if key in rg):
+            mismatches['panel_regime'] += 1
+        
+        rk = ImprovedRiskManagement.calculate_optimal_levels(close[i], atr[k], vol[k], prob[k], trend[k])
+        if not all(close_enough(rk[key], rk_b[key][k]) for key in rk):
+            mismatches['risk'] += 1
+        
+        dc = WeightedDecisionEngine.calculate_signal_score({
+            'week_prob_up': prob[k], 'threshold': th['threshold'], 'risk_reward': rk['risk_reward'],
+            'market_regime': regime[k], 'week_direction': direction[k], 'volatility': vol[k]
+        }, hist)
+        same = close_enough(dc['score'], dc_b['score'][k]) and all(
+            dc[key] == dc_b[key][k] for key in ('action', 'signal_strength', 'risk_level', 'recommendation'))
+        same = same and all(close_enough(v, dc_b['breakdown'][key][k]) for key, v in dc['breakdown'].items())
+        if not same:
+            mismatches['decision'] += 1
+    
+    return {'cases': n_cases, 'mismatches': mismatches, 'passed': not any(mismatches.values())}
+
 # ============================================================================
 # END OF PART 2/5
 # ============================================================================
@@ -736,16 +1165,41 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
 class MarketDataFetcher:
     """Fetch market trend data (SPY)"""
     
+    MARKET_TTL = 0          # Seconds the SPY trend frame is reused; 0 = fetch per call (CLI)
+    _market = None          # (fetched_at, trend frame or None)
+    
     @staticmethod
+    @traced('market_fetch')
     def fetch_market_trend(df: pd.DataFrame, retries: int = 3) -> pd.DataFrame:
         """Fetch SPY market trend and merge with stock data"""
+        market_df = MarketDataFetcher.market_trend_frame(retries)
+        if market_df is None:
+            # Fallback: use stock's own trend
+            return MarketDataFetcher.own_trend(df)
+        return MarketDataFetcher.join_trend(df, market_df)
+    
+    @staticmethod
+    def join_trend(df: pd.DataFrame, market_df: pd.DataFrame) -> pd.DataFrame:
+        """Left-join a market_trend frame onto the stock's dates (forward-filled, bullish if unknown)"""
+        df = df.join(market_df[['market_trend']], how='left')
+        df['market_trend'] = df['market_trend'].ffill().fillna(1).astype(int)
+        return df
+    
+    @staticmethod
+    def market_trend_frame(retries: int = 3):
+        """SPY close above its 200 EMA per date (None if unavailable)"""
+        cached = MarketDataFetcher._market
+        if cached and time.time() - cached[0] < MarketDataFetcher.MARKET_TTL:
+            return cached[1]
+        
         import logging
         yf_logger = logging.getLogger('yfinance')
         yf_logger.setLevel(logging.CRITICAL)
         
+        trend = None
         for attempt in range(retries):
             try:
-                import yfinance as yf
+                yf = yfinance()
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=730)
                 
@@ -757,19 +1211,22 @@ class MarketDataFetcher:
                 if not market_df.empty and len(market_df) >= 200:
                     market_df['ema_200'] = market_df['Close'].ewm(span=200, adjust=False).mean()
                     market_df['market_trend'] = (market_df['Close'] > market_df['ema_200']).astype(int)
-                    market_df = market_df[['market_trend']]
+                    trend = market_df[['market_trend']]
                     
-                    if not isinstance(market_df.index, pd.DatetimeIndex):
-                        market_df.index = pd.to_datetime(market_df.index)
-                    
-                    df = df.join(market_df, how='left')
-                    df['market_trend'] = df['market_trend'].fillna(method='ffill').fillna(1).astype(int)
-                    return df
+                    if not isinstance(trend.index, pd.DatetimeIndex):
+                        trend.index = pd.to_datetime(trend.index)
+                    break
             except:
                 if attempt < retries - 1:
                     continue
         
-        # Fallback: use stock's own trend
+        if MarketDataFetcher.MARKET_TTL:
+            MarketDataFetcher._market = (time.time(), trend)
+        return trend
+    
+    @staticmethod
+    def own_trend(df: pd.DataFrame) -> pd.DataFrame:
+        """Offline market trend proxy: stock close above its own 200 EMA"""
         df['ema_200'] = df['close'].ewm(span=200, adjust=False).mean()
         df['market_trend'] = (df['close'] > df['ema_200']).astype(int)
         df = df.drop('ema_200', axis=1)
@@ -779,8 +1236,21 @@ class MarketDataFetcher:
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
-def create_prediction_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Create all technical features for prediction"""
+# Feature columns used by model (order matters)
+PREDICTION_FEATURES = [
+    'atr_pct', 'volatility', 'trend_strength', 'roc_10', 'volume_ratio',
+    'sma_7', 'ema_7', 'rsi_14', 'volume_trend_week',
+    'weekly_return', 'weekly_volatility',
+    'ema_diff', 'adx_14', 'price_vwap', 'market_trend'
+]
+
+@traced('features')
+def create_prediction_features(df: pd.DataFrame, fetch_market: bool = True,
+                               market: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Create all technical features for prediction (fetch_market=False stays offline)
+    market: precomputed market_trend frame, joined instead of fetching SPY
+    """
     df = df.copy()
     
     # ATR and Volatility
@@ -833,7 +1303,12 @@ def create_prediction_features(df: pd.DataFrame) -> pd.DataFrame:
     df['price_vwap'] = (df['close'] - df['vwap']) / df['vwap']
     
     # Market trend
-    df = MarketDataFetcher.fetch_market_trend(df)
+    if market is not None:
+        df = MarketDataFetcher.join_trend(df, market)
+    elif fetch_market:
+        df = MarketDataFetcher.fetch_market_trend(df)
+    else:
+        df = MarketDataFetcher.own_trend(df)
     
     return df
 
@@ -881,9 +1356,24 @@ class EnhancedStockPrediction:
 # ============================================================================
 # DATA LOADING WITH REAL-TIME PRICE UPDATE
 # ============================================================================
-def load_and_prepare_data(symbol: str):
+PRICE_CSV_CACHE = False     # Reuse parsed price CSVs until their mtime changes (prediction daemon)
+_PRICE_CSVS = {}
+
+def read_price_csv(csv_path: Path) -> pd.DataFrame:
+    """pd.read_csv, served from memory while the file is unchanged when PRICE_CSV_CACHE is on"""
+    if not PRICE_CSV_CACHE:
+        return pd.read_csv(csv_path)
+    key, stamp = str(csv_path.resolve()), csv_path.stat().st_mtime_ns
+    hit = _PRICE_CSVS.get(key)
+    if hit is None or hit[0] != stamp:
+        hit = _PRICE_CSVS[key] = (stamp, pd.read_csv(csv_path))
+    return hit[1].copy()
+
+
+@traced('load_data')
+def load_price_history(symbol: str, live: bool = True) -> pd.DataFrame:
     """
-    Load historical data from CSV and update with real-time price from yfinance
+    Load historical OHLCV from CSV and update with real-time price from yfinance (live=True)
     """
     csv_paths = [
         Path(f"data/stock_data/{symbol}.csv"),
@@ -897,21 +1387,22 @@ def load_and_prepare_data(symbol: str):
     csv_found = None
     
     # Try to load from CSV
-    for csv_path in csv_paths:
-        if csv_path.exists():
-            try:
-                df = pd.read_csv(csv_path)
-                csv_found = csv_path
-                print(f" [Loading from: {csv_path}]", end="")
-                break
-            except:
-                continue
+    with span('csv_read'):
+        for csv_path in csv_paths:
+            if csv_path.exists():
+                try:
+                    df = read_price_csv(csv_path)
+                    csv_found = csv_path
+                    print(f" [Loading from: {csv_path}]", end="")
+                    break
+                except:
+                    continue
     
     # If no CSV found, fetch from yfinance
     if df is None:
         print(f" [Fetching from yfinance]", end="")
         try:
-            import yfinance as yf
+            yf = yfinance()
             end_date = datetime.now()
             start_date = end_date - timedelta(days=730)  # 2 years
             
@@ -966,7 +1457,8 @@ def load_and_prepare_data(symbol: str):
     df = df[~df.index.duplicated(keep='last')]
     
     # **NEW: Update with real-time price from yfinance**
-    df = RealTimePriceFetcher.update_df_with_current_price(df, symbol)
+    if live:
+        df = RealTimePriceFetcher.update_df_with_current_price(df, symbol)
     
     if len(df) > 0:
         print(f" [{len(df)} rows, latest: {df.index[-1].strftime('%Y-%m-%d')}]", end="")
@@ -991,18 +1483,15 @@ def load_and_prepare_data(symbol: str):
     if len(df) == 0:
         raise ValueError(f"No valid numeric data found for {symbol}")
     
-    # Create prediction features
-    df = create_prediction_features(df)
-    
-    # Feature columns used by model
-    feature_cols = [
-        'atr_pct', 'volatility', 'trend_strength', 'roc_10', 'volume_ratio',
-        'sma_7', 'ema_7', 'rsi_14', 'volume_trend_week',
-        'weekly_return', 'weekly_volatility',
-        'ema_diff', 'adx_14', 'price_vwap', 'market_trend'
-    ]
-    
-    return df, feature_cols
+    return df
+
+
+def load_and_prepare_data(symbol: str):
+    """
+    Load historical data (with real-time price) and create prediction features
+    """
+    df = create_prediction_features(load_price_history(symbol))
+    return df, list(PREDICTION_FEATURES)
 
 
 # ============================================================================
@@ -1019,35 +1508,108 @@ Prediction Engine, CSV Logging, and Display Functions
 """
 
 # ============================================================================
-# ENHANCED PREDICTION ENGINE
+# INFERENCE BACKEND
 # ============================================================================
-def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTracker = None):
-    """
-    Enhanced prediction with all improvements + stock-specific calibration
-    """
-    symbol = symbol.upper()
+INFERENCE_BACKEND = 'auto'
+_BACKEND_CACHE = {}
+
+def get_inference_backend(model_path, preference: str = None):
+    """Load (and cache) the Keras / SavedModel / TFLite backend for model_path"""
+    from src.inference import select_backend
     
-    # Find model
+    preference = preference or INFERENCE_BACKEND
+    key = (str(Path(model_path).resolve()), preference)
+    if key not in _BACKEND_CACHE:
+        try:
+            _BACKEND_CACHE[key] = select_backend(model_path, preference=preference)
+        except Exception as e:
+            if preference != 'auto':
+                raise
+            print(f" ⚠️ Exported backend unusable ({e}) - using Keras", end="")
+            _BACKEND_CACHE[key] = select_backend(model_path, preference='keras')
+    return _BACKEND_CACHE[key]
+
+def find_model_path():
+    """First existing model file (cwd-relative, then next to predict.py), or None"""
     model_paths = [
         Path("models/stock_model_fixed.keras"),
         Path("./models/stock_model_fixed.keras"),
         Path(__file__).parent / "models" / "stock_model_fixed.keras",
     ]
-    
-    model_path = None
     for path in model_paths:
         if path.exists():
-            model_path = path
-            break
+            return path
+    return None
+
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+RESULT_CACHE_ENABLED = True
+RESULT_CACHE_SOURCE = 'cli'     # Hit-rate label: 'cli', 'app', 'daemon'
+_RESULT_CACHES = {}
+
+def get_result_cache():
+    """Shared ResultCache for Config.RESULT_CACHE_DB (None when disabled)"""
+    if not RESULT_CACHE_ENABLED:
+        return None
+    from src.result_cache import ResultCache
+    
+    key = (str(Config.RESULT_CACHE_DB), RESULT_CACHE_SOURCE)
+    if key not in _RESULT_CACHES:
+        _RESULT_CACHES[key] = ResultCache(source=RESULT_CACHE_SOURCE)
+    return _RESULT_CACHES[key]
+
+def prediction_cache_key(symbol: str, df: pd.DataFrame, model_path, model, historical_accuracy) -> str:
+    """Same bar, quote, model bundle, decision config and accuracy -> same prediction"""
+    from src.result_cache import config_fingerprint, model_fingerprint, result_key
     
+    return result_key(symbol, df.index[-1].strftime('%Y-%m-%d'), float(df['close'].iloc[-1]),
+                      model_fingerprint(model_path, type(model).__name__),
+                      config_fingerprint([Path(__file__)]), historical_accuracy)
+
+# ============================================================================
+# ENHANCED PREDICTION ENGINE
+# ============================================================================
+def load_model_backend():
+    """(model_path, backend) - loaded once per process; fastest exported backend unless --backend says otherwise"""
+    model_path = find_model_path()
     if model_path is None:
         raise FileNotFoundError("Model not found. Run: python train_fixed.py")
-    
-    # Load model
-    model = tf.keras.models.load_model(str(model_path), compile=False)
+    with span('model_load'):
+        model = get_inference_backend(model_path)
+    return model_path, model
+
 
-    # Load and prepare data (with real-time price update)
-    df, feature_cols = load_and_prepare_data(symbol)
+def prepare_prediction(symbol: str, model_path, model, performance_tracker: StockPerformanceTracker = None,
+                       features_df: pd.DataFrame = None) -> dict:
+    """
+    Everything up to inference for one symbol: price history, regime, threshold and the
+    scaled input window. 'cached' holds the finished prediction when the result cache hits.
+    features_df: output of create_prediction_features computed earlier (pipeline feature cache).
+    """
+    # Load price history (with real-time price update)
+    df = load_price_history(symbol) if features_df is None else features_df
+    
+    # NEW: Get historical accuracy for this stock
+    historical_accuracy = None
+    if performance_tracker:
+        historical_accuracy = performance_tracker.get_stock_accuracy(symbol)
+        if historical_accuracy:
+            print(f" [Hist: {historical_accuracy:.1%}]", end="")
+    
+    # Unchanged inputs since a recent run -> reuse its result
+    cache, cache_key = get_result_cache(), None
+    if cache is not None:
+        with span('cache'):
+            cache_key = prediction_cache_key(symbol, df, model_path, model, historical_accuracy)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            print(" [cached]", end="")
+            return {'symbol': symbol, 'cached': EnhancedStockPrediction(**cached)}
+    
+    if features_df is None:
+        df = create_prediction_features(df)
+    feature_cols = list(PREDICTION_FEATURES)
     
     # Get current values from most recent data
     current_price = float(df['close'].iloc[-1])
@@ -1056,30 +1618,20 @@ def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTra
     current_volatility = float(df['volatility'].iloc[-1]) if not pd.isna(df['volatility'].iloc[-1]) else 0.02
     
     # Enhanced market regime analysis
-    regime_analysis = EnhancedMarketRegime.analyze_regime(df)
-    market_regime = regime_analysis['regime']
-    trend_strength = regime_analysis['trend_strength']
-    volatility_regime = regime_analysis['volatility_regime']
-    
-    # NEW: Get historical accuracy for this stock
-    historical_accuracy = None
-    if performance_tracker:
-        historical_accuracy = performance_tracker.get_stock_accuracy(symbol)
-        if historical_accuracy:
-            print(f" [Hist: {historical_accuracy:.1%}]", end="")
+    with span('regime'):
+        regime_analysis = EnhancedMarketRegime.analyze_regime(df)
     
     # Adaptive threshold per stock WITH historical accuracy
-    threshold_info = AdaptiveThresholds.calculate_stock_threshold(
-        df, current_volatility, market_regime, historical_accuracy  # Added parameter
-    )
-    adaptive_threshold = threshold_info['threshold']
+    with span('threshold'):
+        threshold_info = AdaptiveThresholds.calculate_stock_threshold(
+            df, current_volatility, regime_analysis['regime'], historical_accuracy  # Added parameter
+        )
     
     # Prepare features for prediction
-    from sklearn.preprocessing import RobustScaler
-    
-    X = df[feature_cols].values.astype(float)
-    scaler = RobustScaler()
-    X_scaled = scaler.fit_transform(X)
+    with span('scaling'):
+        X = df[feature_cols].values.astype(float)
+        scaler = robust_scaler()()
+        X_scaled = scaler.fit_transform(X)
     
     # Sequence length
     seq_len = 60
@@ -1089,14 +1641,37 @@ def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTra
     if len(X_scaled) < seq_len:
         raise ValueError(f"Insufficient data (need at least {seq_len} rows)")
     
-    # Create sequence for prediction
-    X_seq = X_scaled[-seq_len:].reshape(1, seq_len, len(feature_cols))
-    
-    # Make prediction
-    predictions = model.predict(X_seq, verbose=0)
-    
-    # Extract week probability
-    week_prob_up = float(predictions[2][0, 0])
+    return {
+        'symbol': symbol,
+        'cached': None,
+        'cache': cache,
+        'cache_key': cache_key,
+        'current_price': current_price,
+        'price_date': price_date,
+        'current_atr': current_atr,
+        'current_volatility': current_volatility,
+        'regime_analysis': regime_analysis,
+        'historical_accuracy': historical_accuracy,
+        'threshold_info': threshold_info,
+        # Create sequence for prediction
+        'X_seq': X_scaled[-seq_len:].reshape(1, seq_len, len(feature_cols)),
+    }
+
+
+def finish_prediction(state: dict, week_prob_up: float) -> EnhancedStockPrediction:
+    """Direction, confidence, risk levels, score and reasoning for a prepared symbol"""
+    symbol = state['symbol']
+    current_price = state['current_price']
+    price_date = state['price_date']
+    current_atr = state['current_atr']
+    current_volatility = state['current_volatility']
+    market_regime = state['regime_analysis']['regime']
+    trend_strength = state['regime_analysis']['trend_strength']
+    volatility_regime = state['regime_analysis']['volatility_regime']
+    historical_accuracy = state['historical_accuracy']
+    threshold_info = state['threshold_info']
+    adaptive_threshold = threshold_info['threshold']
+    cache, cache_key = state['cache'], state['cache_key']
     
     # Determine direction
     week_direction = "UP" if week_prob_up > 0.5 else "DOWN"
@@ -1107,21 +1682,21 @@ def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTra
         week_prob_up, adaptive_threshold
     )
     
-    # Improved risk management
-    risk_mgmt = ImprovedRiskManagement.calculate_optimal_levels(
-        current_price, current_atr, current_volatility, week_prob_up, trend_strength
-    )
-    
-    # Weighted decision scoring WITH historical accuracy
-    pred_data = {
-        'week_prob_up': week_prob_up,
-        'threshold': adaptive_threshold,
-        'risk_reward': risk_mgmt['risk_reward'],
-        'market_regime': market_regime,
-        'week_direction': week_direction,
-        'volatility': current_volatility
-    }
-    decision = WeightedDecisionEngine.calculate_signal_score(pred_data, historical_accuracy)  # Added parameter
+    # Improved risk management + weighted decision scoring WITH historical accuracy
+    with span('decision'):
+        risk_mgmt = ImprovedRiskManagement.calculate_optimal_levels(
+            current_price, current_atr, current_volatility, week_prob_up, trend_strength
+        )
+        
+        pred_data = {
+            'week_prob_up': week_prob_up,
+            'threshold': adaptive_threshold,
+            'risk_reward': risk_mgmt['risk_reward'],
+            'market_regime': market_regime,
+            'week_direction': week_direction,
+            'volatility': current_volatility
+        }
+        decision = WeightedDecisionEngine.calculate_signal_score(pred_data, historical_accuracy)  # Added parameter
     
     # Generate reasoning and warnings
     reasoning = []
@@ -1176,7 +1751,7 @@ def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTra
     reasoning.append(f"💡 Recommendation: {decision['recommendation']}")
     
     # Create and return prediction object
-    return EnhancedStockPrediction(
+    pred = EnhancedStockPrediction(
         symbol=symbol,
         current_price=current_price,
         price_date=price_date,
@@ -1204,64 +1779,258 @@ def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTra
         reasoning=reasoning,
         warnings=warnings
     )
+    if cache is not None:
+        cache.put(cache_key, symbol, price_date, asdict(pred))
+    return pred
+
+
+
+@traced('predict', attrs=lambda symbol, *a, **k: {'symbol': symbol.upper()})
+def predict_stock_enhanced(symbol: str, performance_tracker: StockPerformanceTracker = None):
+    """
+    Enhanced prediction with all improvements + stock-specific calibration
+    """
+    symbol = symbol.upper()
+    model_path, model = load_model_backend()
+    
+    state = prepare_prediction(symbol, model_path, model, performance_tracker)
+    if state['cached'] is not None:
+        return state['cached']
+    
+    # Make prediction
+    with span('inference'):
+        predictions = model.predict(state['X_seq'].astype(np.float32))
+    
+    # Extract week probability
+    return finish_prediction(state, float(predictions[2][0, 0]))
+
+
+def predict_batch(symbols: List[str], performance_tracker: StockPerformanceTracker = None,
+                  features: Dict[str, pd.DataFrame] = None) -> tuple:
+    """
+    Score many symbols in one pass: prepare each, run every input window through the model
+    in one batched call per window length, then finish each. Matches predict_stock_enhanced
+    per symbol up to float32 rounding of the batched matmul (~1e-7 on the probability).
+    features: precomputed feature frames by symbol (skips CSV read + feature engineering).
+    Symbols are processed Config.UNIVERSE_CHUNK at a time, so memory stays bounded for any universe,
+    with one batched live-quote download per chunk (RealTimePriceFetcher.prefetch).
+    Returns (predictions in symbol order, {symbol: error}).
+    """
+    from src.universe import chunked
+    
+    features = features or {}
+    model_path, model = load_model_backend()
+    
+    predictions, errors = [], {}
+    for chunk in chunked(list(dict.fromkeys(s.upper() for s in symbols))):
+        RealTimePriceFetcher.prefetch([s for s in chunk if s not in features])    # One quote call per chunk
+        states = []
+        for symbol in chunk:
+            try:
+                with span('prepare', symbol=symbol):
+                    states.append(prepare_prediction(symbol, model_path, model, performance_tracker,
+                                                     features.get(symbol)))
+            except Exception as e:
+                errors[symbol] = str(e)
+        
+        results = {s['symbol']: s['cached'] for s in states if s['cached'] is not None}
+        pending = [s for s in states if s['cached'] is None]
+        for seq_len in sorted({s['X_seq'].shape[1] for s in pending}):
+            group = [s for s in pending if s['X_seq'].shape[1] == seq_len]
+            with span('inference', batch=len(group)):
+                outputs = model.predict(np.concatenate([s['X_seq'] for s in group]).astype(np.float32))
+            for i, state in enumerate(group):
+                try:
+                    results[state['symbol']] = finish_prediction(state, float(outputs[2][i, 0]))
+                except Exception as e:
+                    errors[state['symbol']] = str(e)
+        predictions += [results[s['symbol']] for s in states if s['symbol'] in results]
+    
+    return predictions, errors
+
 
 # ============================================================================
-# CSV LOGGING
+# SCREENER (cheap filters before inference)
 # ============================================================================
-def log_to_csv(predictions: List, filename: str = "predictions_log.csv"):
-    """Log predictions to CSV file"""
-    csv_path = Path(filename)
-    file_exists = csv_path.exists()
-    
-    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-        fieldnames = [
-            'timestamp', 'symbol', 'price_date', 'current_price',
-            'week_prob_up', 'week_direction', 'confidence', 'confidence_score',
-            'target_high', 'target_low', 'stop_loss',
-            'risk_reward', 'expected_return', 'max_loss',
-            'market_regime', 'trend_strength', 'volatility', 'volatility_regime',
-            'adaptive_threshold', 'signal_score', 'action', 'signal_strength', 'warnings'
+class UniverseScreener:
+    """
+    Two-stage screen for large universes: vectorized filters over a (bars x symbols)
+    close / volume panel reject symbols before any feature engineering or inference,
+    predict_batch scores the survivors and a heap keeps the top K by signal score.
+    Symbols without a local price CSV are skipped (no per-symbol downloads while screening).
+    """
+    
+    LOOKBACK = 60           # Bars per symbol in the panel (regime needs 50, volatility 21)
+    
+    @staticmethod
+    def load_panel(symbols: List[str]) -> tuple:
+        """(close, volume) as LOOKBACK x N arrays (NaN-padded on top) and the last bar date per symbol"""
+        from src.universe import has_local_data
+        
+        close = np.full((UniverseScreener.LOOKBACK, len(symbols)), np.nan)
+        volume = np.full_like(close, np.nan)
+        last_dates = []
+        for j, symbol in enumerate(symbols):
+            try:
+                if not has_local_data(symbol):
+                    raise FileNotFoundError(symbol)
+                df = load_price_history(symbol, live=False).iloc[-UniverseScreener.LOOKBACK:]
+            except Exception:
+                last_dates.append(pd.NaT)
+                continue
+            close[-len(df):, j] = df['close'].values
+            volume[-len(df):, j] = df['volume'].values
+            last_dates.append(df.index[-1])
+        return close, volume, pd.DatetimeIndex(last_dates)
+    
+    @staticmethod
+    def screen_metrics(symbols: List[str], close: np.ndarray, volume: np.ndarray,
+                       last_dates: pd.DatetimeIndex) -> pd.DataFrame:
+        """Per-symbol screen inputs, computed for the whole panel at once"""
+        returns = close[1:] / close[:-1] - 1
+        return pd.DataFrame({
+            'has_data': last_dates.notna(),
+            'stale_days': (last_dates.max() - last_dates).days,
+            'dollar_volume': np.nanmean((close * volume)[-20:], axis=0),
+            'volatility': returns[-20:].std(axis=0, ddof=1),       # create_prediction_features' 'volatility'
+            'regime': EnhancedMarketRegime.analyze_regime_panel(close)['regime'],
+        }, index=symbols)
+    
+    @staticmethod
+    def screens(metrics: pd.DataFrame, performance_tracker: StockPerformanceTracker = None) -> list:
+        """(stage, keep mask) in the order they are applied"""
+        vol_min, vol_max = Config.SCREEN_VOLATILITY
+        stages = [
+            ('data', metrics['has_data']),
+            ('freshness', metrics['stale_days'] <= Config.SCREEN_MAX_STALE_DAYS),
+            ('liquidity', metrics['dollar_volume'] >= Config.SCREEN_MIN_DOLLAR_VOLUME),
+            ('volatility', (metrics['volatility'] >= vol_min) & (metrics['volatility'] < vol_max)),
+            ('regime', metrics['regime'].str.contains('|'.join(Config.SCREEN_REGIMES))),
         ]
+        if performance_tracker is not None:
+            # Below 56% historical accuracy the decision engine always answers AVOID
+            accuracy = pd.Series([performance_tracker.get_stock_accuracy(s) for s in metrics.index],
+                                 index=metrics.index, dtype=float)
+            stages.append(('accuracy', ~(accuracy < 0.56)))
+        return stages
+    
+    @staticmethod
+    def run(symbols: List[str], top_k: int = None, performance_tracker: StockPerformanceTracker = None) -> tuple:
+        """Returns (top-K predictions by signal score, every scored prediction, report)"""
+        import contextlib, io
         
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        top_k = top_k or Config.SCREEN_TOP_K
+        report = {'universe': len(symbols), 'stages': []}
         
-        if not file_exists:
-            writer.writeheader()
+        # Stage 1: panel + vectorized filters
+        start = time.perf_counter()
+        with span('screen', symbols=len(symbols)), contextlib.redirect_stdout(io.StringIO()):
+            close, volume, last_dates = UniverseScreener.load_panel(symbols)
+            metrics = UniverseScreener.screen_metrics(symbols, close, volume, last_dates)
+            alive = pd.Series(True, index=metrics.index)
+            for stage, keep in UniverseScreener.screens(metrics, performance_tracker):
+                pruned = alive & ~keep.fillna(False).astype(bool)
+                report['stages'].append({'stage': stage, 'in': int(alive.sum()), 'pruned': int(pruned.sum()),
+                                         'examples': list(metrics.index[pruned][:5])})
+                alive &= ~pruned
+        survivors = list(metrics.index[alive])
+        report['screen_seconds'] = time.perf_counter() - start
         
-        for pred in predictions:
-            week_direction_clean = pred.week_direction.replace('📈', '').replace('📉', '').strip()
-            market_regime_clean = pred.market_regime.replace('🚀', '').replace('📈', '').replace('📉', '').replace('⚖️', '').replace('🔄', '').replace('⚡', '').strip()
-            confidence_clean = pred.confidence.replace('🟢', '').replace('🟡', '').replace('🟠', '').replace('🔴', '').strip()
-            action_clean = pred.action.replace('🟢', '').replace('🔴', '').replace('⚡', '').replace('❌', '').replace('⏸️', '').strip()
-            
-            row = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'symbol': pred.symbol,
-                'price_date': pred.price_date,
-                'current_price': pred.current_price,
-                'week_prob_up': pred.week_prob_up,
-                'week_direction': week_direction_clean,
-                'confidence': confidence_clean,
-                'confidence_score': pred.confidence_score,
-                'target_high': pred.target_high,
-                'target_low': pred.target_low,
-                'stop_loss': pred.stop_loss,
-                'risk_reward': pred.risk_reward,
-                'expected_return': pred.expected_return,
-                'max_loss': pred.max_loss,
-                'market_regime': market_regime_clean,
-                'trend_strength': pred.trend_strength,
-                'volatility': pred.volatility,
-                'volatility_regime': pred.volatility_regime,
-                'adaptive_threshold': pred.adaptive_threshold,
-                'signal_score': pred.signal_score,
-                'action': action_clean,
-                'signal_strength': pred.signal_strength,
-                'warnings': '; '.join(pred.warnings) if pred.warnings else ''
-            }
-            writer.writerow(row)
+        # Stage 2: features + batched inference for the survivors only
+        start = time.perf_counter()
+        predictions, errors = [], {}
+        if survivors:
+            with contextlib.redirect_stdout(io.StringIO()):
+                predictions, errors = predict_batch(survivors, performance_tracker)
+        report['model_seconds'] = time.perf_counter() - start
+        
+        top = heapq.nlargest(top_k, predictions, key=lambda p: p.signal_score)
+        per_symbol = report['model_seconds'] / len(survivors) if survivors else None
+        report.update({
+            'survivors': len(survivors),
+            'scored': len(predictions),
+            'errors': errors,
+            'top_k': top_k,
+            'per_symbol_seconds': per_symbol,
+            # Unscreened estimate: every symbol through the model stage at the measured rate
+            'unscreened_seconds': per_symbol * len(symbols) if per_symbol else None,
+        })
+        return top, predictions, report
+
+
+def print_screen_report(report: dict):
+    print("\n" + "="*80)
+    print(f"🔎 SCREENER - {report['universe']} symbols -> {report['survivors']} through the model "
+          f"-> top {min(report['top_k'], report['scored'])}")
+    print("="*80)
+    print(f"   {'Stage':<12} {'In':>6} {'Pruned':>7} {'Out':>6}   Examples")
+    for row in report['stages']:
+        examples = ', '.join(row['examples']) + (' ...' if row['pruned'] > len(row['examples']) else '')
+        print(f"   {row['stage']:<12} {row['in']:>6} {row['pruned']:>7} {row['in'] - row['pruned']:>6}   {examples}")
+    print(f"   {'model':<12} {report['survivors']:>6} {len(report['errors']):>7} {report['scored']:>6}   "
+          f"{', '.join(report['errors'])}")
+    print("-"*80)
+    screened = report['screen_seconds'] + report['model_seconds']
+    print(f"   ⏱️  Screen {report['screen_seconds']:.2f}s + model {report['model_seconds']:.2f}s = {screened:.2f}s")
+    if report['unscreened_seconds']:
+        print(f"   ⏱️  Unscreened estimate {report['unscreened_seconds']:.2f}s "
+              f"({report['universe']} x {report['per_symbol_seconds'] * 1000:.0f}ms) -> "
+              f"saved ~{report['unscreened_seconds'] - screened:.2f}s")
+    print("="*80)
+
+# ============================================================================
+# CSV LOGGING
+# ============================================================================
+def prediction_log_row(pred, timestamp: str = None) -> dict:
+    """Flatten an EnhancedPrediction into a prediction-store row (emoji stripped)"""
+    week_direction_clean = pred.week_direction.replace('📈', '').replace('📉', '').strip()
+    market_regime_clean = pred.market_regime.replace('🚀', '').replace('📈', '').replace('📉', '').replace('⚖️', '').replace('🔄', '').replace('⚡', '').strip()
+    confidence_clean = pred.confidence.replace('🟢', '').replace('🟡', '').replace('🟠', '').replace('🔴', '').strip()
+    action_clean = pred.action.replace('🟢', '').replace('🔴', '').replace('⚡', '').replace('❌', '').replace('⏸️', '').strip()
+    
+    return {
+        'timestamp': timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'symbol': pred.symbol,
+        'price_date': pred.price_date,
+        'current_price': pred.current_price,
+        'week_prob_up': pred.week_prob_up,
+        'week_direction': week_direction_clean,
+        'confidence': confidence_clean,
+        'confidence_score': pred.confidence_score,
+        'target_high': pred.target_high,
+        'target_low': pred.target_low,
+        'stop_loss': pred.stop_loss,
+        'risk_reward': pred.risk_reward,
+        'expected_return': pred.expected_return,
+        'max_loss': pred.max_loss,
+        'market_regime': market_regime_clean,
+        'trend_strength': pred.trend_strength,
+        'volatility': pred.volatility,
+        'volatility_regime': pred.volatility_regime,
+        'adaptive_threshold': pred.adaptive_threshold,
+        'signal_score': pred.signal_score,
+        'action': action_clean,
+        'signal_strength': pred.signal_strength,
+        'warnings': '; '.join(pred.warnings) if pred.warnings else '',
+        'details': json.dumps(asdict(pred), default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+    }
+
+
+def log_to_csv(predictions: List, db_path=None, run_id: str = None) -> str:
+    """
+    Log one run of predictions to the SQLite prediction store (single transaction).
+    Kept under its old name for callers; the legacy predictions_log.csv is migrated on first use.
+    """
+    from src.prediction_store import PredictionStore
+    
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with PredictionStore(db_path) as store:
+        run_id = store.insert_many([prediction_log_row(p, timestamp) for p in predictions], run_id)
+        path = store.path
     
-    print(f"\n📊 Predictions logged to: {csv_path.absolute()}")
+    print(f"\n📊 Predictions logged to: {path.absolute()} (run {run_id})")
+    return run_id
 
 
 # ============================================================================
@@ -1423,7 +2192,10 @@ Examples:
   python predict.py -s AAPL
   python predict.py -s AAPL MSFT GOOGL --table
   python predict.py --portfolio
+  python predict.py --universe mega-cap       (universes/*.txt, see src/universe.py)
   python predict.py -s AAPL --detailed
+  python predict.py --portfolio --via-daemon   (after: python predict_daemon.py)
+  python predict.py --screen -u sp500 --top 10 (cheap filters first, model for survivors)
   
 Features:
   ✅ Real-time price fetching from yfinance
@@ -1437,14 +2209,36 @@ Features:
     )
     
     parser.add_argument("-s", "--stocks", nargs="+", help="Stock symbols")
-    parser.add_argument("-p", "--portfolio", action="store_true", help="Default portfolio")
+    parser.add_argument("-p", "--portfolio", action="store_true", help="Default portfolio (universes/portfolio.txt)")
+    parser.add_argument("-u", "--universe", help="Named universe, list file or comma list (see src/universe.py)")
     parser.add_argument("--table", action="store_true", help="Show comparative table (auto for 2+ stocks)")
     parser.add_argument("--detailed", action="store_true", help="Show detailed analysis for each stock")
-    parser.add_argument("--no-log", action="store_true", help="Don't log to CSV")
+    parser.add_argument("--no-log", action="store_true", help="Don't log to the prediction store")
     parser.add_argument("--check", action="store_true", help="Check setup")
+    parser.add_argument("--backend", choices=["auto", "keras", "savedmodel", "tflite", "tflite_int8"],
+                        default=None, help="Inference backend (default: fastest exported, see train.py --export)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage latency table and append spans to runs/traces.jsonl")
+    parser.add_argument("--via-daemon", action="store_true",
+                        help="Get predictions from a running predict_daemon.py (falls back to in-process)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute every prediction (skip the result cache, see src/result_cache.py)")
+    parser.add_argument("--screen", action="store_true",
+                        help="Filter the universe on liquidity / volatility / regime before running the model")
+    parser.add_argument("--top", type=int, default=None,
+                        help=f"Predictions kept by --screen, best signal score first (default: {Config.SCREEN_TOP_K})")
     
     args = parser.parse_args()
     
+    if args.profile:
+        tracing.enable()
+    
+    global INFERENCE_BACKEND, RESULT_CACHE_ENABLED
+    if args.backend:
+        INFERENCE_BACKEND = args.backend
+    if args.no_cache:
+        RESULT_CACHE_ENABLED = False
+    
     # Check setup
     if args.check:
         print("\n" + "="*80)
@@ -1464,6 +2258,24 @@ Features:
             if p.exists():
                 found = True
         
+        batch_check = validate_batch_engine()
+        status = "✅" if batch_check['passed'] else "❌"
+        print(f"   {status} Batch decision engine + rolling / panel regime vs scalar ({batch_check['cases']} cases): "
+              f"{batch_check['mismatches']}")
+        
+        from src.inference import fastest_backend, load_manifest
+        manifest = load_manifest(Path(__file__).parent / "models" / "inference",
+                                 Path(__file__).parent / "models" / "stock_model_fixed.keras")
+        if manifest:
+            print(f"   ✅ Inference export: fastest backend = {fastest_backend(manifest)}")
+        else:
+            print("   ⚠️  No up-to-date inference export (python train.py --export) - Keras fallback")
+        
+        from src.lazy_imports import loaded_heavy_modules
+        heavy = loaded_heavy_modules()
+        status = "⚠️ " if heavy else "✅"
+        print(f"   {status} Fast startup: {', '.join(heavy) + ' imported' if heavy else 'TensorFlow / sklearn / yfinance not loaded'}")
+        
         print("\n" + "="*80)
         if found:
             print("✅ Ready! Run: python predict.py --portfolio")
@@ -1473,23 +2285,60 @@ Features:
         return
     
     # Determine stocks to analyze
-    if args.portfolio:
-        symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'AMD']
+    from src.universe import load_universe
+    if args.portfolio or args.universe:
+        symbols = load_universe('portfolio' if args.portfolio else args.universe)
     elif args.stocks:
         symbols = args.stocks
+    elif args.screen:
+        symbols = load_universe()
     else:
         print("\n❌ Usage:")
         print("   python predict.py -s AAPL MSFT")
         print("   python predict.py --portfolio")
+        print("   python predict.py --universe mega-cap")
         print("   python predict.py --check\n")
         sys.exit(1)
     
-    # NEW: Initialize performance tracker
-    performance_tracker = StockPerformanceTracker()
+    # Screen: vectorized filters over the whole universe, model only for the survivors
+    if args.screen:
+        print(f"\n🔎 Screening {len(symbols)} stocks (local price history, no live quotes until the model stage)...")
+        performance_tracker = StockPerformanceTracker()
+        top, scored, report = UniverseScreener.run(symbols, args.top, performance_tracker)
+        print_screen_report(report)
+        if top:
+            print_comparative_table(top)
+            if args.detailed:
+                for pred in top:
+                    print_detailed_analysis(pred)
+        else:
+            print("\n⚠️  Nothing passed the screen")
+        if scored and not args.no_log:
+            with span('log'):
+                log_to_csv(scored)
+        if args.profile:
+            tracing.print_profile(tracing.flush())
+        return
+    
+    # Warm daemon (model, price history and quotes already in memory)
+    served = None
+    if args.via_daemon:
+        from predict_daemon import DaemonUnavailable, request_predictions
+        try:
+            with span('daemon'):
+                served = request_predictions(symbols)
+        except DaemonUnavailable as e:
+            print(f"\n⚠️  Prediction daemon unavailable ({e}) - predicting in-process")
     
     print(f"\n🚀 Analyzing {len(symbols)} stocks with Enhanced v2 Model")
-    print(f"   📡 Fetching real-time prices from yfinance (with 3 retries per stock)...")
-    print(f"   📊 Using historical accuracy tracking for calibration...")
+    if served is not None:
+        print(f"   🔌 Served by prediction daemon in {served['elapsed_ms']:.0f}ms")
+    else:
+        # NEW: Initialize performance tracker
+        performance_tracker = StockPerformanceTracker()
+        print(f"   📡 Fetching real-time prices from yfinance (one batched request)...", end="", flush=True)
+        print(f" {RealTimePriceFetcher.prefetch(symbols)}/{len(symbols)} quotes")
+        print(f"   📊 Using historical accuracy tracking for calibration...")
     print(f"   Analysis Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"   {'Stock':<8} {'Status':<60} {'Score':>6}")
     
@@ -1499,15 +2348,27 @@ Features:
     for symbol in symbols:
         try:
             print(f"   {symbol:<8}", end="", flush=True)
-            pred = predict_stock_enhanced(symbol, performance_tracker)  # Pass tracker
+            if served is not None:
+                fields = served['predictions'].get(symbol.upper())
+                if fields is None:
+                    raise RuntimeError(served['errors'].get(symbol.upper(), "not returned by daemon"))
+                pred = EnhancedStockPrediction(**fields)
+            else:
+                pred = predict_stock_enhanced(symbol, performance_tracker)  # Pass tracker
             predictions.append(pred)
             print(f" ✅ Score: {pred.signal_score:.0f}/100")
         except Exception as e:
             print(f" ❌ Error: {str(e)}")
     print("-" * 80)
     
+    cache = get_result_cache() if served is None else None
+    if cache is not None and cache.hits:
+        print(f"   ♻️  {cache.hits}/{cache.hits + cache.misses} results reused from the cache (--no-cache to recompute)")
+    
     if not predictions:
         print("\n❌ No predictions generated")
+        if args.profile:
+            tracing.print_profile(tracing.flush())
         sys.exit(1)
     
     # Display results
@@ -1518,9 +2379,13 @@ Features:
         for pred in predictions:
             print_detailed_analysis(pred)
     
-    # Log to CSV
+    # Log to the prediction store
     if not args.no_log:
-        log_to_csv(predictions)
+        with span('log'):
+            log_to_csv(predictions)
+    
+    if args.profile:
+        tracing.print_profile(tracing.flush())
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
@@ -1571,7 +2436,7 @@ $ python predict.py -s AAPL                    # Analyze Apple
 $ python predict.py -s AAPL MSFT GOOGL        # Compare 3 stocks
 $ python predict.py --portfolio               # Analyze default portfolio (8 stocks)
 $ python predict.py -s TSLA --detailed        # Detailed Tesla analysis
-$ python predict.py --portfolio --no-log      # Don't save to CSV
+$ python predict.py --portfolio --no-log      # Don't log the run
 $ python predict.py --check                   # Verify model exists
 
 OUTPUT FEATURES:
@@ -1581,7 +2446,7 @@ OUTPUT FEATURES:
 - Comparative table with all metrics
 - Detailed breakdown with reasoning and warnings
 - Summary statistics (best opportunity, average score, R:R, etc.)
-- CSV log file: predictions_log.csv
+- Prediction log: predictions.db (SQLite; migrated from predictions_log.csv)
 
 DEPENDENCIES REQUIRED:
 - tensorflow
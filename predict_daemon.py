@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Prediction Daemon - Keeps the model, parsed price history and market context warm
+between predictions, so repeated calls skip TensorFlow start-up and model loading.
+
+    python predict_daemon.py                    # serve on Config.DAEMON_HOST:DAEMON_PORT
+    python predict_daemon.py --status | --stop
+    python predict.py -s AAPL MSFT --via-daemon # same tables, predictions served warm
+
+Plain HTTP + JSON on localhost (stdlib only), so shell scripts can call it directly:
+    curl -s localhost:8765/predict -d '{"symbols": ["AAPL"], "format": "text"}'
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib import request as urlrequest
+from urllib.error import URLError
+
+sys.path.append(str(Path(__file__).parent))
+from config import Config
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon answering on the configured host / port"""
+
+
+# ============================================================================
+# CLIENT (stdlib only - importing this never loads pandas or TensorFlow)
+# ============================================================================
+def call_daemon(path: str, payload: dict = None, host: str = None, port: int = None,
+                timeout: float = None) -> dict:
+    """GET (no payload) or POST JSON to the daemon; DaemonUnavailable if nothing is listening"""
+    url = f"http://{host or Config.DAEMON_HOST}:{port or Config.DAEMON_PORT}{path}"
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urlrequest.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urlrequest.urlopen(req, timeout=timeout or Config.DAEMON_TIMEOUT) as resp:
+            return json.loads(resp.read())
+    except URLError as e:
+        if getattr(e, 'code', None):
+            body = json.loads(e.read() or b'{}')
+            raise RuntimeError(body.get('error', f"HTTP {e.code}"))
+        raise DaemonUnavailable(f"{url}: {e.reason}")
+    except (ConnectionError, TimeoutError) as e:
+        raise DaemonUnavailable(f"{url}: {e}")
+
+
+def request_predictions(symbols: list, **kwargs) -> dict:
+    """{'predictions': {SYMBOL: EnhancedStockPrediction fields}, 'errors': {SYMBOL: msg}, 'elapsed_ms'}"""
+    return call_daemon('/predict', {'symbols': list(symbols)}, **kwargs)
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+def _json_default(obj):
+    """numpy scalars (and anything else exotic) inside prediction breakdowns"""
+    return obj.item() if hasattr(obj, 'item') else str(obj)
+
+
+class PredictionDaemon:
+    """
+    Warm state shared by every request: the inference backend (predict._BACKEND_CACHE),
+    parsed price CSVs, TTL-cached live quotes / SPY trend, and a performance tracker
+    reloaded only when the prediction store changes. Predictions are serialized by a lock.
+    """
+
+    def __init__(self, backend: str = None, quote_ttl: float = None, market_ttl: float = None):
+        import predict
+
+        self.predict = predict
+        if backend:
+            predict.INFERENCE_BACKEND = backend
+        predict.PRICE_CSV_CACHE = True
+        predict.RESULT_CACHE_SOURCE = 'daemon'
+        predict.RealTimePriceFetcher.QUOTE_TTL = Config.DAEMON_QUOTE_TTL if quote_ttl is None else quote_ttl
+        predict.MarketDataFetcher.MARKET_TTL = Config.DAEMON_MARKET_TTL if market_ttl is None else market_ttl
+
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.served = 0
+        self._tracker = None
+        self._tracker_stamp = None
+
+    def warm(self) -> float:
+        """Load the model and run one dummy inference (graph tracing); returns seconds"""
+        import numpy as np
+
+        start = time.perf_counter()
+        model_path = self.predict.find_model_path()
+        if model_path is None:
+            raise FileNotFoundError("Model not found. Run: python train_fixed.py")
+        backend = self.predict.get_inference_backend(model_path)
+        backend.predict(np.zeros((1, 60, len(self.predict.PREDICTION_FEATURES)), dtype=np.float32))
+        return time.perf_counter() - start
+
+    def tracker(self):
+        """StockPerformanceTracker, rebuilt when the prediction store (or its WAL) is modified"""
+        db = Path(Config.PREDICTION_DB)
+        stamp = tuple(p.stat().st_mtime_ns if p.exists() else 0
+                      for p in (db, db.with_name(db.name + '-wal')))
+        if self._tracker is None or stamp != self._tracker_stamp:
+            self._tracker = self.predict.StockPerformanceTracker()
+            self._tracker_stamp = stamp
+        return self._tracker
+
+    def run(self, symbols: list, fmt: str = 'json', detailed: bool = False, log: bool = False) -> dict:
+        start = time.perf_counter()
+        predictions, errors = {}, {}
+        with self.lock, redirect_stdout(io.StringIO()):
+            self.requests += 1
+            tracker = self.tracker()
+            self.predict.RealTimePriceFetcher.prefetch(symbols)    # One quote call for every uncached symbol
+            for symbol in symbols:
+                symbol = str(symbol).upper()
+                try:
+                    predictions[symbol] = self.predict.predict_stock_enhanced(symbol, tracker)
+                except Exception as e:
+                    errors[symbol] = str(e)
+            self.served += len(predictions)
+            if log and predictions:
+                self.predict.log_to_csv(list(predictions.values()))
+
+        response = {'errors': errors}
+        if fmt == 'text':
+            with self.lock:
+                response['text'] = self.render(list(predictions.values()), detailed)
+        else:
+            response['predictions'] = {s: asdict(p) for s, p in predictions.items()}
+        response['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return response
+
+    def render(self, predictions: list, detailed: bool) -> str:
+        """The tables predict.py would print for these predictions"""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            if len(predictions) > 1:
+                self.predict.print_comparative_table(predictions)
+            if detailed or len(predictions) == 1:
+                for pred in predictions:
+                    self.predict.print_detailed_analysis(pred)
+        return out.getvalue()
+
+    def status(self) -> dict:
+        backends = [type(b).__name__ for b in self.predict._BACKEND_CACHE.values()]
+        cache = self.predict.get_result_cache()
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - self.started, 1),
+            'backend': backends[0] if backends else None,
+            'requests': self.requests,
+            'predictions_served': self.served,
+            'cached_csvs': len(self.predict._PRICE_CSVS),
+            'cached_quotes': len(self.predict.RealTimePriceFetcher._quotes),
+            'prefetched_quotes': len(self.predict.RealTimePriceFetcher._prefetched),
+            'result_cache_hits': cache.hits if cache else None,
+            'result_cache_misses': cache.misses if cache else None,
+        }
+
+
+def make_handler(daemon: PredictionDaemon, server_ref: list):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, body: dict):
+            data = json.dumps(body, default=_json_default).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, daemon.status())
+            else:
+                self._send(404, {'error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError as e:
+                self._send(400, {'error': f"Bad JSON: {e}"})
+                return
+
+            if self.path == '/predict':
+                symbols = payload.get('symbols')
+                if not symbols or not isinstance(symbols, list):
+                    self._send(400, {'error': "Expected {\"symbols\": [...]}"})
+                    return
+                self._send(200, daemon.run(symbols, payload.get('format', 'json'),
+                                           bool(payload.get('detailed')), bool(payload.get('log'))))
+            elif self.path == '/shutdown':
+                self._send(200, {'status': 'stopping'})
+                threading.Thread(target=server_ref[0].shutdown, daemon=True).start()
+            else:
+                self._send(404, {'error': f"Unknown path {self.path}"})
+
+        def log_message(self, fmt, *args):
+            if os.environ.get('STOCK_DAEMON_VERBOSE'):
+                super().log_message(fmt, *args)
+
+    return Handler
+
+
+def serve(host: str = None, port: int = None, backend: str = None,
+          quote_ttl: float = None, market_ttl: float = None):
+    host, port = host or Config.DAEMON_HOST, port or Config.DAEMON_PORT
+
+    print("\n" + "="*80)
+    print("🔌 PREDICTION DAEMON")
+    print("="*80)
+    daemon = PredictionDaemon(backend, quote_ttl, market_ttl)
+    print("   Warming model...", end="", flush=True)
+    print(f" ✅ {daemon.warm():.1f}s ({daemon.status()['backend']})")
+
+    server_ref = []
+    server = ThreadingHTTPServer((host, port), make_handler(daemon, server_ref))
+    server_ref.append(server)
+    print(f"   Listening on http://{host}:{port} (quotes cached "
+          f"{daemon.predict.RealTimePriceFetcher.QUOTE_TTL:g}s, SPY trend {daemon.predict.MarketDataFetcher.MARKET_TTL:g}s)")
+    print("   Stop with: python predict_daemon.py --stop")
+    print("="*80 + "\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"👋 Daemon stopped after {daemon.requests} requests")
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Warm prediction daemon for predict.py --via-daemon")
+    parser.add_argument("--host", default=None, help=f"Bind address (default: {Config.DAEMON_HOST})")
+    parser.add_argument("--port", type=int, default=None, help=f"Port (default: {Config.DAEMON_PORT})")
+    parser.add_argument("--backend", choices=["auto", "keras", "savedmodel", "tflite", "tflite_int8"],
+                        default=None, help="Inference backend (default: fastest exported)")
+    parser.add_argument("--quote-ttl", type=float, default=None,
+                        help=f"Seconds a live quote is reused (default: {Config.DAEMON_QUOTE_TTL})")
+    parser.add_argument("--market-ttl", type=float, default=None,
+                        help=f"Seconds the SPY trend is reused (default: {Config.DAEMON_MARKET_TTL})")
+    parser.add_argument("--status", action="store_true", help="Print a running daemon's status")
+    parser.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        try:
+            result = call_daemon('/shutdown' if args.stop else '/health', {} if args.stop else None,
+                                 host=args.host, port=args.port, timeout=5)
+        except DaemonUnavailable as e:
+            print(f"❌ No daemon running ({e})")
+            sys.exit(1)
+        if args.stop:
+            print("✅ Daemon stopping")
+        else:
+            for key, value in result.items():
+                print(f"   {key:<20} {value}")
+        return
+
+    serve(args.host, args.port, args.backend, args.quote_ttl, args.market_ttl)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Historical Backtest - Replays the full predict.py decision stack over every past window
+One batched inference call, array decision layer, vectorized 5-day stop/target detection
+The market_trend input is SPY above its 200 EMA, as in live predictions, read from local data
+(training cache or update_data.py's CSV). Without a cached SPY history it falls back to the stock's own trend (live
+predict.py's failure fallback); the report says which input was used.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+HORIZON = 5
+MARKET_SYMBOL = "SPY"
+SEQ_LEN = 60
+TRADE_ACTIONS = ("🟢 STRONG BUY", "🟢 BUY", "🔴 STRONG SELL", "🔴 SELL")
+
+
+# ============================================================================
+# DATA
+# ============================================================================
+def load_history(symbol: str, years: float = None) -> pd.DataFrame:
+    """OHLCV from the local training cache (no network), tz-naive daily index"""
+    from src.data_loader import fetch_stock_data
+
+    df = fetch_stock_data(symbol, use_cache=True)
+    if df.empty:
+        raise ValueError(f"No cached data for {symbol}")
+    df.index = pd.to_datetime(df.index, utc=True).tz_convert(None).normalize()
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+    if years:
+        df = df[df.index >= df.index[-1] - pd.DateOffset(years=years)]
+    return df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+
+
+def load_market_trend() -> pd.DataFrame:
+    """SPY close above its 200 EMA per date from local data (never downloads); None if not cached"""
+    from src.outcome_resolver import load_price_store
+
+    if (Config.DATA_DIR / MARKET_SYMBOL / f"{MARKET_SYMBOL}_data.csv").exists():
+        close = load_history(MARKET_SYMBOL)['close']
+    else:
+        close = load_price_store(MARKET_SYMBOL).get('close')     # update_data.py's data/SPY.csv
+    if close is None or close.empty:
+        return None
+    ema_200 = close.ewm(span=200, adjust=False).mean()
+    return (close > ema_200).astype(int).to_frame('market_trend')
+
+
+def expanding_robust_scale(X: np.ndarray) -> tuple:
+    """
+    RobustScaler statistics as live prediction would have fit them on each date:
+    center/scale at row t use rows 0..t only (no lookahead)
+    """
+    frame = pd.DataFrame(X).expanding(min_periods=1)
+    center = frame.median().values
+    scale = (frame.quantile(0.75) - frame.quantile(0.25)).values
+    scale = np.where((scale == 0) | np.isnan(scale), 1.0, scale)
+    return center, scale
+
+
+def build_windows(df: pd.DataFrame, feature_cols: list, scaler: str = 'expanding') -> tuple:
+    """All 60-day model windows ending on each date; returns (windows, end_row_index)"""
+    X = df[feature_cols].values.astype(float)
+    windows = sliding_window_view(X, SEQ_LEN, axis=0).transpose(0, 2, 1)   # (N, 60, F)
+    end_rows = np.arange(SEQ_LEN - 1, len(X))
+
+    if scaler == 'expanding':
+        center, scale = expanding_robust_scale(X)
+        windows = (windows - center[end_rows][:, None, :]) / scale[end_rows][:, None, :]
+    else:
+        from sklearn.preprocessing import RobustScaler
+        windows = RobustScaler().fit(X).transform(X)[sliding_window_view(np.arange(len(X)), SEQ_LEN)]
+
+    # Indicator warm-up rows are NaN; the model never saw those windows
+    valid = np.isfinite(windows).all(axis=(1, 2))
+    return windows[valid].astype(np.float32), end_rows[valid]
+
+
+# ============================================================================
+# TRADE SIMULATION
+# ============================================================================
+def simulate_trades(df: pd.DataFrame, rows: np.ndarray, side: np.ndarray, target: np.ndarray,
+                    stop: np.ndarray, horizon: int = HORIZON) -> dict:
+    """
+    Enter at the signal-day close, then scan the next `horizon` bars at once.
+    A bar that touches both levels counts as a stop; gaps through a level fill at the open.
+    Trades without `horizon` future bars are dropped (unresolved).
+    """
+    o, h, l, c = (df[k].values for k in ('open', 'high', 'low', 'close'))
+    keep = rows + horizon < len(df)
+    rows, side, target, stop = rows[keep], side[keep], target[keep], stop[keep]
+
+    future = rows[:, None] + np.arange(1, horizon + 1)[None, :]          # (T, H)
+    fo, fh, fl = o[future], h[future], l[future]
+    long = (side > 0)[:, None]
+
+    stop_hit = np.where(long, fl <= stop[:, None], fh >= stop[:, None])
+    target_hit = np.where(long, fh >= target[:, None], fl <= target[:, None])
+
+    first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), horizon)
+    first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), horizon)
+    stopped = (first_stop < horizon) & (first_stop <= first_target)
+    targeted = (first_target < horizon) & ~stopped
+
+    idx = np.arange(len(rows))
+    bar = np.where(stopped, first_stop, np.where(targeted, first_target, horizon - 1))
+    open_at = fo[idx, bar]
+    level = np.where(stopped, stop, target)
+    gapped = np.where(side > 0,
+                      np.where(stopped, open_at < level, open_at > level),
+                      np.where(stopped, open_at > level, open_at < level))
+    exit_price = np.where(stopped | targeted, np.where(gapped, open_at, level), c[rows + horizon])
+
+    entry = c[rows]
+    return {
+        'rows': rows,
+        'side': side,
+        'entry': entry,
+        'exit': exit_price,
+        'outcome': np.where(stopped, 'STOP', np.where(targeted, 'TARGET', 'TIME')),
+        'bars_held': bar + 1,
+        'return': side * (exit_price - entry) / entry,
+    }
+
+
+# ============================================================================
+# BACKTEST
+# ============================================================================
+def backtest(symbols=None, years: float = 10, model_path=None, scaler: str = 'expanding',
+             trade_actions=TRADE_ACTIONS, horizon: int = HORIZON, verbose: bool = True) -> tuple:
+    """
+    Run model + decision layer over every historical date of every symbol.
+    Returns (summary per symbol, trades) DataFrames.
+    """
+    from src.inference import load_compiled_model
+    from src.universe import chunked
+
+    symbols = [s.upper() for s in (symbols or Config.SUPPORTED_STOCKS)]
+    timings = {'features': 0.0, 'inference': 0.0, 'decisions': 0.0, 'simulation': 0.0}
+    started = time.perf_counter()
+    model = load_compiled_model(model_path or Config.MODEL_PATH)
+    market = load_market_trend()
+
+    # Windows of Config.UNIVERSE_CHUNK symbols at a time (bounded memory for large universes)
+    decisions, trades = [], []
+    for chunk in chunked(symbols):
+        d, t = _backtest_chunk(chunk, years, model, scaler, trade_actions, horizon, timings, market)
+        decisions.append(d)
+        trades.append(t)
+    decisions = pd.concat(decisions, ignore_index=True)
+    traded = [t for t in trades if len(t)]
+    trades = pd.concat(traded, ignore_index=True) if traded else trades[0]
+
+    summary = summarize(decisions, trades)
+    timings['total'] = time.perf_counter() - started
+
+    if verbose:
+        print_backtest_report(summary, timings, len(decisions), market is not None)
+    return summary, trades
+
+
+def _backtest_chunk(symbols: list, years: float, model, scaler: str, trade_actions, horizon: int,
+                    timings: dict, market: pd.DataFrame = None) -> tuple:
+    """Steps 1-4 of backtest() for one chunk of symbols; adds stage seconds to `timings`"""
+    import predict as live
+
+    # 1. Features + windows per symbol
+    t0 = time.perf_counter()
+    frames, windows, index = {}, [], []
+    for symbol in symbols:
+        df = load_history(symbol, years)
+        df = live.create_prediction_features(df, fetch_market=False, market=market)
+        w, rows = build_windows(df, live.PREDICTION_FEATURES, scaler)
+        frames[symbol] = df
+        windows.append(w)
+        index.append(pd.DataFrame({'symbol': symbol, 'row': rows}))
+    index = pd.concat(index, ignore_index=True)
+    timings['features'] += time.perf_counter() - t0
+
+    # 2. One batched inference over every window of the chunk
+    t0 = time.perf_counter()
+    index['week_prob_up'] = model.predict(np.concatenate(windows))[2][:, 0]
+    timings['inference'] += time.perf_counter() - t0
+
+    # 3. Decision layer (array versions of predict.py's scalar functions)
+    t0 = time.perf_counter()
+    decisions = []
+    for symbol, group in index.groupby('symbol', sort=False):
+        df, rows = frames[symbol], group['row'].values
+        close = df['close'].values
+        atr = np.nan_to_num(df['atr'].values[rows], nan=1.0)
+        vol = np.nan_to_num(df['volatility'].values[rows], nan=0.02)
+
+        regimes = live.EnhancedMarketRegime.analyze_regime_rolling(df).iloc[rows]
+        regime = regimes['regime'].values.astype(str)
+        trend_strength = regimes['trend_strength'].values.astype(float)
+
+        inputs = live.AdaptiveThresholds.threshold_inputs(close)
+        th = live.AdaptiveThresholds.calculate_stock_threshold_batch(
+            inputs['vol_ratio'][rows], vol, inputs['trend_consistency'][rows], regime)
+        prob = group['week_prob_up'].values
+        risk = live.ImprovedRiskManagement.calculate_optimal_levels_batch(
+            close[rows], atr, vol, prob, trend_strength)
+        direction = np.where(prob > 0.5, "UP", "DOWN")
+        dec = live.WeightedDecisionEngine.calculate_signal_score_batch(
+            prob, th['threshold'], risk['risk_reward'], regime, direction, vol)
+
+        decisions.append(pd.DataFrame({
+            'symbol': symbol, 'row': rows, 'date': df.index[rows], 'close': close[rows],
+            'week_prob_up': prob, 'threshold': th['threshold'], 'regime': regime,
+            'score': dec['score'], 'action': dec['action'],
+            'target_high': risk['target_high'], 'target_low': risk['target_low'],
+            'stop_loss': risk['stop_loss'], 'risk_reward': risk['risk_reward'],
+        }))
+    decisions = pd.concat(decisions, ignore_index=True)
+    timings['decisions'] += time.perf_counter() - t0
+
+    # 4. Trade simulation against the following OHLC bars
+    t0 = time.perf_counter()
+    trades = []
+    for symbol, group in decisions[decisions['action'].isin(trade_actions)].groupby('symbol', sort=False):
+        side = np.where(group['action'].str.contains("BUY"), 1, -1)
+        # Near edge of the target band is the take-profit level
+        target = np.where(side > 0, group['target_low'], group['target_high'])
+        sim = simulate_trades(frames[symbol], group['row'].values, side, target,
+                              group['stop_loss'].values, horizon)
+        t = pd.DataFrame(sim)
+        t['symbol'] = symbol
+        t['date'] = frames[symbol].index[t['rows']]
+        trades.append(t)
+    trades = pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(
+        columns=['rows', 'side', 'entry', 'exit', 'outcome', 'bars_held', 'return', 'symbol', 'date'])
+    timings['simulation'] += time.perf_counter() - t0
+
+    return decisions, trades
+
+
+def summarize(decisions: pd.DataFrame, trades: pd.DataFrame) -> pd.DataFrame:
+    """Hit rates, P&L and turnover per symbol"""
+    rows = []
+    for symbol, d in decisions.groupby('symbol', sort=False):
+        t = trades[trades['symbol'] == symbol]
+        years = max((d['date'].iloc[-1] - d['date'].iloc[0]).days / 365.25, 1e-9)
+        n = len(t)
+        rows.append({
+            'symbol': symbol,
+            'days': len(d),
+            'trades': n,
+            'long': int((t['side'] > 0).sum()),
+            'short': int((t['side'] < 0).sum()),
+            'target_rate': float((t['outcome'] == 'TARGET').mean()) if n else np.nan,
+            'stop_rate': float((t['outcome'] == 'STOP').mean()) if n else np.nan,
+            'win_rate': float((t['return'] > 0).mean()) if n else np.nan,
+            'avg_return_pct': float(t['return'].mean() * 100) if n else np.nan,
+            'total_pnl_pct': float(t['return'].sum() * 100),
+            'trades_per_year': n / years,
+            'exposure': float(t['bars_held'].sum() / len(d)) if n else 0.0,
+        })
+    return pd.DataFrame(rows)
+
+
+def print_backtest_report(summary: pd.DataFrame, timings: dict, n_decisions: int, spy_trend: bool = True):
+    print("\n" + "="*100)
+    print(f"📊 BACKTEST: {n_decisions:,} symbol-days, {int(summary['trades'].sum()):,} trades")
+    print("="*100)
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print("-"*100)
+    if spy_trend:
+        print(f"   📈 market_trend: {MARKET_SYMBOL} above its 200 EMA (local cache), as in live predictions")
+    else:
+        print(f"   ⚠️  market_trend: each stock's own 200 EMA - no cached {MARKET_SYMBOL} history, so the model input "
+              f"differs from live predictions (cache it: python update_data.py -s {MARKET_SYMBOL})")
+    print("   ⏱️  " + " | ".join(f"{k}: {v:.2f}s" for k, v in timings.items()))
+    print("="*100)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest the full prediction + decision stack")
+    parser.add_argument("-s", "--stocks", nargs="+", help="Symbols (default: Config.SUPPORTED_STOCKS)")
+    parser.add_argument("-u", "--universe", help="Named universe, list file or comma list (see src/universe.py)")
+    parser.add_argument("--years", type=float, default=10, help="History to replay (default: 10)")
+    parser.add_argument("--scaler", choices=["expanding", "full"], default="expanding",
+                        help="expanding = no lookahead (default); full = fit on all history like today's run")
+    parser.add_argument("--output", help="Write the trade list to this CSV")
+    args = parser.parse_args()
+
+    from src.universe import resolve_symbols
+    summary, trades = backtest(resolve_symbols(args.stocks, args.universe), years=args.years, scaler=args.scaler)
+    if args.output:
+        trades.to_csv(args.output, index=False)
+        print(f"💾 Trades saved: {args.output}")
@@ -0,0 +1,183 @@
+"""
+Probability Calibration - Vectorized temperature / Platt / isotonic calibration
+Fitted parameters live in the model bundle (models/calibration.json) next to the .keras file
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+TEMPERATURE_GRID = np.linspace(0.5, 3, 50)
+METHODS = ('temperature', 'platt', 'isotonic')
+_EPS = 1e-7
+
+# Calibrated head -> model output index (train.build_model: tomorrow_direction,
+# tomorrow_price, week_direction, week_price); only the direction heads are probabilities
+HEAD_INDEX = {'tomorrow': 0, 'week': 2}
+
+
+def head_probs(preds, head: str) -> np.ndarray:
+    """Flattened raw probabilities of a calibration head from model.predict outputs"""
+    if not isinstance(preds, (list, tuple)):
+        return np.asarray(preds).ravel()       # Single-output model: one probability for every head
+    return np.asarray(preds[HEAD_INDEX[head]]).ravel()
+
+
+def to_logits(p) -> np.ndarray:
+    p = np.clip(np.asarray(p, dtype=np.float64), _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
+
+
+def sigmoid(z) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def brier_score(p, y) -> float:
+    return float(np.mean((np.asarray(p) - np.asarray(y)) ** 2))
+
+
+def log_loss(p, y) -> float:
+    p = np.clip(np.asarray(p, dtype=np.float64), _EPS, 1 - _EPS)
+    y = np.asarray(y, dtype=np.float64)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+# ============================================================================
+# CALIBRATOR
+# ============================================================================
+class Calibrator:
+    """Maps raw probabilities to calibrated ones; accepts scalars or arrays"""
+
+    def __init__(self, method: str = 'temperature', **params):
+        if method not in METHODS:
+            raise ValueError(f"Unknown calibration method: {method}")
+        self.method = method
+        self.params = params
+
+    def __call__(self, p):
+        scalar = np.ndim(p) == 0
+        if self.method == 'temperature':
+            out = sigmoid(to_logits(p) / self.params['temperature'])
+        elif self.method == 'platt':
+            out = sigmoid(self.params['a'] * to_logits(p) + self.params['b'])
+        else:
+            out = np.interp(np.asarray(p, dtype=np.float64), self.params['x'], self.params['y'])
+        return float(out) if scalar else out
+
+    def to_dict(self) -> dict:
+        return {'method': self.method, **self.params}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Calibrator':
+        data = dict(data)
+        return cls(data.pop('method'), **data)
+
+    def __repr__(self):
+        if self.method == 'isotonic':
+            return f"Calibrator(isotonic, {len(self.params['x'])} knots)"
+        return f"Calibrator({self.method}, " + ", ".join(f"{k}={v:.3f}" for k, v in self.params.items()) + ")"
+
+
+# ============================================================================
+# FITTING
+# ============================================================================
+def temperature_losses(probs, y, temps=None, loss: str = 'brier') -> np.ndarray:
+    """Loss of every candidate temperature at once: a (T, N) broadcast, no Python loop"""
+    temps = np.asarray(TEMPERATURE_GRID if temps is None else temps, dtype=np.float64)
+    logits = to_logits(probs)
+    y = np.asarray(y, dtype=np.float64)
+
+    P = sigmoid(logits[None, :] / temps[:, None])
+    if loss == 'brier':
+        return np.mean((P - y[None, :]) ** 2, axis=1)
+    P = np.clip(P, _EPS, 1 - _EPS)
+    return -np.mean(y * np.log(P) + (1 - y) * np.log(1 - P), axis=1)
+
+
+def fit_temperature(probs, y, temps=None, loss: str = 'brier', optimize: bool = False) -> Calibrator:
+    """Grid search over temps (broadcast), or a bounded 1-D optimizer on NLL"""
+    if optimize:
+        from scipy.optimize import minimize_scalar
+        logits = to_logits(probs)
+        y = np.asarray(y, dtype=np.float64)
+        res = minimize_scalar(lambda t: log_loss(sigmoid(logits / t), y), bounds=(0.05, 10.0), method='bounded')
+        return Calibrator('temperature', temperature=float(res.x))
+
+    temps = np.asarray(TEMPERATURE_GRID if temps is None else temps, dtype=np.float64)
+    best = temps[np.argmin(temperature_losses(probs, y, temps, loss))]
+    return Calibrator('temperature', temperature=float(best))
+
+
+def fit_platt(probs, y) -> Calibrator:
+    """Logistic regression on the logit: p' = sigmoid(a * logit(p) + b)"""
+    from sklearn.linear_model import LogisticRegression
+    lr = LogisticRegression(C=1e6)
+    lr.fit(to_logits(probs).reshape(-1, 1), np.asarray(y).astype(int))
+    return Calibrator('platt', a=float(lr.coef_[0, 0]), b=float(lr.intercept_[0]))
+
+
+def fit_isotonic(probs, y) -> Calibrator:
+    """Monotone step fit, stored as interpolation knots"""
+    from sklearn.isotonic import IsotonicRegression
+    iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip')
+    iso.fit(np.asarray(probs, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    return Calibrator('isotonic', x=iso.X_thresholds_.tolist(), y=iso.y_thresholds_.tolist())
+
+
+def fit_calibrator(probs, y, method: str = 'temperature', **kwargs) -> Calibrator:
+    probs = np.asarray(probs, dtype=np.float64).ravel()
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if method == 'temperature':
+        return fit_temperature(probs, y, **kwargs)
+    if method == 'platt':
+        return fit_platt(probs, y)
+    if method == 'isotonic':
+        return fit_isotonic(probs, y)
+    raise ValueError(f"Unknown calibration method: {method}")
+
+
+def compare_methods(probs, y) -> dict:
+    """Brier / log-loss of raw vs every method (in-sample on the given set)"""
+    report = {'raw': {'brier': brier_score(probs, y), 'log_loss': log_loss(probs, y)}}
+    for method in METHODS:
+        cal = fit_calibrator(probs, y, method)
+        p = cal(np.asarray(probs))
+        report[method] = {'brier': brier_score(p, y), 'log_loss': log_loss(p, y), 'calibrator': cal}
+    return report
+
+
+# ============================================================================
+# MODEL BUNDLE
+# ============================================================================
+def save_calibration(calibrators: dict, path=None, val_accuracy: dict = None, source_path=None) -> Path:
+    """Write {head: Calibrator} (+ validation accuracy) beside the model"""
+    path = Path(path or Config.CALIBRATION_PATH)
+    source_path = Path(source_path or Config.MODEL_PATH)
+    bundle = {
+        'fitted_at': datetime.now().isoformat(timespec='seconds'),
+        'source_model': str(source_path),
+        'source_mtime': source_path.stat().st_mtime if source_path.exists() else None,
+        'heads': {head: cal.to_dict() for head, cal in calibrators.items()},
+        'val_accuracy': val_accuracy or {},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(bundle, f, indent=2)
+    return path
+
+
+def load_calibration(path=None) -> dict:
+    """{'heads': {head: Calibrator}, 'val_accuracy': {...}} or None if not fitted yet"""
+    path = Path(path or Config.CALIBRATION_PATH)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        bundle = json.load(f)
+    bundle['heads'] = {head: Calibrator.from_dict(d) for head, d in bundle['heads'].items()}
+    return bundle
@@ -0,0 +1,176 @@
+"""
+Chart Data Service - Ready-to-plot OHLCV + overlays for app.render_charts_page
+Daily / weekly / monthly bars and indicator overlays are built once per price-file version;
+long ranges are min-max bucketed (candles) and LTTB-downsampled (lines) to a target point count.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.outcome_resolver import load_price_store, price_store_path
+
+RESOLUTIONS = {'D': None, 'W': 'W-FRI', 'M': 'ME'}
+RESOLUTION_LABELS = {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly'}
+OVERLAYS = ('SMA 20', 'SMA 50', 'SMA 200', 'BB Upper', 'BB Lower')
+DEFAULT_MAX_POINTS = 600
+
+_OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+_CACHE = {}
+
+
+# ============================================================================
+# DOWNSAMPLING
+# ============================================================================
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that keep a line's visual shape.
+    First and last points are always kept; NaNs (indicator warm-up) are skipped.
+    """
+    valid = np.flatnonzero(np.isfinite(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    xv, yv = x[valid].astype(np.float64), y[valid].astype(np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)      # n_out - 2 buckets between the endpoints
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        nlo, nhi = hi, (edges[b + 2] if b + 2 < len(edges) else n)
+        ax, ay = xv[nlo:nhi].mean(), yv[nlo:nhi].mean()
+        px, py = xv[prev], yv[prev]
+        area = np.abs((px - ax) * (yv[lo:hi] - py) - (px - xv[lo:hi]) * (ay - py))
+        prev = lo + int(np.argmax(area))
+        keep[b + 1] = prev
+    return valid[keep]
+
+
+def minmax_ohlc(df: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """Merge consecutive bars into <= n_out candles; every high and low survives"""
+    if len(df) <= n_out:
+        return df
+    bucket = np.arange(len(df)) * n_out // len(df)
+    out = df.groupby(bucket).agg({**_OHLCV_AGG, **{c: 'last' for c in df.columns if c not in _OHLCV_AGG}})
+    out.index = df.index[np.searchsorted(bucket, np.arange(bucket[-1] + 1))]
+    return out
+
+
+# ============================================================================
+# PRECOMPUTED SERIES
+# ============================================================================
+def resample_ohlcv(df: pd.DataFrame, resolution: str) -> pd.DataFrame:
+    rule = RESOLUTIONS[resolution]
+    if rule is None:
+        return df
+    agg = {k: v for k, v in _OHLCV_AGG.items() if k in df.columns}
+    out = df.resample(rule).agg(agg).dropna(subset=['close'])
+    # Label each bar with its last trading day rather than the calendar period end
+    out.index = df.index.to_series().resample(rule).last().dropna().values
+    return out
+
+
+def compute_overlays(close: pd.Series) -> pd.DataFrame:
+    sma20 = close.rolling(20).mean()
+    std20 = close.rolling(20).std()
+    return pd.DataFrame({
+        'SMA 20': sma20,
+        'SMA 50': close.rolling(50).mean(),
+        'SMA 200': close.rolling(200).mean(),
+        'BB Upper': sma20 + 2 * std20,
+        'BB Lower': sma20 - 2 * std20,
+    }, index=close.index)
+
+
+def load_chart_frames(symbol: str) -> dict:
+    """
+    {resolution: OHLCV + overlay columns}, cached until the price file changes.
+    Overlays are computed on each resolution's own bars (SMA 20 weekly = 20 weeks).
+    """
+    path = price_store_path(symbol)
+    if path is None:
+        return {}
+    key = (symbol, path.stat().st_mtime)
+    if key not in _CACHE:
+        for stale in [k for k in _CACHE if k[0] == symbol]:
+            del _CACHE[stale]
+        daily = load_price_store(symbol)
+        frames = {}
+        for res in RESOLUTIONS:
+            bars = resample_ohlcv(daily, res)
+            frames[res] = bars.join(compute_overlays(bars['close']))
+        _CACHE[key] = frames
+    return _CACHE[key]
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+def pick_resolution(n_daily_bars: int, max_points: int) -> str:
+    """Finest resolution whose bar count fits the budget (monthly if none does)"""
+    for res, bars_per in (('D', 1), ('W', 5), ('M', 21)):
+        if n_daily_bars / bars_per <= max_points:
+            return res
+    return 'M'
+
+
+def get_chart_data(symbol: str, days: int = None, resolution: str = 'auto',
+                   max_points: int = DEFAULT_MAX_POINTS, overlays=OVERLAYS) -> dict:
+    """
+    Ready-to-plot arrays for the last `days` sessions (None = full history):
+    x/open/high/low/close/volume (<= max_points candles) and {overlay: (x, y)} LTTB-downsampled.
+    """
+    frames = load_chart_frames(symbol.upper())
+    if not frames:
+        return None
+
+    daily = frames['D']
+    start = daily.index[-min(days, len(daily))] if days else daily.index[0]
+    if resolution == 'auto':
+        resolution = pick_resolution(min(days or len(daily), len(daily)), max_points)
+
+    bars = frames[resolution]
+    bars = bars[bars.index >= start]
+    candles = minmax_ohlc(bars, max_points)
+
+    x_ns = bars.index.values.astype('datetime64[ns]').astype(np.int64)
+    lines = {}
+    for name in overlays:
+        y = bars[name].values
+        idx = lttb(x_ns, y, max_points)
+        lines[name] = (bars.index[idx], y[idx])
+
+    return {
+        'symbol': symbol.upper(),
+        'resolution': resolution,
+        'n_source': len(bars),
+        'x': candles.index,
+        'open': candles['open'].values,
+        'high': candles['high'].values,
+        'low': candles['low'].values,
+        'close': candles['close'].values,
+        'volume': candles['volume'].values if 'volume' in candles else None,
+        'overlays': lines,
+    }
+
+
+def price_stats(symbol: str, days: int = 90) -> dict:
+    """High / low / 1-week / 1-month change over the last `days` sessions"""
+    frames = load_chart_frames(symbol.upper())
+    if not frames:
+        return None
+    daily = frames['D']
+    recent = daily.tail(days)
+    close = recent['close'].values
+
+    def change(n):
+        return float((close[-1] - close[-n]) / close[-n] * 100) if len(close) >= n else 0.0
+
+    return {'high': float(recent['high'].max()), 'low': float(recent['low'].min()),
+            'week_change': change(5), 'month_change': change(20)}
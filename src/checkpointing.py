@@ -0,0 +1,150 @@
+"""
+Resumable Training - Periodic checkpoints of model, optimizer, RNG and callback state
+Lets an interrupted train.py run pick up from its last completed epoch (--resume RUN_ID)
+"""
+
+import os
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+CHECKPOINT_FILE = "checkpoint.keras"
+STATE_FILE = "state.json"
+BEST_WEIGHTS_FILE = "early_stopping_best.weights.h5"
+
+# Counters each Keras callback resets in on_train_begin()
+_CALLBACK_FIELDS = {
+    'EarlyStopping': ['wait', 'stopped_epoch', 'best', 'best_epoch'],
+    'ReduceLROnPlateau': ['wait', 'best', 'cooldown_counter'],
+    'ModelCheckpoint': ['best'],
+}
+
+
+def _to_json(value):
+    """Convert numpy scalars/arrays (and inf) into JSON-safe values"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+
+def capture_rng_state() -> dict:
+    """Snapshot Python, NumPy and TensorFlow global RNG state"""
+    np_state = np.random.get_state()
+    py_state = random.getstate()
+    return {
+        'numpy': [np_state[0], np_state[1].tolist(), int(np_state[2]), int(np_state[3]), float(np_state[4])],
+        'python': [py_state[0], list(py_state[1]), py_state[2]],
+        'tensorflow': tf.random.get_global_generator().state.numpy().tolist(),
+    }
+
+
+def restore_rng_state(state: dict):
+    """Restore RNG state captured by capture_rng_state()"""
+    name, keys, pos, has_gauss, cached = state['numpy']
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached))
+
+    version, internal, gauss_next = state['python']
+    random.setstate((version, tuple(internal), gauss_next))
+
+    generator = tf.random.get_global_generator()
+    generator.state.assign(np.array(state['tensorflow'], dtype=generator.state.dtype.as_numpy_dtype))
+
+
+def load_resume_state(run_dir) -> dict:
+    """Read state.json of a run (None if the run has no checkpoint yet)"""
+    state_path = Path(run_dir) / STATE_FILE
+    if not state_path.exists() or not (Path(run_dir) / CHECKPOINT_FILE).exists():
+        return None
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def load_checkpoint_model(run_dir):
+    """Load the full model (weights + compiled optimizer state) of a run"""
+    return tf.keras.models.load_model(str(Path(run_dir) / CHECKPOINT_FILE))
+
+
+class ResumableCheckpoint(tf.keras.callbacks.Callback):
+    """
+    Save model + optimizer + epoch + RNG + callback counters every N epochs.
+    Must be placed AFTER the callbacks it tracks so that, on resume, its
+    on_train_begin() restores their counters after Keras has reset them.
+    """
+
+    def __init__(self, run_dir, tracked_callbacks=None, every_n_epochs: int = 1, resume_state: dict = None):
+        super().__init__()
+        self.run_dir = Path(run_dir)
+        self.tracked_callbacks = tracked_callbacks or []
+        self.every_n_epochs = max(1, every_n_epochs)
+        self.resume_state = resume_state
+        self.history = dict(resume_state.get('history', {})) if resume_state else {}
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+    def on_train_begin(self, logs=None):
+        if not self.resume_state:
+            return
+
+        restore_rng_state(self.resume_state['rng'])
+
+        self.model.optimizer.learning_rate.assign(self.resume_state['learning_rate'])
+
+        for cb in self.tracked_callbacks:
+            saved = self.resume_state['callbacks'].get(type(cb).__name__, {})
+            for field, value in saved.items():
+                if field != 'has_best_weights':
+                    setattr(cb, field, value)
+            if saved.get('has_best_weights'):
+                # Rebuild best_weights without disturbing the resumed model weights
+                current = self.model.get_weights()
+                self.model.load_weights(str(self.run_dir / BEST_WEIGHTS_FILE))
+                cb.best_weights = self.model.get_weights()
+                self.model.set_weights(current)
+
+        print(f"   ♻️  Resumed from epoch {self.resume_state['epoch']} ({self.run_dir.name})")
+
+    def on_epoch_end(self, epoch, logs=None):
+        for key, value in (logs or {}).items():
+            self.history.setdefault(key, []).append(float(value))
+
+        completed = epoch + 1
+        if completed % self.every_n_epochs == 0:
+            self.save(completed)
+
+    def save(self, completed_epochs: int):
+        callback_state = {}
+        for cb in self.tracked_callbacks:
+            fields = _CALLBACK_FIELDS.get(type(cb).__name__, [])
+            saved = {f: _to_json(getattr(cb, f)) for f in fields if hasattr(cb, f)}
+            if isinstance(cb, tf.keras.callbacks.EarlyStopping):
+                saved['has_best_weights'] = cb.best_weights is not None
+                if cb.best_weights is not None:
+                    current = self.model.get_weights()
+                    self.model.set_weights(cb.best_weights)
+                    self.model.save_weights(str(self.run_dir / BEST_WEIGHTS_FILE))
+                    self.model.set_weights(current)
+            callback_state[type(cb).__name__] = saved
+
+        state = {
+            'epoch': completed_epochs,
+            'learning_rate': float(tf.keras.backend.get_value(self.model.optimizer.learning_rate)),
+            'rng': capture_rng_state(),
+            'callbacks': callback_state,
+            'history': self.history,
+        }
+
+        # Write-then-rename so a preempted job never leaves a half-written checkpoint
+        tmp_model = self.run_dir / f"{CHECKPOINT_FILE}.tmp.keras"
+        self.model.save(str(tmp_model))
+        os.replace(tmp_model, self.run_dir / CHECKPOINT_FILE)
+
+        tmp_state = self.run_dir / f"{STATE_FILE}.tmp"
+        with open(tmp_state, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_state, self.run_dir / STATE_FILE)
@@ -4,7 +4,6 @@ Fixed version: Handles yfinance MultiIndex columns correctly
 """
 
 import pandas as pd
-import yfinance as yf
 from datetime import datetime
 from pathlib import Path
 import warnings
@@ -12,6 +11,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from config import Config
+from src.lazy_imports import yfinance
 
 def fetch_stock_data(
     symbol: str,
@@ -57,7 +57,7 @@ def fetch_stock_data(
         print(f"   📥 Downloading {symbol}...")
         
         # Download data
-        ticker = yf.Ticker(symbol)
+        ticker = yfinance().Ticker(symbol)
         df = ticker.history(start=start_date, end=end_date)
         
         if df.empty:
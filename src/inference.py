@@ -0,0 +1,426 @@
+"""
+Inference Export - Frozen SavedModel / TFLite artifacts and a runtime backend selector
+train.py exports after fitting; predict.py loads the fastest backend that passed parity
+TensorFlow is imported when a backend is opened or an export runs, not on module import
+(predict.py --check only reads the manifest).
+
+Standalone parity check (fresh windows, every exported backend vs Keras):
+    python src/inference.py --check                          # models/ of this checkout
+    python src/inference.py --check --workspace /tmp/bench   # synthetic benchmark workspace
+"""
+
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.lazy_imports import tensorflow
+
+MANIFEST_FILE = "manifest.json"
+SAVEDMODEL_DIR = "savedmodel"
+TFLITE_FILE = "model.tflite"
+TFLITE_INT8_FILE = "model_int8.tflite"
+
+# Max |diff| vs Keras on every output head for an artifact to be selectable
+PARITY_ATOL = {'savedmodel': 1e-4, 'tflite': 1e-3, 'tflite_int8': 5e-2}
+
+# Never picked by 'auto', only by an explicit --backend: int8 drift can move a probability
+# across the adaptive BUY / SELL thresholds (0.55-0.80) without flipping it at 0.5
+OPT_IN_BACKENDS = ('tflite_int8',)
+
+
+def _output_names(model) -> list:
+    return list(getattr(model, 'output_names', None) or [f"output_{i}" for i in range(len(model.outputs))])
+
+
+# ============================================================================
+# COMPILED KERAS INFERENCE
+# ============================================================================
+class CompiledPredictor:
+    """
+    model(x, training=False) behind a tf.function with a fixed (None, T, F) signature.
+    Traced and warmed up once on construction; avoids the data adapter/iterator that
+    model.predict builds on every call.
+    """
+
+    def __init__(self, model, batch_size: int = 1024):
+        tf = tensorflow()
+        self.model = model
+        self.input_shape = model.input_shape
+        self.batch_size = batch_size
+        spec = tf.TensorSpec((None, *model.input_shape[1:]), tf.float32)
+        self._fn = tf.function(lambda x: model(x, training=False), input_signature=[spec])
+        self._fn(tf.zeros((1, *model.input_shape[1:]), tf.float32))
+
+    def predict(self, X: np.ndarray) -> list:
+        X = np.asarray(X, dtype=np.float32)
+        chunks = [self._fn(X[i:i + self.batch_size]) for i in range(0, max(len(X), 1), self.batch_size)]
+        chunks = [c if isinstance(c, (list, tuple)) else [c] for c in chunks]
+        return [np.concatenate([c[k].numpy() for c in chunks]) for k in range(len(chunks[0]))]
+
+
+_COMPILED_CACHE = {}
+
+
+def load_compiled_model(model_path, compile: bool = False) -> CompiledPredictor:
+    """Load a Keras model once per process (re-loaded if the file changes)"""
+    model_path = Path(model_path)
+    key = (str(model_path.resolve()), model_path.stat().st_mtime)
+    if key not in _COMPILED_CACHE:
+        model = tensorflow().keras.models.load_model(str(model_path), compile=compile)
+        _COMPILED_CACHE[key] = CompiledPredictor(model)
+    return _COMPILED_CACHE[key]
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+class KerasBackend:
+    """Keras model through the compiled single-trace function (reference implementation)"""
+    name = 'keras'
+
+    def __init__(self, model):
+        self.compiled = model if isinstance(model, CompiledPredictor) else CompiledPredictor(model)
+        self.model = self.compiled.model
+        self.output_names = _output_names(self.model)
+
+    def predict(self, X: np.ndarray) -> list:
+        return self.compiled.predict(X)
+
+
+class KerasPredictBackend(KerasBackend):
+    """Uncompiled model.predict path, kept only as the latency baseline"""
+    name = 'keras_predict'
+
+    def predict(self, X: np.ndarray) -> list:
+        outputs = self.model.predict(np.asarray(X, dtype=np.float32), verbose=0)
+        return [np.asarray(o) for o in outputs]
+
+
+class SavedModelBackend:
+    """Concrete serving function of the exported SavedModel"""
+    name = 'savedmodel'
+
+    def __init__(self, path, output_names: list):
+        self.tf = tensorflow()
+        self.loaded = self.tf.saved_model.load(str(path))
+        self.fn = self.loaded.signatures['serving_default']
+        self.input_name = list(self.fn.structured_input_signature[1].keys())[0]
+        self.output_names = output_names
+
+    def predict(self, X: np.ndarray) -> list:
+        out = self.fn(**{self.input_name: self.tf.constant(X, dtype=self.tf.float32)})
+        return [out[name].numpy() for name in self.output_names]
+
+
+class TFLiteBackend:
+    """TFLite interpreter (float32 or dynamic-range int8)"""
+
+    def __init__(self, path, output_names: list, name: str = 'tflite'):
+        self.name = name
+        self.interpreter = tensorflow().lite.Interpreter(model_path=str(path))
+        self.runner = self.interpreter.get_signature_runner()
+        self.input_name = list(self.runner.get_input_details().keys())[0]
+        self.output_names = output_names
+
+    def predict(self, X: np.ndarray) -> list:
+        # Exported with a fixed batch of 1; larger batches run window by window
+        X = np.asarray(X, dtype=np.float32)
+        rows = [self.runner(**{self.input_name: X[i:i + 1]}) for i in range(len(X))]
+        return [np.concatenate([r[name] for r in rows]) for name in self.output_names]
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+def _serving_module(model, input_shape):
+    """tf.Module exposing the model's serving functions (class built once TensorFlow is loaded)"""
+    tf = tensorflow()
+
+    class _ServingModule(tf.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+            # Keras 3 variables (incl. dropout seed state) are not tf.Module-tracked on their own
+            self.tracked_variables = [getattr(v, 'value', v) for v in model.variables]
+            self.names = _output_names(model)
+            self.serve = tf.function(
+                self._serve, input_signature=[tf.TensorSpec((None, *input_shape), tf.float32, name='x')]
+            )
+            # TFLite cannot lower the LSTM loop with a dynamic batch; predict.py sends one window
+            self.serve_single = tf.function(
+                self._serve, input_signature=[tf.TensorSpec((1, *input_shape), tf.float32, name='x')]
+            )
+
+        def _serve(self, x):
+            outputs = self.model(x, training=False)
+            return {name: tf.identity(out, name=name) for name, out in zip(self.names, outputs)}
+
+    return _ServingModule()
+
+
+def check_parity(reference: KerasBackend, backend, windows: np.ndarray, atol: float = None) -> dict:
+    """Compare a backend against Keras on the same windows (max abs diff per head)"""
+    expected = reference.predict(windows)
+    actual = backend.predict(windows)
+    diffs = {name: float(np.max(np.abs(e - a))) for name, e, a in zip(reference.output_names, expected, actual)}
+    atol = PARITY_ATOL.get(backend.name, 1e-4) if atol is None else atol
+
+    # Week direction head decides the signal; count flipped calls at 0.5
+    week = next((i for i, n in enumerate(reference.output_names) if n == 'week_direction'), 2)
+    flips = int(np.sum((expected[week] > 0.5) != (actual[week] > 0.5)))
+
+    return {
+        'max_abs_diff': diffs,
+        'direction_flips': flips,
+        'n_windows': int(len(windows)),
+        'passed': max(diffs.values()) <= atol and flips == 0,
+    }
+
+
+def fastest_backend(manifest: dict) -> str:
+    """Lowest-latency backend that passed parity with no direction flips ('auto'), excluding OPT_IN_BACKENDS"""
+    passing = {n: b for n, b in manifest['backends'].items()
+               if b['parity'].get('passed') and not b['parity'].get('direction_flips')
+               and 'latency' in b and not b.get('baseline') and n not in OPT_IN_BACKENDS}
+    return min(passing, key=lambda n: passing[n]['latency']['median_ms'])
+
+
+def benchmark_backend(backend, window: np.ndarray, n_calls: int = 50, warmup: int = 5) -> dict:
+    """Single-window latency (the shape predict.py sends)"""
+    for _ in range(warmup):
+        backend.predict(window)
+    timings = []
+    for _ in range(n_calls):
+        start = time.perf_counter()
+        backend.predict(window)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': float(np.median(timings)),
+        'p95_ms': float(np.percentile(timings, 95)),
+    }
+
+
+def export_inference_artifacts(model, export_dir, validation_windows: np.ndarray = None,
+                               source_path=None, quantize: bool = True, verbose: bool = True) -> dict:
+    """
+    Write SavedModel + TFLite (+ int8) artifacts, verify parity against the Keras model
+    on validation_windows, benchmark each backend and record everything in manifest.json
+    """
+    tf = tensorflow()
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    input_shape = tuple(int(d) for d in model.input_shape[1:])
+    names = _output_names(model)
+
+    module = _serving_module(model, input_shape)
+    tf.saved_model.save(module, str(export_dir / SAVEDMODEL_DIR),
+                        signatures={'serving_default': module.serve.get_concrete_function()})
+
+    artifacts = {'savedmodel': SAVEDMODEL_DIR}
+    tflite_variants = [('tflite', TFLITE_FILE, False)] + ([('tflite_int8', TFLITE_INT8_FILE, True)] if quantize else [])
+    for name, filename, int8 in tflite_variants:
+        try:
+            converter = tf.lite.TFLiteConverter.from_concrete_functions(
+                [module.serve_single.get_concrete_function()], module
+            )
+            if int8:
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            (export_dir / filename).write_bytes(converter.convert())
+            artifacts[name] = filename
+        except Exception as e:
+            if verbose:
+                print(f"   ⚠️  {name} export failed: {e}")
+
+    if validation_windows is None or len(validation_windows) == 0:
+        validation_windows = np.random.default_rng(0).normal(size=(64, *input_shape)).astype(np.float32)
+    validation_windows = np.asarray(validation_windows, dtype=np.float32)
+
+    reference = KerasBackend(model)
+    single = validation_windows[-1:]
+    manifest = {
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+        'source_model': str(source_path) if source_path else None,
+        'source_mtime': Path(source_path).stat().st_mtime if source_path and Path(source_path).exists() else None,
+        'input_shape': list(input_shape),
+        'output_names': names,
+        'backends': {
+            'keras_predict': {
+                'latency': benchmark_backend(KerasPredictBackend(model), single),
+                'parity': check_parity(reference, KerasPredictBackend(model), validation_windows),
+                'baseline': True,
+            },
+            'keras': {'latency': benchmark_backend(reference, single), 'parity': {'passed': True}},
+        },
+    }
+
+    for name, filename in artifacts.items():
+        try:
+            backend = _open_backend(name, export_dir / filename, names)
+            manifest['backends'][name] = {
+                'path': filename,
+                'parity': check_parity(reference, backend, validation_windows),
+                'latency': benchmark_backend(backend, single),
+            }
+        except Exception as e:
+            manifest['backends'][name] = {'path': filename, 'error': str(e), 'parity': {'passed': False}}
+
+    manifest['fastest'] = fastest_backend(manifest)
+
+    with open(export_dir / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    if verbose:
+        print_export_report(manifest)
+    return manifest
+
+
+def print_export_report(manifest: dict):
+    print("\n" + "="*80)
+    print("📦 INFERENCE EXPORT")
+    print("="*80)
+    print(f"   {'Backend':<14} {'Parity':<8} {'Max |diff|':>12} {'Flips':>6} {'Median':>10} {'p95':>10}")
+    print("-"*80)
+    for name, b in manifest['backends'].items():
+        parity = b.get('parity', {})
+        diff = max(parity['max_abs_diff'].values()) if 'max_abs_diff' in parity else 0.0
+        lat = b.get('latency', {})
+        status = "➖" if b.get('baseline') else ("✅" if parity.get('passed') else "❌")
+        print(f"   {name:<14} {status:<8} {diff:>12.2e} {parity.get('direction_flips', 0):>6} "
+              f"{lat.get('median_ms', float('nan')):>8.2f}ms {lat.get('p95_ms', float('nan')):>8.2f}ms")
+    print("-"*80)
+    before = manifest['backends'].get('keras_predict', {}).get('latency')
+    after = manifest['backends']['keras']['latency']
+    if before:
+        print(f"   ⚡ Compiled Keras call: {before['median_ms']:.2f}ms (model.predict) → {after['median_ms']:.2f}ms")
+    print(f"   🏆 Fastest passing backend: {manifest['fastest']} "
+          f"({', '.join(OPT_IN_BACKENDS)} only with an explicit --backend)")
+    print("="*80)
+
+
+# ============================================================================
+# RUNTIME SELECTOR
+# ============================================================================
+def _open_backend(name: str, path, output_names: list):
+    if name == 'savedmodel':
+        return SavedModelBackend(path, output_names)
+    if name in ('tflite', 'tflite_int8'):
+        return TFLiteBackend(path, output_names, name=name)
+    raise ValueError(f"Unknown inference backend: {name}")
+
+
+def load_manifest(export_dir, model_path=None) -> dict:
+    """Manifest of an export, or None if missing or older than the Keras model"""
+    manifest_path = Path(export_dir) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    mtime = manifest.get('source_mtime')
+    if model_path is not None and mtime is not None and Path(model_path).exists() \
+            and Path(model_path).stat().st_mtime > mtime + 1:
+        return None
+    return manifest
+
+
+def select_backend(model_path, export_dir=None, preference: str = 'auto'):
+    """
+    'auto' → fastest exported backend that passed parity (falls back to Keras; never tflite_int8);
+    'keras' / 'savedmodel' / 'tflite' / 'tflite_int8' → that backend explicitly
+    """
+    model_path = Path(model_path)
+    export_dir = Path(export_dir) if export_dir else model_path.parent / "inference"
+    manifest = load_manifest(export_dir, model_path)
+
+    if preference == 'auto':
+        preference = fastest_backend(manifest) if manifest else 'keras'     # Re-applied to older manifests
+
+    if preference != 'keras':
+        if manifest is None or preference not in manifest['backends']:
+            raise FileNotFoundError(
+                f"No up-to-date '{preference}' export in {export_dir} (run: python train.py --export)"
+            )
+        entry = manifest['backends'][preference]
+        return _open_backend(preference, export_dir / entry['path'], manifest['output_names'])
+
+    return KerasBackend(load_compiled_model(model_path))
+
+
+# ============================================================================
+# STANDALONE PARITY CHECK
+# ============================================================================
+def validate_backends(model_path, export_dir=None, n_windows: int = 256, seed: int = 1) -> dict:
+    """
+    Re-check every exported backend against the Keras model on fresh random windows
+    (not the export's validation windows, and not the parity recorded in the manifest).
+    passed: every backend 'auto' may select is within PARITY_ATOL with no direction flips.
+    """
+    model_path = Path(model_path)
+    export_dir = Path(export_dir) if export_dir else model_path.parent / "inference"
+    manifest = load_manifest(export_dir, model_path)
+    if manifest is None:
+        raise FileNotFoundError(f"No up-to-date export in {export_dir} (run: python train.py --export)")
+
+    reference = KerasBackend(load_compiled_model(model_path))
+    input_shape = tuple(manifest['input_shape'])
+    windows = np.random.default_rng(seed).normal(size=(n_windows, *input_shape)).astype(np.float32)
+
+    results = {}
+    for name, entry in manifest['backends'].items():
+        if name.startswith('keras') or 'path' not in entry or 'error' in entry:
+            continue
+        backend = _open_backend(name, export_dir / entry['path'], manifest['output_names'])
+        results[name] = check_parity(reference, backend, windows)
+    return {
+        'passed': all(r['passed'] for n, r in results.items() if n not in OPT_IN_BACKENDS),
+        'n_windows': n_windows,
+        'backends': results,
+    }
+
+
+def print_validation(report: dict):
+    print("\n" + "="*70)
+    print(f"🔍 BACKEND PARITY vs KERAS ({report['n_windows']} fresh windows)")
+    print("="*70)
+    print(f"   {'Backend':<14} {'Parity':<8} {'Max |diff|':>12} {'Tolerance':>10} {'Flips':>6}")
+    for name, r in report['backends'].items():
+        status = "✅" if r['passed'] else ("➖" if name in OPT_IN_BACKENDS else "❌")
+        print(f"   {name:<14} {status:<8} {max(r['max_abs_diff'].values()):>12.2e} "
+              f"{PARITY_ATOL.get(name, 1e-4):>10.0e} {r['direction_flips']:>6}")
+    print("-"*70)
+    print(f"   {'✅ All auto-selectable backends match Keras' if report['passed'] else '❌ Parity check failed'}"
+          f" ({', '.join(OPT_IN_BACKENDS)} informational: --backend only)")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check exported inference backends against the Keras model")
+    parser.add_argument("--check", action="store_true", help="Re-run parity of every exported backend")
+    parser.add_argument("--workspace", help="Use the synthetic benchmark workspace in this directory "
+                                            "(untrained model, exported on first use)")
+    args = parser.parse_args()
+    if not args.check:
+        parser.print_help()
+        sys.exit(0)
+
+    from config import Config
+
+    if args.workspace:
+        from benchmarks.run import QUICK
+        from benchmarks.workspace import BenchWorkspace
+
+        with BenchWorkspace(args.workspace, n_symbols=QUICK['symbols'], years=QUICK['years']) as ws:
+            if load_manifest(Config.INFERENCE_DIR, ws.model_path) is None:
+                export_inference_artifacts(load_compiled_model(ws.model_path).model, Config.INFERENCE_DIR,
+                                           source_path=ws.model_path, verbose=False)
+            report = validate_backends(ws.model_path, Config.INFERENCE_DIR)
+    else:
+        report = validate_backends(Config.MODEL_PATH, Config.INFERENCE_DIR)
+    print_validation(report)
+    sys.exit(0 if report['passed'] else 1)
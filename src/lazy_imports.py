@@ -0,0 +1,45 @@
+"""
+Lazy Imports - Accessors for the heavy dependencies (TensorFlow, scikit-learn, yfinance, plotly)
+Each is imported on first call and cached by Python, so `predict.py --check`, the Streamlit
+home page and anything else that never predicts does not pay their import cost.
+"""
+
+import logging
+import os
+import sys
+
+HEAVY_MODULES = ('tensorflow', 'sklearn', 'yfinance', 'plotly')
+
+
+def tensorflow():
+    """`tf`, with TensorFlow's C++ / Python logging quieted before the first import"""
+    if 'tensorflow' not in sys.modules:
+        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+        os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '0')
+        logging.getLogger('tensorflow').setLevel(logging.ERROR)
+        logging.getLogger('keras').setLevel(logging.ERROR)
+    import tensorflow as tf
+    return tf
+
+
+def yfinance():
+    import yfinance as yf
+    logging.getLogger('yfinance').setLevel(logging.CRITICAL)
+    return yf
+
+
+def robust_scaler():
+    """sklearn.preprocessing.RobustScaler (the class)"""
+    from sklearn.preprocessing import RobustScaler
+    return RobustScaler
+
+
+def plotly_go():
+    """plotly.graph_objects"""
+    import plotly.graph_objects as go
+    return go
+
+
+def loaded_heavy_modules() -> list:
+    """Which of the heavy dependencies this process has imported so far"""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
@@ -0,0 +1,131 @@
+"""
+Outcome Resolver - Scores logged predictions once their 5-session horizon has passed
+Bulk join of every pending prediction against the local price CSVs, vectorized stop/target
+detection (same rules as the backtest), all outcomes written back in one transaction.
+Runs automatically at the end of update_data.py.
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from src.backtest import HORIZON, simulate_trades
+from src.prediction_store import PredictionStore, OUTCOME_FIELDS
+
+
+# ============================================================================
+# PRICE STORE
+# ============================================================================
+def price_store_path(symbol: str) -> Path:
+    """data/{SYM}.csv (the file update_data.py maintains), or None"""
+    for path in (Config.DATA_DIR / f"{symbol}.csv", Config.DATA_DIR / "stock_data" / f"{symbol}.csv"):
+        if path.exists():
+            return path
+    return None
+
+
+def load_price_store(symbol: str) -> pd.DataFrame:
+    """Daily OHLC(V) from the local price CSV; empty if missing"""
+    path = price_store_path(symbol)
+    if path is None:
+        return pd.DataFrame()
+
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.lower()
+    # First column holds dates; yfinance's extra header rows ('Ticker', 'Date') fail to parse and drop out
+    dates = pd.to_datetime(df.iloc[:, 0], errors='coerce', utc=True, format='ISO8601').dt.tz_convert(None).dt.normalize()
+    df = df[[c for c in ('open', 'high', 'low', 'close', 'volume') if c in df.columns]].apply(pd.to_numeric, errors='coerce')
+    df.index = dates
+    df = df[df.index.notna()].dropna()
+    return df[~df.index.duplicated(keep='last')].sort_index()
+
+
+# ============================================================================
+# RESOLVER
+# ============================================================================
+def score_predictions(pending: pd.DataFrame, prices: pd.DataFrame, horizon: int = HORIZON) -> pd.DataFrame:
+    """
+    Outcomes for one symbol's pending rows (those with `horizon` sessions after price_date).
+    Entry is the logged current_price; the trade follows week_direction with the near edge of
+    the target band as take-profit, exactly as in the backtest.
+    """
+    dates = prices.index.values
+    price_dates = pd.to_datetime(pending['price_date']).values.astype('datetime64[ns]')
+    # Last bar on or before the prediction's price date
+    rows = np.searchsorted(dates, price_dates, side='right') - 1
+    ready = (rows >= 0) & (rows + horizon < len(prices))
+    pending, rows = pending[ready], rows[ready]
+    if pending.empty:
+        return pending.assign(**{f: [] for f in OUTCOME_FIELDS})
+
+    side = np.where(pending['week_direction'].str.upper().str.startswith('UP'), 1, -1)
+    target = np.where(side > 0, pending['target_low'], pending['target_high']).astype(float)
+    sim = simulate_trades(prices, rows, side, target, pending['stop_loss'].values.astype(float), horizon)
+
+    entry = pending['current_price'].values.astype(float)
+    week_close = prices['close'].values[rows + horizon]
+    week_return = week_close / entry - 1
+
+    return pending.assign(
+        resolved_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        exit_date=prices.index[rows + horizon].strftime('%Y-%m-%d'),
+        outcome=(np.sign(week_return) == side).astype(int),
+        hit_target=(sim['outcome'] == 'TARGET').astype(int),
+        hit_stop=(sim['outcome'] == 'STOP').astype(int),
+        exit_price=sim['exit'],
+        week_return=week_return,
+        realized_return=side * (sim['exit'] - entry) / entry,
+    )
+
+
+def resolve_outcomes(db_path=None, horizon: int = HORIZON, update_tracker: bool = True,
+                     verbose: bool = True) -> pd.DataFrame:
+    """Resolve every pending prediction that now has `horizon` sessions of prices"""
+    started = time.perf_counter()
+    store = PredictionStore(db_path)
+    pending = store.unresolved()
+
+    resolved = []
+    for symbol, group in pending.groupby('symbol', sort=False):
+        prices = load_price_store(symbol)
+        if not prices.empty:
+            resolved.append(score_predictions(group, prices, horizon))
+    resolved = pd.concat(resolved, ignore_index=True) if resolved else pending.iloc[:0]
+
+    performance_rows = None
+    if update_tracker and not resolved.empty:
+        from src.performance import StockPerformanceTracker
+        # One tracker outcome per (symbol, price_date): repeated runs of the same day count once
+        fresh = resolved[~resolved['scored'].astype(bool)].drop_duplicates(['symbol', 'price_date'], keep='last')
+        tracker = StockPerformanceTracker(store.path)
+        performance_rows = tracker.apply_many(zip(fresh['symbol'], fresh['outcome']))
+
+    store.write_outcomes(resolved, performance_rows)
+    store.close()
+
+    if verbose:
+        elapsed = time.perf_counter() - started
+        print(f"🎯 Resolved {len(resolved)}/{len(pending)} pending predictions in {elapsed*1000:.0f}ms")
+        if not resolved.empty:
+            print(f"   Direction hit rate: {resolved['outcome'].mean():.1%} | "
+                  f"targets: {int(resolved['hit_target'].sum())} | stops: {int(resolved['hit_stop'].sum())} | "
+                  f"avg realized: {resolved['realized_return'].mean()*100:+.2f}%")
+    return resolved
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score logged predictions whose horizon has passed")
+    parser.add_argument("--db", help="Prediction store (default: Config.PREDICTION_DB)")
+    parser.add_argument("--horizon", type=int, default=HORIZON, help="Sessions after price_date (default: 5)")
+    parser.add_argument("--no-tracker", action="store_true", help="Don't update per-symbol accuracy")
+    args = parser.parse_args()
+
+    resolve_outcomes(args.db, horizon=args.horizon, update_tracker=not args.no_tracker)
@@ -0,0 +1,152 @@
+"""
+Per-Symbol Performance - Running accuracy counters behind predict.py's historical-accuracy gate
+n / correct / ring-buffer rolling accuracy / EWMA, persisted one row per symbol in the prediction store
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from src.prediction_store import PredictionStore
+
+
+# ============================================================================
+# RUNNING COUNTERS
+# ============================================================================
+@dataclass
+class SymbolPerformance:
+    """Running accuracy counters for one symbol; every update is O(1)"""
+    window: int
+    alpha: float
+    n: int = 0
+    correct: int = 0
+    ewma: float = None
+    ring: list = None        # Last `window` outcomes (0/1), overwritten in place
+    head: int = 0            # Next slot to overwrite
+    ring_sum: int = 0
+    
+    def __post_init__(self):
+        if self.ring is None:
+            self.ring = []
+    
+    def add(self, was_correct: bool):
+        outcome = 1 if was_correct else 0
+        self.n += 1
+        self.correct += outcome
+        self.ewma = outcome if self.ewma is None else self.alpha * outcome + (1 - self.alpha) * self.ewma
+        
+        if len(self.ring) < self.window:
+            self.ring.append(outcome)
+        else:
+            self.ring_sum -= self.ring[self.head]
+            self.ring[self.head] = outcome
+            self.head = (self.head + 1) % self.window
+        self.ring_sum += outcome
+    
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.n if self.n else None
+    
+    @property
+    def rolling_accuracy(self) -> float:
+        return self.ring_sum / len(self.ring) if self.ring else None
+    
+    def recent(self) -> str:
+        """Ring contents oldest -> newest as a compact '0101' string"""
+        ordered = self.ring[self.head:] + self.ring[:self.head]
+        return ''.join(map(str, ordered))
+    
+    def to_row(self, symbol: str) -> tuple:
+        return (symbol, self.n, self.correct, self.ewma, self.recent())
+    
+    @classmethod
+    def from_row(cls, row: tuple, window: int, alpha: float) -> 'SymbolPerformance':
+        _, n, correct, ewma, recent = row
+        ring = [int(c) for c in recent[-window:]]
+        # Stored oldest -> newest, so head=0 is the next slot to overwrite once full
+        return cls(window, alpha, n=n, correct=correct, ewma=ewma, ring=ring, ring_sum=sum(ring))
+
+
+# ============================================================================
+# TRACKER
+# ============================================================================
+class StockPerformanceTracker:
+    """
+    Track historical accuracy per stock.
+    Counters live in memory and in the prediction store's symbol_performance table
+    (one row per symbol), so loading is O(symbols) and each outcome is an O(1) upsert.
+    """
+    
+    def __init__(self, db_path=None, legacy_csv: str = "stock_performance.csv", metric: str = 'accuracy'):
+        self.window = Config.PERF_WINDOW
+        self.alpha = Config.PERF_EWMA_ALPHA
+        self.min_outcomes = Config.PERF_MIN_OUTCOMES
+        self.metric = metric        # 'accuracy' (all-time), 'rolling_accuracy' or 'ewma'
+        self.store = PredictionStore(db_path)
+        self.stats = self._load_performance()
+        self.performance = {s: self._metric(p) for s, p in self.stats.items() if p.n >= self.min_outcomes}
+        
+        if not self.stats and Path(legacy_csv).exists():
+            self._migrate_csv(Path(legacy_csv))
+    
+    def _load_performance(self) -> dict:
+        """Load running counters (one row per symbol)"""
+        return {row[0]: SymbolPerformance.from_row(row, self.window, self.alpha)
+                for row in self.store.load_performance()}
+    
+    def _migrate_csv(self, csv_path: Path):
+        """Replay an old stock_performance.csv (timestamp, symbol, outcome) once"""
+        try:
+            df = pd.read_csv(csv_path)
+            self.update_many(zip(df['symbol'], df['outcome'].astype(bool)))
+            print(f"📦 Migrated {len(df)} outcomes from {csv_path.name}")
+        except Exception as e:
+            print(f"⚠️  Could not migrate {csv_path}: {e}")
+    
+    def _metric(self, perf: SymbolPerformance) -> float:
+        return getattr(perf, self.metric)
+    
+    def get_stock_accuracy(self, symbol: str) -> float:
+        """Get historical accuracy for a stock (None until PERF_MIN_OUTCOMES outcomes)"""
+        return self.performance.get(symbol, None)
+    
+    def get_stats(self, symbol: str) -> dict:
+        perf = self.stats.get(symbol)
+        if perf is None:
+            return None
+        return {'n': perf.n, 'correct': perf.correct, 'accuracy': perf.accuracy,
+                'rolling_accuracy': perf.rolling_accuracy, 'ewma': perf.ewma}
+    
+    def _apply(self, symbol: str, was_correct: bool) -> SymbolPerformance:
+        perf = self.stats.get(symbol)
+        if perf is None:
+            perf = self.stats[symbol] = SymbolPerformance(self.window, self.alpha)
+        perf.add(was_correct)
+        if perf.n >= self.min_outcomes:
+            self.performance[symbol] = self._metric(perf)
+        return perf
+    
+    def update_performance(self, symbol: str, was_correct: bool):
+        """
+        Update performance after verifying prediction (O(1): one counter update, one row upsert).
+        Called by the outcome resolver once a prediction's horizon has passed.
+        """
+        perf = self._apply(symbol, was_correct)
+        self.store.save_performance([perf.to_row(symbol)])
+    
+    def apply_many(self, outcomes) -> list:
+        """Apply (symbol, was_correct) pairs in order; returns the touched symbols' rows (not saved)"""
+        touched = {}
+        for symbol, was_correct in outcomes:
+            touched[symbol] = self._apply(symbol, bool(was_correct))
+        return [perf.to_row(symbol) for symbol, perf in touched.items()]
+    
+    def update_many(self, outcomes) -> int:
+        """apply_many + save, touched symbols in one transaction"""
+        rows = self.apply_many(outcomes)
+        self.store.save_performance(rows)
+        return len(rows)
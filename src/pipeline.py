@@ -0,0 +1,302 @@
+"""
+Pipeline Runner - Incremental update -> features / resolve -> predict DAG over a universe
+Each stage declares the content hashes of its inputs per symbol; a symbol re-runs a stage only
+when they differ from its last successful run (runs/pipeline/state.json), and the hashes of
+what it wrote become the inputs of the stages downstream. Per-symbol stages run independent
+symbols in a thread pool. File hashes are memoized by (mtime, size), so a run where nothing
+changed only stats files and finishes in milliseconds.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from src.tracing import span
+from src.universe import chunked
+
+ROOT = Path(__file__).parent.parent
+
+# Stage -> upstream stages. resolve runs before predict: resolved outcomes feed the
+# per-symbol accuracy that adjusts thresholds and scores.
+STAGES = {
+    'update': [],
+    'features': ['update'],
+    'resolve': ['update'],
+    'predict': ['features', 'resolve'],
+}
+GLOBAL = '*'                # State key of stages that run once for the whole universe
+
+# Everywhere predict.load_price_history / update_data.update_stock_csv look for a symbol's prices
+PRICE_CSV_CANDIDATES = ("data/stock_data/{s}.csv", "data/{s}.csv", "stock_data/{s}.csv", "{s}.csv",
+                        "data/stock_data/{s}_daily.csv")
+
+
+def digest(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def expected_session(now: datetime = None) -> str:
+    """Latest weekday whose close (Config.MARKET_CLOSE_HOUR, local time) has passed"""
+    now = now or datetime.now()
+    day = now.date() if now.hour >= Config.MARKET_CLOSE_HOUR else now.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day.isoformat()
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+class PipelineRunner:
+    """
+    runner = PipelineRunner(symbols); runner.run() -> per-stage summary
+    `force` re-runs the named stages for every symbol; `stages` restricts the run to a subset.
+    """
+
+    def __init__(self, symbols: list, jobs: int = None, force=(), stages=None, state_path=None,
+                 verbose: bool = False):
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.jobs = jobs or Config.PIPELINE_JOBS
+        self.force = set(force)
+        self.stages = [s for s in TopologicalSorter(STAGES).static_order() if stages is None or s in stages]
+        self.state_path = Path(state_path or Config.PIPELINE_DIR / "state.json")
+        self.verbose = verbose
+        self.state = self._load_state()
+        self.failed = {}            # symbol -> (stage, error); downstream stages skip these
+        self.warnings = {}          # symbol -> (stage, error) of non-blocking stages (retried next run)
+        self._dirty = False         # File-hash memo changed (saved even when no stage ran)
+        self.predictions = []       # Produced by this run's predict stage
+        self.run_id = None
+
+    # ------------------------------------------------------------------------
+    # STATE
+    # ------------------------------------------------------------------------
+    def _load_state(self) -> dict:
+        if self.state_path.exists():
+            try:
+                return json.loads(self.state_path.read_text())
+            except ValueError:
+                pass
+        return {'files': {}, 'stages': {}}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.state, indent=1, sort_keys=True))
+        os.replace(tmp, self.state_path)
+
+    def record(self, stage: str, key: str) -> dict:
+        return self.state['stages'].setdefault(stage, {}).get(key) or {}
+
+    def file_hash(self, path) -> str:
+        """sha256 of a file, recomputed only when its mtime / size change ('' if missing)"""
+        path = Path(path)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return ''
+        memo = self.state['files'].get(str(path.resolve()))
+        if memo and memo[:2] == [st.st_mtime_ns, st.st_size]:
+            return memo[2]
+        sha = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        self.state['files'][str(path.resolve())] = [st.st_mtime_ns, st.st_size, sha]
+        self._dirty = True
+        return sha
+
+    # ------------------------------------------------------------------------
+    # INPUT HASHES
+    # ------------------------------------------------------------------------
+    def raw_hash(self, symbol: str) -> str:
+        """Raw prices: every candidate CSV of the symbol"""
+        return digest({p: self.file_hash(p.format(s=symbol)) for p in PRICE_CSV_CANDIDATES
+                       if Path(p.format(s=symbol)).exists()})
+
+    def feature_path(self, symbol: str) -> Path:
+        return Config.PIPELINE_DIR / "features" / f"{symbol}.pkl"
+
+    def model_hash(self) -> str:
+        """Model bundle: weights + calibration"""
+        model = next((p for p in (Path("models/stock_model_fixed.keras"), Config.MODEL_PATH) if p.exists()),
+                     Config.MODEL_PATH)
+        return digest([self.file_hash(model), self.file_hash(Config.CALIBRATION_PATH)])
+
+    def code_hash(self) -> str:
+        """Config settings + the feature / decision code"""
+        if not hasattr(self, '_code_hash'):
+            from src.result_cache import config_fingerprint
+            self._code_hash = config_fingerprint([ROOT / "predict.py"])
+        return self._code_hash
+
+    def outcome_hashes(self) -> dict:
+        """Per-symbol running accuracy rows (what resolve changes and predict reads)"""
+        db = Path(Config.PREDICTION_DB)
+        if not db.exists():
+            return {}
+        try:
+            with sqlite3.connect(db, timeout=30) as conn:
+                rows = conn.execute("SELECT symbol, n, correct, ewma, recent FROM symbol_performance").fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        return {r[0]: digest(r[1:]) for r in rows}
+
+    def stage_inputs(self, stage: str) -> dict:
+        """{key: input hash} for every symbol (or GLOBAL) the stage covers"""
+        symbols = [s for s in self.symbols if s not in self.failed]
+        if stage == 'update':
+            session = expected_session()
+            return {s: digest([session, self.raw_hash(s)]) for s in symbols}
+        if stage == 'features':
+            return {s: digest([self.raw_hash(s), self.code_hash()]) for s in symbols}
+        if stage == 'resolve':
+            return {GLOBAL: digest({s: self.raw_hash(s) for s in self.symbols})}
+        if stage == 'predict':
+            model, code, outcomes = self.model_hash(), self.code_hash(), self.outcome_hashes()
+            return {s: digest([self.record('features', s).get('outputs'), model, code, outcomes.get(s)])
+                    for s in symbols}
+        raise ValueError(f"Unknown stage: {stage}")
+
+    # ------------------------------------------------------------------------
+    # STAGES (each returns {key: output hash} for the keys it completed)
+    # ------------------------------------------------------------------------
+    def _parallel(self, stage: str, fn, symbols: list, blocking: bool = True) -> dict:
+        """
+        fn(symbol) -> output hash over a thread pool. An exception leaves the symbol's record
+        untouched (retried next run) and, if blocking, skips it in the downstream stages.
+        """
+        outputs = {}
+
+        def guarded(symbol):
+            try:
+                with span(stage, symbol=symbol):
+                    return symbol, fn(symbol), None
+            except Exception as e:
+                return symbol, None, f"{type(e).__name__}: {e}"
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(symbols)))) as pool:
+            for symbol, out, error in pool.map(guarded, symbols):
+                if error is None:
+                    outputs[symbol] = out
+                else:
+                    (self.failed if blocking else self.warnings)[symbol] = (stage, error)
+        return outputs
+
+    def run_update(self, symbols: list) -> dict:
+        import update_data
+
+        def update(symbol):
+            if not update_data.update_stock_csv(symbol):
+                raise RuntimeError("refresh failed, keeping the current CSV")
+            return self.raw_hash(symbol)
+        # A failed refresh leaves the CSV as it was; downstream stages hash what is there
+        return self._parallel('update', update, symbols, blocking=False)
+
+    def run_features(self, symbols: list) -> dict:
+        import predict
+
+        def features(symbol):
+            df = predict.create_prediction_features(predict.load_price_history(symbol, live=False))
+            path = self.feature_path(symbol)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_pickle(path)
+            return self.file_hash(path)
+
+        # One SPY fetch for the whole stage instead of one per symbol
+        saved_ttl = predict.MarketDataFetcher.MARKET_TTL
+        predict.MarketDataFetcher.MARKET_TTL = saved_ttl or Config.DAEMON_MARKET_TTL
+        try:
+            return self._parallel('features', features, symbols)
+        finally:
+            predict.MarketDataFetcher.MARKET_TTL = saved_ttl
+
+    def run_resolve(self, keys: list) -> dict:
+        from src.outcome_resolver import resolve_outcomes
+
+        with span('resolve'):
+            resolve_outcomes()
+        return {GLOBAL: digest(self.outcome_hashes())}
+
+    def run_predict(self, symbols: list) -> dict:
+        import pandas as pd
+        import predict
+        from src.performance import StockPerformanceTracker
+        from src.prediction_store import PredictionStore
+
+        started_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        start = time.perf_counter()
+        tracker = StockPerformanceTracker()
+        predictions, errors = [], {}
+        # Feature frames are loaded one chunk at a time (bounded memory for large universes)
+        for chunk in chunked(symbols):
+            features = {s: pd.read_pickle(self.feature_path(s)) for s in chunk}
+            with span('predict_batch', batch=len(chunk)):
+                chunk_predictions, chunk_errors = predict.predict_batch(chunk, tracker, features)
+            predictions += chunk_predictions
+            errors.update(chunk_errors)
+        for symbol, error in errors.items():
+            self.failed[symbol] = ('predict', error)
+        if not predictions:
+            return {}
+
+        self.run_id = predict.log_to_csv(predictions)
+        with PredictionStore() as store:
+            store.record_batch_run(self.run_id, 'eod', started_at, symbols, len(predictions), errors,
+                                   time.perf_counter() - start)
+        self.predictions = predictions
+        return {p.symbol: digest(predict.prediction_log_row(p, timestamp='')) for p in predictions}
+
+    # ------------------------------------------------------------------------
+    # RUN
+    # ------------------------------------------------------------------------
+    def run(self) -> list:
+        """Execute the DAG; returns one summary row per stage"""
+        summary = []
+        for stage in self.stages:
+            start = time.perf_counter()
+            inputs = self.stage_inputs(stage)
+            todo = [k for k, h in inputs.items()
+                    if stage in self.force or self.record(stage, k).get('inputs') != h
+                    or (stage == 'features' and not self.feature_path(k).exists())]
+            outputs, log = {}, io.StringIO()
+            if todo:
+                # Per-symbol chatter from update_data / predict is kept for --verbose
+                with redirect_stdout(log if not self.verbose else sys.stdout):
+                    outputs = getattr(self, f"run_{stage}")(todo)
+                now = datetime.now().isoformat(timespec='seconds')
+                for key, out in outputs.items():
+                    self.state['stages'].setdefault(stage, {})[key] = {'inputs': inputs[key], 'outputs': out,
+                                                                      'at': now}
+                self._save_state()
+                self._dirty = False
+            summary.append({'stage': stage, 'total': len(inputs), 'ran': len(outputs),
+                            'skipped': len(inputs) - len(todo),
+                            'failed': len([k for k in todo if k not in outputs]),
+                            'seconds': time.perf_counter() - start, 'log': log.getvalue()})
+        if self._dirty or not self.state_path.exists():
+            self._save_state()
+        return summary
+
+
+def print_summary(summary: list, failed: dict, warnings: dict, seconds: float):
+    print("\n" + "="*70)
+    print(f"🧩 PIPELINE - {seconds * 1000:.0f}ms")
+    print("="*70)
+    print(f"   {'Stage':<10} {'Keys':>6} {'Ran':>6} {'Skipped':>8} {'Failed':>7} {'Time':>10}")
+    for row in summary:
+        print(f"   {row['stage']:<10} {row['total']:>6} {row['ran']:>6} {row['skipped']:>8} "
+              f"{row['failed']:>7} {row['seconds'] * 1000:>8.0f}ms")
+    for symbol, (stage, error) in warnings.items():
+        print(f"   ⚠️  {symbol} ({stage}): {error}")
+    for symbol, (stage, error) in failed.items():
+        print(f"   ❌ {symbol} ({stage}): {error}")
+    print("="*70)
@@ -0,0 +1,486 @@
+"""
+Prediction Store - SQLite (WAL) log of every prediction run
+Typed columns, indexed by (symbol, timestamp) and price_date; one transaction per run.
+Replaces predictions_log.csv (migrated once on first open).
+"""
+
+import csv
+import json
+import sqlite3
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+# Column -> SQLite type, in log order (matches the last CSV header written by log_to_csv)
+COLUMNS = {
+    'timestamp': 'TEXT NOT NULL',
+    'symbol': 'TEXT NOT NULL',
+    'price_date': 'TEXT',
+    'current_price': 'REAL',
+    'week_prob_up': 'REAL',
+    'week_direction': 'TEXT',
+    'confidence': 'TEXT',
+    'confidence_score': 'REAL',
+    'target_high': 'REAL',
+    'target_low': 'REAL',
+    'stop_loss': 'REAL',
+    'risk_reward': 'REAL',
+    'expected_return': 'REAL',
+    'max_loss': 'REAL',
+    'market_regime': 'TEXT',
+    'trend_strength': 'REAL',
+    'volatility': 'REAL',
+    'volatility_regime': 'TEXT',
+    'adaptive_threshold': 'REAL',
+    'signal_score': 'REAL',
+    'action': 'TEXT',
+    'signal_strength': 'TEXT',
+    'warnings': 'TEXT',
+}
+LOG_FIELDS = list(COLUMNS)
+
+# Filled in by src/outcome_resolver.py once the 5-session horizon has passed
+OUTCOME_COLUMNS = {
+    'resolved_at': 'TEXT',
+    'exit_date': 'TEXT',
+    'outcome': 'INTEGER',            # 1 = week direction was right
+    'hit_target': 'INTEGER',
+    'hit_stop': 'INTEGER',
+    'exit_price': 'REAL',
+    'week_return': 'REAL',           # close[+5] / current_price - 1
+    'realized_return': 'REAL',       # Trade return along week_direction, stop/target exits applied
+}
+OUTCOME_FIELDS = list(OUTCOME_COLUMNS)
+
+# Every EnhancedStockPrediction field as JSON, so a stored run can be displayed without recomputing
+DETAIL_COLUMNS = {
+    'details': 'TEXT',
+}
+DETAIL_FIELDS = list(DETAIL_COLUMNS)
+
+# Older predictions_log.csv layouts, keyed by field count (the header drifted between versions)
+_LEGACY_V1 = [
+    'timestamp', 'symbol', 'price_date', 'current_price', 'week_prob_up', 'week_direction',
+    'confidence', 'target_high', 'target_low', 'stop_loss', 'risk_reward', 'expected_return',
+    'max_loss', 'market_regime', 'atr_pct', 'volatility', 'dynamic_threshold', 'shares',
+    'position_value', 'position_pct', 'risk_amount', 'risk_pct', 'action', 'signal_strength', 'warnings',
+]
+_LEGACY_V1_NO_POSITION = [c for c in _LEGACY_V1
+                          if c not in ('shares', 'position_value', 'position_pct', 'risk_amount', 'risk_pct')]
+_LEGACY_RENAMES = {'dynamic_threshold': 'adaptive_threshold'}
+CSV_LAYOUTS = {len(f): f for f in (_LEGACY_V1, _LEGACY_V1_NO_POSITION, LOG_FIELDS)}
+
+# Materialized per-(symbol, price_date) aggregates, bumped inside every write transaction
+PREDICTION_ROLLUPS = {
+    'n': "COUNT(*)",
+    'n_trade': "COALESCE(SUM(action LIKE '%BUY%' OR action LIKE '%SELL%'), 0)",
+    'n_buy': "COALESCE(SUM(action LIKE '%BUY%'), 0)",
+    'n_sell': "COALESCE(SUM(action LIKE '%SELL%'), 0)",
+    'score_sum': "TOTAL(signal_score)",
+    'score_n': "COUNT(signal_score)",
+    'rr_sum': "TOTAL(risk_reward)",
+    'rr_n': "COUNT(risk_reward)",
+    'n_excellent': "COALESCE(SUM(signal_score >= 75), 0)",
+    'n_good': "COALESCE(SUM(signal_score >= 65 AND signal_score < 75), 0)",
+    'n_marginal': "COALESCE(SUM(signal_score >= 55 AND signal_score < 65), 0)",
+    'n_weak': "COALESCE(SUM(signal_score < 55), 0)",
+}
+OUTCOME_ROLLUPS = {
+    'n_resolved': "COUNT(*)",
+    'n_correct': "COALESCE(SUM(outcome), 0)",
+    'n_target': "COALESCE(SUM(hit_target), 0)",
+    'n_stop': "COALESCE(SUM(hit_stop), 0)",
+    'realized_sum': "TOTAL(realized_return)",
+}
+
+SORTABLE = ('timestamp', 'symbol', 'price_date', 'signal_score', 'risk_reward', 'week_prob_up')
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime('%Y%m%d_%H%M%S_') + uuid.uuid4().hex[:6]
+
+
+def _where(symbols=None, actions=None, since=None, until=None) -> tuple:
+    """WHERE clause + params for the history filters"""
+    clauses, params = [], []
+    if symbols:
+        clauses.append(f"symbol IN ({','.join('?' * len(symbols))})")
+        params += list(symbols)
+    if actions:
+        clauses.append(f"action IN ({','.join('?' * len(actions))})")
+        params += list(actions)
+    if since:
+        clauses.append("price_date >= ?")
+        params.append(str(since))
+    if until:
+        clauses.append("price_date <= ?")
+        params.append(str(until))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+class PredictionStore:
+    """Thin wrapper over one SQLite file; safe to open per call (schema setup is idempotent)"""
+
+    def __init__(self, path=None, legacy_csv=None, migrate: bool = True):
+        self.path = Path(path or Config.PREDICTION_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+        if self._rollups_missing():
+            self.rebuild_rollups()
+
+        legacy_csv = Path(legacy_csv or Config.LEGACY_PREDICTION_LOG)
+        if migrate and legacy_csv.exists():
+            self.migrate_csv(legacy_csv)
+
+    def _init_schema(self):
+        c = self.conn
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        cols = ",\n    ".join(f"{k} {v}" for k, v in COLUMNS.items())
+        with c:
+            c.execute(f"""CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT,
+    {cols}
+)""")
+            # Columns added in later versions
+            have = {r['name'] for r in c.execute("PRAGMA table_info(predictions)")}
+            for name, sql_type in {**COLUMNS, **OUTCOME_COLUMNS, **DETAIL_COLUMNS}.items():
+                if name not in have:
+                    c.execute(f"ALTER TABLE predictions ADD COLUMN {name} {sql_type.replace(' NOT NULL', '')}")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_pred_symbol_ts ON predictions(symbol, timestamp)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_pred_price_date ON predictions(price_date)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_pred_unresolved ON predictions(symbol) WHERE resolved_at IS NULL")
+            c.execute("CREATE TABLE IF NOT EXISTS migrations (source TEXT PRIMARY KEY, rows INTEGER, migrated_at TEXT)")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_pred_run ON predictions(run_id)")
+            # Batch scoring runs (eod_pipeline.py); their predictions share the run_id
+            c.execute("""CREATE TABLE IF NOT EXISTS batch_runs (
+    run_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    universe TEXT NOT NULL,
+    n_symbols INTEGER NOT NULL,
+    n_scored INTEGER NOT NULL,
+    errors TEXT,
+    seconds REAL
+)""")
+            # Running per-symbol accuracy (one row per symbol; see predict.StockPerformanceTracker)
+            c.execute("""CREATE TABLE IF NOT EXISTS symbol_performance (
+    symbol TEXT PRIMARY KEY,
+    n INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    ewma REAL,
+    recent TEXT NOT NULL,
+    updated_at TEXT
+)""")
+            rollup_cols = ",\n    ".join(f"{k} {'INTEGER' if k.startswith('n') or k.endswith('_n') else 'REAL'} NOT NULL DEFAULT 0"
+                                          for k in {**PREDICTION_ROLLUPS, **OUTCOME_ROLLUPS})
+            c.execute(f"""CREATE TABLE IF NOT EXISTS daily_rollups (
+    symbol TEXT NOT NULL,
+    day TEXT NOT NULL,
+    {rollup_cols},
+    PRIMARY KEY (symbol, day)
+)""")
+            c.execute("""CREATE TABLE IF NOT EXISTS action_rollups (
+    symbol TEXT NOT NULL,
+    day TEXT NOT NULL,
+    action TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, day, action)
+)""")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------------
+    # ROLLUPS
+    # ------------------------------------------------------------------------
+    def _bump_rollups(self, aggregates: dict, where: str, params=(), actions: bool = False):
+        """Add the aggregates of the matching prediction rows onto the rollup tables (no commit)"""
+        cols = list(aggregates)
+        self.conn.execute(f"""
+            INSERT INTO daily_rollups (symbol, day, {','.join(cols)})
+            SELECT symbol, COALESCE(price_date, ''), {','.join(aggregates.values())}
+            FROM predictions WHERE {where} GROUP BY 1, 2
+            ON CONFLICT (symbol, day) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in cols)}""",
+            params)
+        if actions:
+            self.conn.execute(f"""
+                INSERT INTO action_rollups (symbol, day, action, n)
+                SELECT symbol, COALESCE(price_date, ''), COALESCE(action, ''), COUNT(*)
+                FROM predictions WHERE {where} GROUP BY 1, 2, 3
+                ON CONFLICT (symbol, day, action) DO UPDATE SET n = n + excluded.n""", params)
+
+    def _rollups_missing(self) -> bool:
+        """Store written before rollups existed (or rollups wiped): rows but no aggregates"""
+        has_rows = self.conn.execute("SELECT 1 FROM predictions LIMIT 1").fetchone()
+        return bool(has_rows) and not self.conn.execute("SELECT 1 FROM daily_rollups LIMIT 1").fetchone()
+
+    def rebuild_rollups(self):
+        """Recompute every rollup from the full log (one-off; normal writes update them incrementally)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM daily_rollups")
+            self.conn.execute("DELETE FROM action_rollups")
+            self._bump_rollups(PREDICTION_ROLLUPS, "1", actions=True)
+            self._bump_rollups(OUTCOME_ROLLUPS, "resolved_at IS NOT NULL")
+
+    # ------------------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------------------
+    def _insert_rows(self, run_id: str, records: list) -> int:
+        """Insert + bump rollups for the new id range (caller owns the transaction)"""
+        # Take the write lock before reading MAX(id): a writer committing in between would
+        # otherwise have its rows counted again by "id > first_id"
+        if not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        first_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM predictions").fetchone()[0]
+        fields = ['run_id'] + LOG_FIELDS + DETAIL_FIELDS
+        self.conn.executemany(
+            f"INSERT INTO predictions ({','.join(fields)}) VALUES ({','.join('?' * len(fields))})",
+            [[run_id] + [self._coerce(f, r.get(f)) for f in LOG_FIELDS + DETAIL_FIELDS] for r in records])
+        self._bump_rollups(PREDICTION_ROLLUPS, "id > ?", (first_id,), actions=True)
+        return len(records)
+
+    def insert_many(self, rows: list, run_id: str = None) -> str:
+        """Insert one run's rows (and their rollups) in a single transaction; returns the run id"""
+        run_id = run_id or new_run_id()
+        if not rows:
+            return run_id
+        with self.conn:
+            self._insert_rows(run_id, rows)
+        return run_id
+
+    def record_batch_run(self, run_id: str, kind: str, started_at: str, universe: list,
+                         n_scored: int, errors: dict = None, seconds: float = None):
+        """Register a finished batch run (its predictions were inserted under the same run_id)"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO batch_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              (run_id, kind, started_at, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                               json.dumps(list(universe)), len(universe), n_scored,
+                               json.dumps(errors or {}), seconds))
+
+    def migrate_csv(self, csv_path, force: bool = False) -> int:
+        """
+        Import a predictions_log.csv once. Rows are mapped by field count, so files
+        whose header no longer matches later rows still import; unknown layouts are skipped.
+        """
+        csv_path = Path(csv_path)
+        source = str(csv_path.resolve())
+        if not force and self.conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+            return 0
+
+        rows, skipped = [], 0
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            layouts = {**CSV_LAYOUTS, len(header): header}
+            for values in reader:
+                layout = layouts.get(len(values))
+                if layout is None:
+                    skipped += 1
+                    continue
+                rec = {_LEGACY_RENAMES.get(k, k): v for k, v in zip(layout, values)}
+                rows.append({k: (v if v != '' else None) for k, v in rec.items() if k in COLUMNS})
+
+        with self.conn:
+            self._insert_rows('csv_migration', rows)
+            self.conn.execute("INSERT OR REPLACE INTO migrations VALUES (?, ?, ?)",
+                              (source, len(rows), datetime.now().isoformat(timespec='seconds')))
+        print(f"📦 Migrated {len(rows)} rows from {csv_path.name}" + (f" ({skipped} unreadable)" if skipped else ""))
+        return len(rows)
+
+    @staticmethod
+    def _coerce(column: str, value):
+        """Column-typed value (numpy scalars, dates and CSV strings all arrive here)"""
+        if value is None:
+            return None
+        if not {**COLUMNS, **DETAIL_COLUMNS}[column].startswith('REAL'):
+            return str(value)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _upsert_performance(self, states: list):
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.conn.executemany("INSERT OR REPLACE INTO symbol_performance VALUES (?, ?, ?, ?, ?, ?)",
+                              [(*state, now) for state in states])
+
+    def save_performance(self, states: list):
+        """Upsert (symbol, n, correct, ewma, recent) rows in one transaction"""
+        with self.conn:
+            self._upsert_performance(states)
+
+    def unresolved(self) -> pd.DataFrame:
+        """
+        Predictions still waiting for an outcome. `scored` marks (symbol, price_date) pairs
+        an earlier resolver run already fed to the performance tracker.
+        """
+        return pd.read_sql_query("""
+            SELECT p.id, p.symbol, p.price_date, p.current_price, p.week_direction,
+                   p.target_high, p.target_low, p.stop_loss,
+                   EXISTS (SELECT 1 FROM predictions q
+                           WHERE q.symbol = p.symbol AND q.price_date = p.price_date
+                             AND q.resolved_at IS NOT NULL) AS scored
+            FROM predictions p
+            WHERE p.resolved_at IS NULL
+            ORDER BY p.price_date, p.id""", self.conn)
+
+    def write_outcomes(self, outcomes: pd.DataFrame, performance_states: list = None) -> int:
+        """Outcome columns for every resolved id (+ tracker rows) in one transaction"""
+        if outcomes.empty:
+            return 0
+        fields = OUTCOME_FIELDS
+        sql = f"UPDATE predictions SET {', '.join(f'{f} = ?' for f in fields)} WHERE id = ?"
+        values = outcomes[fields + ['id']].astype(object).where(outcomes[fields + ['id']].notna(), None)
+        with self.conn:
+            self.conn.executemany(sql, [tuple(self._py(v) for v in row) for row in values.itertuples(index=False)])
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS _resolved (id INTEGER PRIMARY KEY)")
+            self.conn.execute("DELETE FROM _resolved")
+            self.conn.executemany("INSERT INTO _resolved VALUES (?)", [(int(i),) for i in outcomes['id']])
+            self._bump_rollups(OUTCOME_ROLLUPS, "id IN (SELECT id FROM _resolved)")
+            if performance_states:
+                self._upsert_performance(performance_states)
+        return len(outcomes)
+
+    @staticmethod
+    def _py(value):
+        """numpy scalar -> Python (sqlite3 only binds builtins)"""
+        return value.item() if hasattr(value, 'item') else value
+
+    def load_performance(self) -> list:
+        """Every symbol's running counters: one row per symbol, never the outcome history"""
+        return [tuple(r) for r in self.conn.execute(
+            "SELECT symbol, n, correct, ewma, recent FROM symbol_performance")]
+
+    # ------------------------------------------------------------------------
+    # READ (filtering / paging pushed into SQL)
+    # ------------------------------------------------------------------------
+    def query(self, symbols=None, actions=None, since=None, until=None, limit: int = None,
+              offset: int = 0, order_by: str = 'timestamp', descending: bool = True,
+              columns: list = None) -> pd.DataFrame:
+        if order_by not in SORTABLE:
+            raise ValueError(f"Cannot sort by {order_by}")
+        where, params = _where(symbols, actions, since, until)
+        cols = ','.join(columns or LOG_FIELDS + OUTCOME_FIELDS)
+        sql = f"SELECT {cols} FROM predictions{where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def count(self, symbols=None, actions=None, since=None, until=None) -> int:
+        where, params = _where(symbols, actions, since, until)
+        return self.conn.execute(f"SELECT COUNT(*) FROM predictions{where}", params).fetchone()[0]
+
+    def latest_batch_run(self, kind: str = 'eod') -> dict:
+        """Most recent finished batch run of this kind (universe / errors decoded), or None"""
+        r = self.conn.execute("SELECT * FROM batch_runs WHERE kind = ? ORDER BY finished_at DESC LIMIT 1",
+                              (kind,)).fetchone()
+        if r is None:
+            return None
+        run = {k: r[k] for k in r.keys()}
+        run['universe'] = json.loads(run['universe'])
+        run['errors'] = json.loads(run['errors'] or '{}')
+        return run
+
+    def run_details(self, run_id: str) -> dict:
+        """{symbol: EnhancedStockPrediction fields} of one run (rows logged before `details` are skipped)"""
+        return {r['symbol']: json.loads(r['details']) for r in self.conn.execute(
+            "SELECT symbol, details FROM predictions WHERE run_id = ? AND details IS NOT NULL ORDER BY id",
+            (run_id,))}
+
+    def batch_details(self, kind: str = 'eod', since: str = None) -> dict:
+        """
+        {symbol: fields} from the newest run of this kind that scored each symbol (runs finished
+        at or after `since`). Incremental pipeline runs only re-score symbols whose inputs changed.
+        """
+        rows = self.conn.execute("""
+            SELECT p.symbol, p.details FROM predictions p JOIN batch_runs b ON b.run_id = p.run_id
+            WHERE b.kind = ? AND b.finished_at >= ? AND p.details IS NOT NULL
+            ORDER BY b.finished_at, p.id""", (kind, since or '')).fetchall()
+        return {r['symbol']: json.loads(r['details']) for r in rows}
+
+    def distinct(self, column: str) -> list:
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        return [r[0] for r in self.conn.execute(
+            f"SELECT DISTINCT {column} FROM predictions WHERE {column} IS NOT NULL ORDER BY {column}")]
+
+    # ------------------------------------------------------------------------
+    # READ (materialized aggregates: cost scales with symbols x days, not log rows)
+    # ------------------------------------------------------------------------
+    def summary(self) -> dict:
+        """Headline numbers for the History page"""
+        r = self.conn.execute("""
+            SELECT COALESCE(SUM(n), 0) AS total,
+                   COUNT(DISTINCT symbol) AS symbols,
+                   COALESCE(SUM(n_trade), 0) AS trade_signals,
+                   SUM(score_sum) / NULLIF(SUM(score_n), 0) AS avg_score,
+                   SUM(rr_sum) / NULLIF(SUM(rr_n), 0) AS avg_rr,
+                   COALESCE(SUM(n_resolved), 0) AS resolved,
+                   CAST(SUM(n_correct) AS REAL) / NULLIF(SUM(n_resolved), 0) AS accuracy
+            FROM daily_rollups""").fetchone()
+        return {k: r[k] for k in r.keys()}
+
+    def value_counts(self, column: str, limit: int = None) -> pd.Series:
+        """Counts per symbol / action come from the rollups; other columns scan the log"""
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}")
+        if column == 'symbol':
+            sql = "SELECT symbol AS value, SUM(n) AS n FROM daily_rollups GROUP BY symbol ORDER BY n DESC"
+        elif column == 'action':
+            sql = "SELECT action AS value, SUM(n) AS n FROM action_rollups GROUP BY action ORDER BY n DESC"
+        else:
+            sql = f"SELECT {column} AS value, COUNT(*) AS n FROM predictions GROUP BY {column} ORDER BY n DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.conn.execute(sql).fetchall()
+        return pd.Series([r['n'] for r in rows], index=[r['value'] for r in rows], dtype=int)
+
+    def score_buckets(self) -> dict:
+        r = self.conn.execute("""
+            SELECT COALESCE(SUM(n_excellent), 0) AS excellent,
+                   COALESCE(SUM(n_good), 0) AS good,
+                   COALESCE(SUM(n_marginal), 0) AS marginal,
+                   COALESCE(SUM(n_weak), 0) AS weak
+            FROM daily_rollups""").fetchone()
+        return {k: r[k] for k in r.keys()}
+
+    def symbol_summary(self) -> pd.DataFrame:
+        """Per-symbol rollup: counts by action, mean score / R:R, accuracy once resolved"""
+        return pd.read_sql_query("""
+            SELECT symbol,
+                   SUM(n) AS predictions,
+                   SUM(n_buy) AS buys,
+                   SUM(n_sell) AS sells,
+                   SUM(n) - SUM(n_trade) AS no_trade,
+                   SUM(score_sum) / NULLIF(SUM(score_n), 0) AS avg_score,
+                   SUM(rr_sum) / NULLIF(SUM(rr_n), 0) AS avg_rr,
+                   SUM(n_resolved) AS resolved,
+                   CAST(SUM(n_correct) AS REAL) / NULLIF(SUM(n_resolved), 0) AS accuracy,
+                   SUM(realized_sum) / NULLIF(SUM(n_resolved), 0) AS avg_realized
+            FROM daily_rollups GROUP BY symbol ORDER BY predictions DESC""", self.conn)
+
+    def daily_summary(self, symbols=None) -> pd.DataFrame:
+        """Per-(symbol, day) rollup rows, oldest first"""
+        where, params = _where(symbols)
+        return pd.read_sql_query(f"SELECT * FROM daily_rollups{where} ORDER BY day, symbol", self.conn, params=params)
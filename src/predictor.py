@@ -3,27 +3,43 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 import numpy as np
-import tensorflow as tf
 from typing import Dict
 
 from config import Config
 from data_loader import fetch_stock_data, get_current_price
 from feature_engineer import create_technical_indicators, create_targets, build_feature_matrix, make_sequences
 from decision_engine import make_trading_decision, PredictionResult, result_to_dict
+from src.inference import load_compiled_model
+from src.calibration import (Calibrator, fit_calibrator, compare_methods, save_calibration, load_calibration,
+                             head_probs)
 
-# Calibration temperatures (tune with --calibrate)
-TEMP_TOM, TEMP_WEEK = 1.5, 1.2
-_VAL_ACC_TOM, _VAL_ACC_WEEK = 0.597, 0.674
+# Fallbacks until a calibration bundle is fitted (tune with --calibrate)
+_DEFAULT_TEMP_TOM, _DEFAULT_TEMP_WEEK = 1.5, 1.2
+_DEFAULT_VAL_ACC_TOM, _DEFAULT_VAL_ACC_WEEK = 0.597, 0.674
 
-def calibrate(p: float, temp: float = 1.0) -> float:
-    """Apply temperature scaling"""
-    p = np.clip(p, 1e-7, 1-1e-7)
-    return float(1 / (1 + np.exp(-np.log(p / (1-p)) / temp)))
+def calibrate(p, temp: float = 1.0):
+    """Apply temperature scaling (scalar or array)"""
+    return Calibrator('temperature', temperature=temp)(p)
+
+def _load_calibration():
+    """Per-head calibrators + validation accuracy from the model bundle"""
+    bundle = load_calibration()
+    heads = bundle['heads'] if bundle else {}
+    val_acc = bundle['val_accuracy'] if bundle else {}
+    return (
+        heads.get('tomorrow', Calibrator('temperature', temperature=_DEFAULT_TEMP_TOM)),
+        heads.get('week', Calibrator('temperature', temperature=_DEFAULT_TEMP_WEEK)),
+        val_acc.get('tomorrow', _DEFAULT_VAL_ACC_TOM),
+        val_acc.get('week', _DEFAULT_VAL_ACC_WEEK),
+    )
+
+CAL_TOM, CAL_WEEK, _VAL_ACC_TOM, _VAL_ACC_WEEK = _load_calibration()
 
 def _load_model():
     if not Config.MODEL_PATH.exists():
         raise FileNotFoundError(f"Model not found. Run: python train.py")
-    model = tf.keras.models.load_model(Config.MODEL_PATH)
+    # Loaded, traced and warmed up once per process
+    model = load_compiled_model(Config.MODEL_PATH)
     
     # Get expected input shape from model
     expected_shape = model.input_shape
@@ -72,6 +88,13 @@ def _get_sequence(symbol: str, model):
     
     return X_seq[-1:]
 
+def _price_outputs(pred) -> tuple:
+    """(tomorrow_price, week_price) regression outputs; zeros for a single-output model"""
+    if not isinstance(pred, (list, tuple)):
+        return 0.0, 0.0
+    return (float(pred[1][0, 0]) if len(pred) > 1 else 0.0,
+            float(pred[3][0, 0]) if len(pred) > 3 else 0.0)
+
 def predict_for_symbol(symbol: str) -> Dict:
     """Make calibrated prediction"""
     symbol = symbol.upper()
@@ -88,25 +111,16 @@ def predict_for_symbol(symbol: str) -> Dict:
         raise
     
     print(f"   🤖 Running model prediction...")
-    pred = model.predict(X, verbose=0)
-    
-    # Handle different model output formats
-    if isinstance(pred, list):
-        # Multiple outputs
-        tom_raw = float(pred[0][0, 0])
-        week_raw = float(pred[1][0, 0]) if len(pred) > 1 else tom_raw
-        tom_ret = float(pred[2][0, 0]) if len(pred) > 2 else 0.0
-        week_ret = float(pred[3][0, 0]) if len(pred) > 3 else 0.0
-    else:
-        # Single output
-        tom_raw = float(pred[0, 0])
-        week_raw = tom_raw
-        tom_ret = 0.0
-        week_ret = 0.0
+    pred = model.predict(X)
+    
+    # Direction heads via HEAD_INDEX (same outputs train.fit_calibration fits on)
+    tom_raw = float(head_probs(pred, 'tomorrow')[0])
+    week_raw = float(head_probs(pred, 'week')[0])
+    tom_ret, week_ret = _price_outputs(pred)
     
     # Calibrate
-    tom_cal = calibrate(tom_raw, TEMP_TOM)
-    week_cal = calibrate(week_raw, TEMP_WEEK)
+    tom_cal = CAL_TOM(tom_raw)
+    week_cal = CAL_WEEK(week_raw)
     
     price = get_current_price(symbol)
     
@@ -122,18 +136,11 @@ def ui_predict_for_symbol(symbol: str) -> PredictionResult:
     symbol = symbol.upper()
     model = _load_model()
     X = _get_sequence(symbol, model)
-    pred = model.predict(X, verbose=0)
+    pred = model.predict(X)
     
-    if isinstance(pred, list):
-        tom_cal = calibrate(float(pred[0][0, 0]), TEMP_TOM)
-        week_cal = calibrate(float(pred[1][0, 0]), TEMP_WEEK)
-        tom_ret = float(pred[2][0, 0]) if len(pred) > 2 else 0.0
-        week_ret = float(pred[3][0, 0]) if len(pred) > 3 else 0.0
-    else:
-        tom_cal = calibrate(float(pred[0, 0]), TEMP_TOM)
-        week_cal = tom_cal
-        tom_ret = 0.0
-        week_ret = 0.0
+    tom_cal = CAL_TOM(float(head_probs(pred, 'tomorrow')[0]))
+    week_cal = CAL_WEEK(float(head_probs(pred, 'week')[0]))
+    tom_ret, week_ret = _price_outputs(pred)
     
     result = make_trading_decision(
         tom_cal, week_cal, tom_ret, week_ret,
@@ -142,9 +149,8 @@ def ui_predict_for_symbol(symbol: str) -> PredictionResult:
     result.symbol = symbol
     return result
 
-def find_optimal_temperatures():
-    """Find best temperatures"""
-    from sklearn.metrics import brier_score_loss
+def find_optimal_temperatures(method: str = 'temperature'):
+    """Fit per-head calibration on the validation windows and save it to the model bundle"""
     print("="*70 + "\nCALIBRATING...\n" + "="*70)
     
     model = _load_model()
@@ -190,28 +196,34 @@ def find_optimal_temperatures():
     
     print(f"Val set: {len(X_val):,} samples")
     
-    pred = model.predict(X_val, verbose=0)
-    
-    if isinstance(pred, list):
-        raw_tom = pred[0].flatten()
-        raw_week = pred[1].flatten() if len(pred) > 1 else raw_tom
-    else:
-        raw_tom = pred.flatten()
-        raw_week = raw_tom
-    
-    # Find best temps
-    best_t_tom = min(np.linspace(0.5, 3, 50), key=lambda t: brier_score_loss(yt_val, [calibrate(p, t) for p in raw_tom]))
-    best_t_week = min(np.linspace(0.5, 3, 50), key=lambda t: brier_score_loss(yw_val, [calibrate(p, t) for p in raw_week]))
-    
-    print(f"\n{'='*70}\n✅ RESULTS\n{'='*70}")
-    print(f"TEMP_TOM = {best_t_tom:.3f}\nTEMP_WEEK = {best_t_week:.3f}")
+    pred = model.predict(X_val)
+    
+    raw_tom = head_probs(pred, 'tomorrow')
+    raw_week = head_probs(pred, 'week')
+    
+    # Every method per head, all temperatures evaluated as one (T, N) broadcast
+    print(f"\n{'='*70}\n✅ RESULTS (method={method})\n{'='*70}")
+    print(f"{'Head':<10} {'Method':<12} {'Brier':>8} {'LogLoss':>9}")
+    calibrators = {}
+    for head, raw, y in (('tomorrow', raw_tom, yt_val), ('week', raw_week, yw_val)):
+        for name, r in compare_methods(raw, y).items():
+            print(f"{head:<10} {name:<12} {r['brier']:>8.4f} {r['log_loss']:>9.4f}")
+        calibrators[head] = fit_calibrator(raw, y, method)
+        print(f"   → {head}: {calibrators[head]}")
+    
+    val_accuracy = {
+        'tomorrow': float(np.mean((raw_tom >= 0.5) == yt_val)),
+        'week': float(np.mean((raw_week >= 0.5) == yw_val)),
+    }
+    path = save_calibration(calibrators, val_accuracy=val_accuracy)
+    print(f"💾 Saved to {path}")
     print(f"{'='*70}")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         try:
             if sys.argv[1] == "--calibrate":
-                find_optimal_temperatures()
+                find_optimal_temperatures(sys.argv[2] if len(sys.argv) > 2 else 'temperature')
             else:
                 result = predict_for_symbol(sys.argv[1])
                 print(f"\n{'='*70}")
@@ -223,4 +235,4 @@ if __name__ == "__main__":
             traceback.print_exc()
             sys.exit(1)
     else:
-        print("Usage:\n  python src/predictor.py AAPL\n  python src/predictor.py --calibrate")
+        print("Usage:\n  python src/predictor.py AAPL\n  python src/predictor.py --calibrate [temperature|platt|isotonic]")
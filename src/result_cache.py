@@ -0,0 +1,206 @@
+"""
+Result Cache - Memoized EnhancedStockPrediction results shared by predict.py, app.py and the daemon
+Keyed by (symbol, price_date, quoted price to the cent, model bundle hash, decision config hash,
+historical accuracy); entries expire after Config.RESULT_CACHE_TTL. One SQLite (WAL) file, so every
+process reads the others' results; hits / misses are counted per source for hit-rate reporting.
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+_FILE_HASHES = {}           # str(path) -> ((mtime_ns, size), sha256)
+
+
+# ============================================================================
+# FINGERPRINTS
+# ============================================================================
+def file_hash(path) -> str:
+    """sha256 of a file's bytes, recomputed only when its mtime / size change ('' if missing)"""
+    path = Path(path)
+    if not path.exists():
+        return ''
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _FILE_HASHES.get(str(path))
+    if hit is None or hit[0] != stamp:
+        hit = _FILE_HASHES[str(path)] = (stamp, hashlib.sha256(path.read_bytes()).hexdigest())
+    return hit[1]
+
+
+def model_fingerprint(model_path, backend_name: str = '') -> str:
+    """Model weights + calibration bundle + the backend serving them"""
+    parts = [file_hash(model_path), file_hash(Config.CALIBRATION_PATH), backend_name]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def config_fingerprint(code_paths=()) -> str:
+    """Every scalar / collection Config setting plus the source of the decision code"""
+    settings = {k: v for k, v in vars(Config).items()
+                if k.isupper() and isinstance(v, (bool, int, float, str, list, tuple, dict))}
+    parts = [json.dumps(settings, sort_keys=True, default=str)] + [file_hash(p) for p in code_paths]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def result_key(symbol: str, price_date: str, price: float, model_hash: str, config_hash: str,
+               historical_accuracy: float = None) -> str:
+    hist = '' if historical_accuracy is None else f"{historical_accuracy:.4f}"
+    raw = f"{symbol.upper()}|{price_date}|{price:.2f}|{model_hash}|{config_hash}|{hist}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _json_default(obj):
+    """numpy scalars inside threshold / score breakdowns"""
+    return obj.item() if hasattr(obj, 'item') else str(obj)
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+class ResultCache:
+    """Thin wrapper over one SQLite file; `source` labels this process in the hit-rate counters"""
+
+    def __init__(self, path=None, ttl: float = None, source: str = 'cli'):
+        self.path = Path(path or Config.RESULT_CACHE_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = Config.RESULT_CACHE_TTL if ttl is None else ttl
+        self.source = source
+        self.hits = 0               # This process only; stats() has the shared totals
+        self.misses = 0
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+    def _init_schema(self):
+        c = self.conn
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        with c:
+            c.execute("""CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    price_date TEXT,
+    created REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+)""")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_results_symbol ON results(symbol)")
+            c.execute("""CREATE TABLE IF NOT EXISTS cache_stats (
+    source TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    invalidated INTEGER NOT NULL DEFAULT 0
+)""")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count(self, column: str, n: int = 1):
+        """Bump a shared counter (no commit)"""
+        self.conn.execute(f"""INSERT INTO cache_stats (source, {column}) VALUES (?, ?)
+            ON CONFLICT(source) DO UPDATE SET {column} = {column} + excluded.{column}""", (self.source, n))
+
+    # ------------------------------------------------------------------------
+    # LOOKUP / STORE
+    # ------------------------------------------------------------------------
+    def get(self, key: str):
+        """Cached EnhancedStockPrediction fields, or None (missing or older than the TTL)"""
+        row = self.conn.execute("SELECT created, payload FROM results WHERE key = ?", (key,)).fetchone()
+        fresh = row is not None and time.time() - row['created'] < self.ttl
+        with self.conn:
+            if fresh:
+                self.conn.execute("UPDATE results SET hits = hits + 1 WHERE key = ?", (key,))
+                self._count('hits')
+            else:
+                if row is not None:
+                    self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._count('misses')
+        if fresh:
+            self.hits += 1
+            return json.loads(row['payload'])
+        self.misses += 1
+        return None
+
+    def put(self, key: str, symbol: str, price_date: str, fields: dict):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO results (key, symbol, price_date, created, payload) "
+                              "VALUES (?, ?, ?, ?, ?)",
+                              (key, symbol.upper(), price_date, time.time(),
+                               json.dumps(fields, default=_json_default)))
+
+    # ------------------------------------------------------------------------
+    # INVALIDATION
+    # ------------------------------------------------------------------------
+    def invalidate(self, symbols=None) -> int:
+        """Drop every entry (or those of the given symbols); returns rows removed"""
+        with self.conn:
+            if symbols:
+                symbols = [s.upper() for s in symbols]
+                cur = self.conn.execute(f"DELETE FROM results WHERE symbol IN ({','.join('?' * len(symbols))})",
+                                        symbols)
+            else:
+                cur = self.conn.execute("DELETE FROM results")
+            self._count('invalidated', cur.rowcount)
+        return cur.rowcount
+
+    def prune(self) -> int:
+        """Drop expired entries; returns rows removed"""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl,))
+        return cur.rowcount
+
+    # ------------------------------------------------------------------------
+    # METRICS
+    # ------------------------------------------------------------------------
+    def stats(self) -> dict:
+        """Shared totals per source + overall: hits, misses, hit_rate, entries"""
+        sources = {r['source']: dict(r) for r in self.conn.execute("SELECT * FROM cache_stats ORDER BY source")}
+        for s in sources.values():
+            lookups = s['hits'] + s['misses']
+            s['hit_rate'] = s['hits'] / lookups if lookups else None
+        hits = sum(s['hits'] for s in sources.values())
+        lookups = hits + sum(s['misses'] for s in sources.values())
+        entries = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT symbol) FROM results").fetchone()
+        return {'entries': entries[0], 'symbols': entries[1], 'hits': hits, 'lookups': lookups,
+                'hit_rate': hits / lookups if lookups else None, 'sources': sources}
+
+
+def print_stats(stats: dict):
+    rate = lambda r: f"{r:.1%}" if r is not None else "-"
+    print("\n" + "="*70)
+    print(f"♻️  RESULT CACHE - {stats['entries']} entries, {stats['symbols']} symbols, "
+          f"hit rate {rate(stats['hit_rate'])} ({stats['hits']}/{stats['lookups']})")
+    print("="*70)
+    print(f"   {'Source':<10} {'Hits':>8} {'Misses':>8} {'Hit rate':>9} {'Invalidated':>12}")
+    for name, s in stats['sources'].items():
+        print(f"   {name:<10} {s['hits']:>8} {s['misses']:>8} {rate(s['hit_rate']):>9} {s['invalidated']:>12}")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or invalidate the prediction result cache")
+    parser.add_argument("--db", help="Cache file (default: Config.RESULT_CACHE_DB)")
+    parser.add_argument("--clear", nargs="*", metavar="SYMBOL", help="Invalidate all entries (or these symbols)")
+    parser.add_argument("--prune", action="store_true", help="Drop entries older than the TTL")
+    args = parser.parse_args()
+
+    with ResultCache(args.db, source='admin') as cache:
+        if args.clear is not None:
+            print(f"🗑️  Invalidated {cache.invalidate(args.clear)} cached results")
+        if args.prune:
+            print(f"🧹 Pruned {cache.prune()} expired results")
+        print_stats(cache.stats())
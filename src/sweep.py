@@ -0,0 +1,305 @@
+"""
+Hyperparameter Sweep - grid / random / successive-halving over train.build_model
+Windowed dataset is built once into shared memory and attached by every trial worker
+"""
+
+import os
+import sys
+import json
+import time
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+from src.walk_forward import init_worker_threads
+
+METRIC = 'val_week_direction_accuracy'
+
+# Spans the Config.* architecture and the one hardcoded in train.build_model
+DEFAULT_SPACE = {
+    'lstm_units_1': [128, Config.LSTM_UNITS_1],
+    'lstm_units_2': [64, Config.LSTM_UNITS_2],
+    'dropout': [Config.DROPOUT_LSTM_1, 0.3],
+    'learning_rate': [0.0005, 0.001, Config.LEARNING_RATE],
+    'week_dir_weight': [4.0, Config.LOSS_WEIGHTS[1]],
+}
+
+# Worker-side cache of attached shared arrays (one attach per process)
+_ATTACHED = {}
+
+
+# ============================================================================
+# SHARED DATASET
+# ============================================================================
+class SharedDataset:
+    """Copy named numpy arrays into shared memory once; workers attach by name"""
+
+    def __init__(self, arrays: dict):
+        self._blocks = []
+        self.spec = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._blocks.append(shm)
+            self.spec[key] = (shm.name, arr.shape, arr.dtype.str)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+def attach_dataset(spec: dict) -> dict:
+    """Zero-copy views onto the parent's shared arrays"""
+    arrays = {}
+    for key, (name, shape, dtype) in spec.items():
+        if name not in _ATTACHED:
+            try:
+                shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Python < 3.13: spawned workers share the parent's resource tracker,
+                # so re-registering is a no-op and the parent's unlink stays authoritative
+                shm = shared_memory.SharedMemory(name=name)
+            _ATTACHED[name] = shm
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_ATTACHED[name].buf)
+    return arrays
+
+
+def _unpack(arrays: dict, split: str) -> dict:
+    prefix = f"{split}_"
+    return {k[len(prefix):]: v for k, v in arrays.items() if k.startswith(prefix)}
+
+
+# ============================================================================
+# SEARCH SPACE
+# ============================================================================
+def grid_trials(space: dict) -> list:
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_trials(space: dict, n_trials: int, seed: int = 42) -> list:
+    """n_trials distinct grid points, sampled without replacement (the whole grid if it is smaller)"""
+    rng = np.random.default_rng(seed)
+    choices = {k: v if isinstance(v, list) else [v] for k, v in space.items()}
+    sizes = [len(v) for v in choices.values()]
+    total = int(np.prod(sizes, dtype=object))
+    trials = []
+    for flat in rng.choice(total, size=min(n_trials, total), replace=False):
+        trial, flat = {}, int(flat)
+        for (k, v), size in zip(choices.items(), sizes):
+            flat, i = divmod(flat, size)
+            trial[k] = v[i]
+        trials.append(trial)
+    return trials
+
+
+# ============================================================================
+# PRUNING
+# ============================================================================
+def _make_pruning_callback(trial_id, curves, warmup_epochs: int, min_trials: int):
+    """Median stopping rule on the best-so-far METRIC, shared across workers"""
+    import tensorflow as tf
+
+    class MedianPruning(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.best = []
+            self.pruned = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            value = (logs or {}).get(METRIC)
+            if value is None:
+                return
+            self.best.append(max(float(value), self.best[-1]) if self.best else float(value))
+            curves[trial_id] = list(self.best)
+
+            if epoch + 1 < warmup_epochs:
+                return
+            peers = [c[epoch] for tid, c in curves.items() if tid != trial_id and len(c) > epoch]
+            if len(peers) >= min_trials and self.best[-1] < np.median(peers):
+                self.pruned = True
+                self.model.stop_training = True
+
+    return MedianPruning()
+
+
+# ============================================================================
+# TRIAL WORKER
+# ============================================================================
+def _run_trial(trial_id: int, params: dict, spec: dict, epochs: int, run_dir: str,
+               curves=None, warmup_epochs: int = 5, min_trials: int = 3, resume: bool = False) -> dict:
+    """Train one configuration against the shared dataset (runs in a worker process)"""
+    import tensorflow as tf
+    import train as trainer
+    from src.checkpointing import load_resume_state
+
+    started = time.time()
+    np.random.seed(42 + trial_id)
+    tf.random.set_seed(42 + trial_id)
+
+    arrays = attach_dataset(spec)
+    train_seq, val_seq = _unpack(arrays, 'train'), _unpack(arrays, 'val')
+
+    params = dict(params)
+    batch_size = int(params.pop('batch_size', Config.WF_BATCH_SIZE))
+    trial_dir = Path(run_dir) / f"trial_{trial_id:03d}"
+    resume_state = load_resume_state(trial_dir) if resume else None
+
+    extra = []
+    pruner = None
+    if curves is not None:
+        pruner = _make_pruning_callback(trial_id, curves, warmup_epochs, min_trials)
+        extra.append(pruner)
+
+    model, history = trainer.fit_model(
+        train_seq, val_seq, epochs=epochs, batch_size=batch_size,
+        checkpoint_path=trial_dir / "best.keras", verbose=0,
+        run_dir=trial_dir, resume_state=resume_state,
+        model_params=params, extra_callbacks=extra,
+    )
+
+    # Cumulative across halving rungs (ResumableCheckpoint keeps the full history)
+    state = load_resume_state(trial_dir) or {}
+    scores = state.get('history', {}).get(METRIC) or history.history.get(METRIC, [])
+    return {
+        'trial': trial_id,
+        **params,
+        'batch_size': batch_size,
+        'epochs_run': len(scores),
+        'best_' + METRIC: max(scores) if scores else np.nan,
+        'last_' + METRIC: scores[-1] if scores else np.nan,
+        'status': 'pruned' if pruner is not None and pruner.pruned else 'complete',
+        'seconds': time.time() - started,
+    }
+
+
+# ============================================================================
+# SWEEP DRIVER
+# ============================================================================
+def _execute(pool, jobs: list) -> list:
+    futures = {pool.submit(_run_trial, *args, **kwargs): args[0] for args, kwargs in jobs}
+    results = []
+    for future in as_completed(futures):
+        trial_id = futures[future]
+        try:
+            r = future.result()
+        except Exception as e:
+            r = {'trial': trial_id, 'status': f'error: {e}'}
+        results.append(r)
+        score = r.get('best_' + METRIC, np.nan)
+        print(f"   Trial {trial_id:>3}: {r['status']:<10} {METRIC}={score:.3f} "
+              f"({r.get('epochs_run', 0)} epochs, {r.get('seconds', 0):.0f}s)")
+    return results
+
+
+def load_space(path) -> dict:
+    """Read a sweep spec: {"strategy": ..., "space": {...}, "n_trials": ..., "max_epochs": ...}"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_sweep(spec: dict = None, workers: int = None) -> pd.DataFrame:
+    """Run a sweep and write runs/sweep_<timestamp>/results.csv"""
+    import train as trainer
+
+    spec = spec or {}
+    strategy = spec.get('strategy', 'random')
+    space = spec.get('space', DEFAULT_SPACE)
+    max_epochs = int(spec.get('max_epochs', 30))
+    n_trials = int(spec.get('n_trials', 16))
+    eta = int(spec.get('eta', 3))
+    min_epochs = int(spec.get('min_epochs', 5))
+
+    if strategy == 'grid':
+        trials = grid_trials(space)
+    elif strategy in ('random', 'halving'):
+        trials = random_trials(space, n_trials, seed=int(spec.get('seed', 42)))
+    else:
+        raise ValueError(f"Unknown sweep strategy: {strategy}")
+
+    print("\n" + "="*90)
+    print(f"🧪 HYPERPARAMETER SWEEP ({strategy}, {len(trials)} trials)")
+    print("="*90)
+
+    run_dir = Config.RUNS_DIR / f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Build the windowed dataset ONCE
+    train_data, val_data, _ = trainer.load_and_split_data()
+    if not train_data or not val_data:
+        raise ValueError("No training data")
+    train_seq, val_seq, _, _ = trainer.prepare_sequences(train_data, val_data, None)
+
+    shared = SharedDataset({
+        **{f"train_{k}": v.astype(np.float32) if k == 'X' else v for k, v in train_seq.items()},
+        **{f"val_{k}": v.astype(np.float32) if k == 'X' else v for k, v in val_seq.items()},
+    })
+    total_mb = sum(np.prod(shape) * np.dtype(dt).itemsize for _, shape, dt in shared.spec.values()) / 1e6
+    print(f"   📦 Shared dataset: {total_mb:.0f} MB "
+          f"(train {len(train_seq['X']):,} / val {len(val_seq['X']):,} windows)")
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or cpu_count, len(trials), cpu_count))
+    threads = max(1, cpu_count // workers)
+    print(f"   Workers: {workers} x {threads} threads | Run dir: {run_dir}\n")
+
+    started = time.time()
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ctx.Manager() as manager, ProcessPoolExecutor(
+                max_workers=workers, mp_context=ctx,
+                initializer=init_worker_threads, initargs=(threads,)) as pool:
+
+            if strategy == 'halving':
+                results = []
+                alive = list(enumerate(trials))
+                budget = min_epochs
+                while alive:
+                    print(f"   ▶ Rung: {len(alive)} trials → {budget} epochs")
+                    rung = _execute(pool, [
+                        ((tid, params, shared.spec, budget, str(run_dir)), {'resume': budget > min_epochs})
+                        for tid, params in alive
+                    ])
+                    ranked = sorted(rung, key=lambda r: r.get('best_' + METRIC, -1), reverse=True)
+                    keep = max(1, len(ranked) // eta)
+                    if budget >= max_epochs or len(ranked) == 1:
+                        results.extend(ranked)
+                        break
+                    promoted = {r['trial'] for r in ranked[:keep]}
+                    for r in ranked[keep:]:
+                        results.append({**r, 'status': 'pruned'})
+                    alive = [(tid, params) for tid, params in alive if tid in promoted]
+                    budget = min(budget * eta, max_epochs)
+            else:
+                curves = manager.dict()
+                results = _execute(pool, [
+                    ((tid, params, shared.spec, max_epochs, str(run_dir)),
+                     {'curves': curves, 'warmup_epochs': min_epochs})
+                    for tid, params in enumerate(trials)
+                ])
+    finally:
+        shared.close()
+
+    table = pd.DataFrame(results)
+    if 'best_' + METRIC in table.columns:
+        table = table.sort_values('best_' + METRIC, ascending=False)
+    table.to_csv(run_dir / "results.csv", index=False)
+
+    print("\n" + "="*90)
+    print(f"📊 SWEEP RESULTS ({time.time() - started:.0f}s wall) → {run_dir / 'results.csv'}")
+    print("="*90)
+    print(table.head(10).to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+    print("="*90)
+
+    return table
@@ -0,0 +1,157 @@
+"""
+Tracing - Nested timing spans for the predict / train / update / app hot paths
+Disabled by default: span() then hands back one shared no-op object, so instrumented code pays a
+single flag check. Enable with --profile on the CLIs or STOCK_TRACE=1 (e.g. for streamlit).
+Finished spans are appended to runs/traces.jsonl, one JSON object per line.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+_enabled = os.environ.get('STOCK_TRACE', '') not in ('', '0')
+_local = threading.local()
+_pending = []
+_lock = threading.Lock()
+TRACE_ID = uuid.uuid4().hex[:12]
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """One timed stage; attributes (e.g. symbol) are inherited by nested spans"""
+    __slots__ = ('name', 'attrs', 'parent', 'depth', '_t0', '_wall')
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        if self.parent is not None:
+            self.attrs = {**self.parent.attrs, **self.attrs}
+        stack.append(self)
+        self._wall = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._t0
+        _local.stack.pop()
+        record = {
+            'trace_id': TRACE_ID,
+            'name': self.name,
+            'parent': self.parent.name if self.parent else None,
+            'depth': self.depth,
+            'start': datetime.fromtimestamp(self._wall).isoformat(timespec='milliseconds'),
+            'duration_ms': round(elapsed * 1000, 3),
+            'pid': os.getpid(),
+            **self.attrs,
+        }
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        with _lock:
+            _pending.append(record)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def span(name: str, **attrs):
+    """`with span('inference', symbol=s):` - a no-op unless tracing is enabled"""
+    return Span(name, attrs) if _enabled else _NULL_SPAN
+
+
+def traced(name: str = None, attrs=None):
+    """Decorator form; `attrs` maps the call's arguments to span attributes"""
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(span_name, attrs(*args, **kwargs) if attrs else {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def flush(path=None) -> list:
+    """Append finished spans to the JSONL trace file; returns them (for print_profile)"""
+    with _lock:
+        records = _pending[:]
+        _pending.clear()
+    if records:
+        path = Path(path or Config.TRACE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a') as f:
+            f.writelines(json.dumps(r, default=str) + '\n' for r in records)
+    return records
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+def stage_table(records: list, group: str = 'symbol'):
+    """ms per (group value, stage): sums repeated spans of the same name"""
+    import pandas as pd
+
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+    if group not in df.columns:
+        df[group] = '-'
+    df[group] = df[group].fillna('-')
+    order = list(dict.fromkeys(df.sort_values('depth', kind='stable')['name']))
+    table = df.pivot_table(index=group, columns='name', values='duration_ms', aggfunc='sum', sort=False)
+    return table[[c for c in order if c in table.columns]]
+
+
+def print_profile(records: list, group: str = 'symbol', title: str = "STAGE LATENCY"):
+    table = stage_table(records, group)
+    if table.empty:
+        return print("⏱️  No spans recorded")
+    width = max(80, 12 + 12 * len(table.columns))
+    print("\n" + "="*width)
+    print(f"⏱️  {title} (ms)")
+    print("="*width)
+    print(table.to_string(float_format=lambda v: f"{v:,.1f}", na_rep="-"))
+    print("="*width)
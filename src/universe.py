@@ -0,0 +1,76 @@
+"""
+Universe Registry - Named symbol lists in universes/<name>.txt shared by every entry point
+    python src/universe.py                      # list universes
+    python src/universe.py sp500 --missing      # symbols without a local price CSV
+A universe argument is a registry name ("mega-cap", "sp500"), a path to a list file, or an
+inline comma-separated list ("AAPL,MSFT"). chunked() bounds how many symbols a batch stage
+holds in memory at once (Config.UNIVERSE_CHUNK).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config, read_universe_file
+
+
+def universe_path(name: str) -> Path:
+    return Config.UNIVERSE_DIR / f"{name}.txt"
+
+
+def list_universes() -> dict:
+    """{name: symbol count} of every registry file"""
+    return {p.stem: len(read_universe_file(p)) for p in sorted(Config.UNIVERSE_DIR.glob("*.txt"))}
+
+
+def load_universe(spec: str = None) -> list:
+    """Symbols of a registry name, list file or inline comma list (default: Config.DEFAULT_UNIVERSE)"""
+    spec = spec or Config.DEFAULT_UNIVERSE
+    if universe_path(spec).exists():
+        return read_universe_file(universe_path(spec))
+    if Path(spec).is_file():
+        return read_universe_file(spec)
+    if ',' in spec:
+        return list(dict.fromkeys(s.strip().upper() for s in spec.split(',') if s.strip()))
+    raise ValueError(f"Unknown universe '{spec}' (available: {', '.join(list_universes())})")
+
+
+def resolve_symbols(stocks=None, universe: str = None, default: str = None) -> list:
+    """CLI helper: explicit -s symbols, else --universe, else the `default` universe"""
+    if stocks:
+        return list(dict.fromkeys(s.upper() for s in stocks))
+    return load_universe(universe or default)
+
+
+def chunked(symbols: list, size: int = None):
+    """Consecutive slices of at most `size` symbols (default: Config.UNIVERSE_CHUNK)"""
+    size = max(1, size or Config.UNIVERSE_CHUNK)
+    for i in range(0, len(symbols), size):
+        yield symbols[i:i + size]
+
+
+def has_local_data(symbol: str) -> bool:
+    """A price CSV exists where predict.py / update_data.py (or train.py's cache) look for one"""
+    from src.pipeline import PRICE_CSV_CANDIDATES
+    return any(Path(p.format(s=symbol)).exists() for p in (*PRICE_CSV_CANDIDATES, "data/{s}/{s}_data.csv"))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List universes or show one")
+    parser.add_argument("universe", nargs="?", help="Registry name, list file or comma list")
+    parser.add_argument("--missing", action="store_true", help="Only symbols without a local price CSV")
+    args = parser.parse_args()
+
+    if args.universe is None:
+        print(f"\n📚 Universes in {Config.UNIVERSE_DIR} (default: {Config.DEFAULT_UNIVERSE})")
+        for name, count in list_universes().items():
+            print(f"   {'*' if name == Config.DEFAULT_UNIVERSE else ' '} {name:<14} {count:>5} symbols")
+        print()
+    else:
+        symbols = load_universe(args.universe)
+        if args.missing:
+            symbols = [s for s in symbols if not has_local_data(s)]
+        print(' '.join(symbols))
+        print(f"\n{len(symbols)} symbols", file=sys.stderr)
@@ -0,0 +1,226 @@
+"""
+Walk-Forward Harness - Rolling/expanding folds trained in parallel workers
+Feature panel is built once, cached to the run directory and shared by all folds
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import Config
+
+
+def generate_folds(data_start, data_end=None, n_folds=None, mode=None,
+                   step_months=None, val_months=None, train_years=None) -> list:
+    """
+    Build fold boundaries walking backwards from data_end.
+    Each fold: train (start, train_end] | val (train_end, val_end] | test (val_end, test_end]
+    """
+    data_start = pd.Timestamp(data_start)
+    data_end = pd.Timestamp(data_end or Config.WF_END_DATE)
+    n_folds = n_folds or Config.WF_N_FOLDS
+    mode = mode or Config.WF_MODE
+    step = pd.DateOffset(months=step_months or Config.WF_STEP_MONTHS)
+    val_len = pd.DateOffset(months=val_months or Config.WF_VAL_MONTHS)
+    train_len = pd.DateOffset(years=train_years or Config.WF_TRAIN_YEARS)
+
+    if mode not in ("expanding", "rolling"):
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+
+    folds = []
+    for k in range(n_folds):
+        test_end = data_end - step * (n_folds - 1 - k)
+        val_end = test_end - step
+        train_end = val_end - val_len
+        train_start = train_end - train_len if mode == "rolling" else None
+
+        if train_end <= data_start or (train_start is not None and train_start < data_start):
+            continue
+
+        folds.append({
+            'fold': len(folds),
+            'train_start': train_start,
+            'train_end': train_end,
+            'val_end': val_end,
+            'test_end': test_end,
+        })
+
+    return folds
+
+
+def init_worker_threads(n_threads: int):
+    """Partition CPU threads before TensorFlow initializes its runtime"""
+    os.environ['OMP_NUM_THREADS'] = str(n_threads)
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _run_fold(fold: dict, panel_path: str, run_dir: str, epochs: int, batch_size: int) -> dict:
+    """Train and evaluate a single fold (runs inside a worker process)"""
+    import tensorflow as tf
+    import train as trainer
+
+    np.random.seed(42 + fold['fold'])
+    tf.random.set_seed(42 + fold['fold'])
+
+    started = time.time()
+    panel = pd.read_pickle(panel_path)
+
+    train_data, val_data, test_data = trainer.split_panel(
+        panel,
+        train_start=fold['train_start'],
+        train_end=fold['train_end'],
+        val_end=fold['val_end'],
+        test_end=fold['test_end'],
+        min_rows=Config.WF_MIN_SPLIT_ROWS,
+        verbose=False,
+    )
+
+    if train_data is None or val_data is None:
+        return {**fold, 'status': 'skipped', 'seconds': time.time() - started}
+
+    train_seq, val_seq, test_seq, _ = trainer.prepare_sequences(train_data, val_data, test_data)
+
+    checkpoint_path = Path(run_dir) / f"fold_{fold['fold']:02d}.keras"
+    model, history = trainer.fit_model(
+        train_seq, val_seq, epochs=epochs, batch_size=batch_size,
+        checkpoint_path=checkpoint_path, verbose=0
+    )
+
+    result = {
+        **fold,
+        'status': 'ok',
+        'epochs_run': len(history.history['loss']),
+        'n_train': len(train_seq['X']),
+        'val': trainer.evaluate_model(model, val_seq, verbose=False),
+        'test': trainer.evaluate_model(model, test_seq, verbose=False) if test_seq is not None and len(test_seq['X']) else None,
+        'seconds': time.time() - started,
+    }
+    return result
+
+
+def aggregate_results(results: list) -> pd.DataFrame:
+    """Flatten per-fold/per-threshold accuracy into one table"""
+    rows = []
+    for r in results:
+        if r.get('status') != 'ok':
+            continue
+        for split in ('val', 'test'):
+            metrics = r.get(split)
+            if not metrics:
+                continue
+            for thresh, t in metrics['thresholds'].items():
+                rows.append({
+                    'fold': r['fold'],
+                    'test_end': r['test_end'].strftime('%Y-%m-%d'),
+                    'split': split,
+                    'threshold': thresh,
+                    'signals': t['signals'],
+                    'accuracy': t['accuracy'],
+                    'n_samples': metrics['n_samples'],
+                })
+    return pd.DataFrame(rows)
+
+
+def summarize(table: pd.DataFrame) -> pd.DataFrame:
+    """Signal-weighted accuracy across folds per split/threshold"""
+    if table.empty:
+        return table
+
+    def _agg(g):
+        valid = g[g['signals'] > 0]
+        weighted = (valid['accuracy'] * valid['signals']).sum() / valid['signals'].sum() if len(valid) else np.nan
+        return pd.Series({
+            'folds': g['fold'].nunique(),
+            'signals': int(g['signals'].sum()),
+            'weighted_acc': weighted,
+            'mean_acc': valid['accuracy'].mean(),
+            'std_acc': valid['accuracy'].std(),
+            'min_acc': valid['accuracy'].min(),
+        })
+
+    summary = table.groupby(['split', 'threshold']).apply(_agg).reset_index()
+    return summary.astype({'folds': int, 'signals': int})
+
+
+def run_walk_forward(n_folds=None, mode=None, workers=None, epochs=None, batch_size=None) -> pd.DataFrame:
+    """Build the panel once, train every fold in parallel, print the aggregate table"""
+    import train as trainer
+
+    epochs = epochs or Config.WF_EPOCHS
+    batch_size = batch_size or Config.WF_BATCH_SIZE
+
+    print("\n" + "="*90)
+    print("🔁 WALK-FORWARD EVALUATION")
+    print("="*90)
+
+    run_dir = Config.RUNS_DIR / f"walk_forward_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Build feature panel once (CSV load, indicators, SPY trend) and share it
+    panel = trainer.build_feature_panel()
+    if not panel:
+        raise ValueError("No training data")
+    panel_path = run_dir / "feature_panel.pkl"
+    pd.to_pickle(panel, panel_path)
+
+    data_start = min(df.index.min() for df in panel.values())
+    folds = generate_folds(data_start, n_folds=n_folds, mode=mode)
+    if not folds:
+        raise ValueError("No folds fit inside the available data range")
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(workers or len(folds), len(folds), cpu_count))
+    threads_per_worker = max(1, cpu_count // workers)
+
+    print(f"   Mode: {mode or Config.WF_MODE} | Folds: {len(folds)} | "
+          f"Workers: {workers} x {threads_per_worker} threads")
+    print(f"   Run dir: {run_dir}\n")
+
+    started = time.time()
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=init_worker_threads, initargs=(threads_per_worker,)) as pool:
+        futures = {
+            pool.submit(_run_fold, fold, str(panel_path), str(run_dir), epochs, batch_size): fold
+            for fold in folds
+        }
+        for future in as_completed(futures):
+            fold = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {**fold, 'status': f'error: {e}'}
+            results.append(result)
+            print(f"   Fold {fold['fold']:>2} (test → {fold['test_end'].strftime('%Y-%m-%d')}): "
+                  f"{result['status']} in {result.get('seconds', 0):.0f}s")
+
+    results.sort(key=lambda r: r['fold'])
+    table = aggregate_results(results)
+    summary = summarize(table)
+
+    table.to_csv(run_dir / "fold_metrics.csv", index=False)
+    summary.to_csv(run_dir / "summary.csv", index=False)
+
+    print("\n" + "="*90)
+    print(f"📊 WALK-FORWARD SUMMARY ({time.time() - started:.0f}s wall)")
+    print("="*90)
+    if summary.empty:
+        print("   ⚠️  No fold produced results")
+    else:
+        print(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print("="*90)
+
+    return table
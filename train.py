@@ -17,9 +17,16 @@ import tensorflow as tf
 from sklearn.preprocessing import RobustScaler
 from sklearn.metrics import confusion_matrix
 from pathlib import Path
+from datetime import datetime
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from config import Config
+from src import tracing
+from src.tracing import span, traced
+from src.universe import load_universe
+
 # ============================================================================
 # FIX #1: SEPARATE PRICE SOURCES
 # ============================================================================
@@ -252,30 +259,28 @@ def create_all_features(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
-def load_and_split_data():
-    """Load data with all fixes integrated"""
-    print("\n" + "="*90)
-    print("🔥 LOADING DATA WITH 8 CRITICAL FIXES")
-    print("="*90)
-    
+TRAIN_STOCKS = load_universe(Config.TRAIN_UNIVERSE)
+PANEL_LABELS = ['tomorrow_direction', 'week_direction', 'tomorrow_return', 'week_return']
+
+def iter_feature_panel(stocks=None):
+    """
+    (symbol, feature frame) one symbol at a time: model features + strong move labels,
+    NaNs dropped. Intermediate indicator columns are discarded, so a large universe only
+    ever holds one full frame.
+    """
     import sys
     sys.path.append(str(Path(__file__).parent))
     from src.data_loader import fetch_stock_data
     
-    stocks = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META']
-    print(f"Training on {len(stocks)} stocks: {', '.join(stocks)}")
-    print(f"FIX #1: Separate price sources (CSV features + Yahoo display)")
-    print(f"FIX #5: Strong move labels only (±0.3% threshold)")
-    print(f"FIX #3: Market trend feature (SPY)")
-    print(f"FIX #4: Trend strength features (EMA diff, ADX, VWAP)\n")
-    
-    all_data = {'train': [], 'val': [], 'test': []}
+    stocks = stocks or TRAIN_STOCKS
+    columns = get_final_features() + PANEL_LABELS
     
     for symbol in stocks:
         try:
             print(f"📊 Processing {symbol}...")
             
-            df = fetch_stock_data(symbol, use_cache=True)
+            with span('data_load', symbol=symbol):
+                df = fetch_stock_data(symbol, use_cache=True)
             if df.empty or len(df) < 300:
                 print(f"   ⚠️  Skipping - insufficient data")
                 continue
@@ -287,62 +292,84 @@ def load_and_split_data():
                 df.index = df.index.tz_localize(None)
             
             # Add all features (including FIX #3, #4)
-            df = create_all_features(df)
-            
-            # FIX #5: Create strong move labels
-            df = create_strong_move_targets(df, min_threshold=0.003)
+            with span('features', symbol=symbol):
+                df = create_all_features(df)
+                
+                # FIX #5: Create strong move labels
+                df = create_strong_move_targets(df, min_threshold=0.003)
             
             df = df.dropna()
+        
+        except Exception as e:
+            print(f"   ❌ Error: {e}")
+            continue
+        
+        yield symbol, df[columns]
+
+def build_feature_panel(stocks=None) -> dict:
+    """
+    Per-symbol feature frames (iter_feature_panel as a dict).
+    Built once and shared by every split / walk-forward fold.
+    """
+    return dict(iter_feature_panel(stocks))
+
+def split_panel(panel, train_end, val_end, test_end, train_start=None,
+                min_rows: int = 200, verbose: bool = True):
+    """Time-based train/val/test split of a feature panel (dict, or iter_feature_panel's stream)"""
+    train_end = pd.to_datetime(train_end)
+    val_end = pd.to_datetime(val_end)
+    test_end = pd.to_datetime(test_end)
+    train_start = pd.to_datetime(train_start) if train_start is not None else None
+    
+    feature_cols = get_final_features()
+    all_data = {'train': [], 'val': [], 'test': []}
+    
+    for symbol, df in (panel.items() if isinstance(panel, dict) else panel):
+        train_mask = df.index <= train_end
+        if train_start is not None:
+            train_mask &= df.index > train_start
+        
+        train_df = df[train_mask]
+        val_df = df[(df.index > train_end) & (df.index <= val_end)]
+        test_df = df[(df.index > val_end) & (df.index <= test_end)]
+        
+        if verbose:
+            print(f"   {symbol} Train: {len(train_df)}, Val: {len(val_df)}, Test: {len(test_df)}")
+        
+        for split_df, split_name in [(train_df, 'train'), (val_df, 'val'), (test_df, 'test')]:
+            if len(split_df) < min_rows:
+                continue
             
-            # Time-based splits
-            train_end = pd.to_datetime("2023-12-31")
-            val_end = pd.to_datetime("2024-12-31")
-            test_end = pd.to_datetime("2025-12-22")
-            
-            train_df = df[df.index <= train_end]
-            val_df = df[(df.index > train_end) & (df.index <= val_end)]
-            test_df = df[(df.index > val_end) & (df.index <= test_end)]
+            # FIX #5: Filter out weak moves (-1 labels)
+            split_df_filtered = split_df[
+                (split_df['tomorrow_direction'] != -1) & 
+                (split_df['week_direction'] != -1)
+            ]
             
-            print(f"   Train: {len(train_df)}, Val: {len(val_df)}, Test: {len(test_df)}")
+            if len(split_df_filtered) < 50:
+                if verbose:
+                    print(f"   ⚠️  {split_name}: insufficient strong moves after filtering")
+                continue
             
-            feature_cols = get_final_features()
+            X = split_df_filtered[feature_cols].values
+            y_tom_dir = split_df_filtered['tomorrow_direction'].values
+            y_week_dir = split_df_filtered['week_direction'].values
+            y_tom_price = split_df_filtered['tomorrow_return'].values
+            y_week_price = split_df_filtered['week_return'].values
             
-            for split_df, split_name in [(train_df, 'train'), (val_df, 'val'), (test_df, 'test')]:
-                if len(split_df) < 200:
-                    continue
-                
-                # FIX #5: Filter out weak moves (-1 labels)
-                split_df_filtered = split_df[
-                    (split_df['tomorrow_direction'] != -1) & 
-                    (split_df['week_direction'] != -1)
-                ].copy()
-                
-                if len(split_df_filtered) < 50:
-                    print(f"   ⚠️  {split_name}: insufficient strong moves after filtering")
-                    continue
-                
-                X = split_df_filtered[feature_cols].values
-                y_tom_dir = split_df_filtered['tomorrow_direction'].values
-                y_week_dir = split_df_filtered['week_direction'].values
-                y_tom_price = split_df_filtered['tomorrow_return'].values
-                y_week_price = split_df_filtered['week_return'].values
-                
+            if verbose:
                 tom_pos_pct = y_tom_dir.mean() * 100
                 week_pos_pct = y_week_dir.mean() * 100
                 print(f"   {split_name.upper()}: {len(split_df_filtered)} strong moves | "
                       f"Tom {tom_pos_pct:.1f}% up | Week {week_pos_pct:.1f}% up")
-                
-                all_data[split_name].append({
-                    'X': X,
-                    'y_tom_dir': y_tom_dir,
-                    'y_week_dir': y_week_dir,
-                    'y_tom_price': y_tom_price,
-                    'y_week_price': y_week_price
-                })
-        
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            continue
+            
+            all_data[split_name].append({
+                'X': X,
+                'y_tom_dir': y_tom_dir,
+                'y_week_dir': y_week_dir,
+                'y_tom_price': y_tom_price,
+                'y_week_price': y_week_price
+            })
     
     # Combine
     def combine_split(data_list):
@@ -356,9 +383,28 @@ def load_and_split_data():
             'y_week_price': np.concatenate([d['y_week_price'] for d in data_list], axis=0)
         }
     
-    train_data = combine_split(all_data['train'])
-    val_data = combine_split(all_data['val'])
-    test_data = combine_split(all_data['test'])
+    return (combine_split(all_data['train']),
+            combine_split(all_data['val']),
+            combine_split(all_data['test']))
+
+@traced('load_split')
+def load_and_split_data():
+    """Load data with all fixes integrated"""
+    print("\n" + "="*90)
+    print("🔥 LOADING DATA WITH 8 CRITICAL FIXES")
+    print("="*90)
+    
+    stocks = TRAIN_STOCKS
+    print(f"Training on {len(stocks)} stocks: {', '.join(stocks)}")
+    print(f"FIX #1: Separate price sources (CSV features + Yahoo display)")
+    print(f"FIX #5: Strong move labels only (±0.3% threshold)")
+    print(f"FIX #3: Market trend feature (SPY)")
+    print(f"FIX #4: Trend strength features (EMA diff, ADX, VWAP)\n")
+    
+    # Time-based splits, streamed symbol by symbol (only the split arrays are kept)
+    train_data, val_data, test_data = split_panel(
+        iter_feature_panel(stocks), train_end="2023-12-31", val_end="2024-12-31", test_end="2025-12-22"
+    )
     
     print("\n" + "="*90)
     print("✅ DATA READY (Strong moves only):")
@@ -373,43 +419,53 @@ def load_and_split_data():
     return train_data, val_data, test_data
 
 def create_sequences(data, seq_len):
-    """Create sequences"""
+    """Create sequences (window i = rows [i, i+seq_len), label at row i+seq_len)"""
     X = data['X']
+    n = max(len(X) - seq_len, 0)
     
-    X_seq = []
-    y_tom_dir_seq = []
-    y_week_dir_seq = []
-    y_tom_price_seq = []
-    y_week_price_seq = []
-    
-    for i in range(len(X) - seq_len):
-        X_seq.append(X[i:i+seq_len])
-        y_tom_dir_seq.append(data['y_tom_dir'][i+seq_len])
-        y_week_dir_seq.append(data['y_week_dir'][i+seq_len])
-        y_tom_price_seq.append(data['y_tom_price'][i+seq_len])
-        y_week_price_seq.append(data['y_week_price'][i+seq_len])
+    if n > 0:
+        windows = np.lib.stride_tricks.sliding_window_view(X, seq_len, axis=0)[:n]
+        X_seq = np.ascontiguousarray(windows.transpose(0, 2, 1))
+    else:
+        X_seq = np.empty((0, seq_len, X.shape[1]), dtype=X.dtype)
     
     return {
-        'X': np.array(X_seq),
-        'y_tom_dir': np.array(y_tom_dir_seq),
-        'y_week_dir': np.array(y_week_dir_seq),
-        'y_tom_price': np.array(y_tom_price_seq),
-        'y_week_price': np.array(y_week_price_seq)
+        'X': X_seq,
+        'y_tom_dir': np.asarray(data['y_tom_dir'][seq_len:seq_len + n]),
+        'y_week_dir': np.asarray(data['y_week_dir'][seq_len:seq_len + n]),
+        'y_tom_price': np.asarray(data['y_tom_price'][seq_len:seq_len + n]),
+        'y_week_price': np.asarray(data['y_week_price'][seq_len:seq_len + n])
     }
 
-def build_model(input_shape):
-    """Build optimized model"""
+BUILD_DEFAULTS = {
+    'lstm_units_1': 128,
+    'lstm_units_2': 64,
+    'dense_units': 64,
+    'dropout': 0.3,
+    'recurrent_dropout': 0.2,
+    'l2': 0.01,
+    'learning_rate': 0.0005,
+    'week_dir_weight': 4.0,
+    'week_price_weight': 2.0,
+}
+
+def build_model(input_shape, **params):
+    """Build optimized model (hyperparameters default to BUILD_DEFAULTS)"""
+    p = {**BUILD_DEFAULTS, **params}
+    
     inputs = tf.keras.Input(shape=input_shape)
     
-    x = tf.keras.layers.LSTM(128, dropout=0.3, recurrent_dropout=0.2, return_sequences=True)(inputs)
+    x = tf.keras.layers.LSTM(p['lstm_units_1'], dropout=p['dropout'], recurrent_dropout=p['recurrent_dropout'],
+                             return_sequences=True)(inputs)
     x = tf.keras.layers.BatchNormalization()(x)
     
-    x = tf.keras.layers.LSTM(64, dropout=0.3, recurrent_dropout=0.2, return_sequences=False)(x)
+    x = tf.keras.layers.LSTM(p['lstm_units_2'], dropout=p['dropout'], recurrent_dropout=p['recurrent_dropout'],
+                             return_sequences=False)(x)
     x = tf.keras.layers.BatchNormalization()(x)
     
-    shared = tf.keras.layers.Dense(64, activation='relu', 
-                                   kernel_regularizer=tf.keras.regularizers.l2(0.01))(x)
-    shared = tf.keras.layers.Dropout(0.3)(shared)
+    shared = tf.keras.layers.Dense(p['dense_units'], activation='relu', 
+                                   kernel_regularizer=tf.keras.regularizers.l2(p['l2']))(x)
+    shared = tf.keras.layers.Dropout(p['dropout'])(shared)
     
     # FIX #6: Improved probability distribution with better class weights
     tom_dir = tf.keras.layers.Dense(16, activation='relu')(shared)
@@ -429,7 +485,7 @@ def build_model(input_shape):
     model = tf.keras.Model(inputs, [tom_dir_out, tom_price_out, week_dir_out, week_price_out])
     
     model.compile(
-        optimizer=tf.keras.optimizers.Adam(learning_rate=0.0005),
+        optimizer=tf.keras.optimizers.Adam(learning_rate=p['learning_rate']),
         loss={
             'tomorrow_direction': 'binary_crossentropy',
             'tomorrow_price': 'mse',
@@ -437,59 +493,173 @@ def build_model(input_shape):
             'week_price': 'mse'
         },
         loss_weights={'tomorrow_direction': 1.0, 'tomorrow_price': 0.5, 
-                     'week_direction': 4.0, 'week_price': 2.0},
+                     'week_direction': p['week_dir_weight'], 'week_price': p['week_price_weight']},
         metrics={'tomorrow_direction': ['accuracy'], 'tomorrow_price': ['mae'],
                 'week_direction': ['accuracy'], 'week_price': ['mae']}
     )
     
     return model
 
-def evaluate_model(model, data, split_name="Test"):
+EVAL_THRESHOLDS = [0.52, 0.55, 0.58]
+
+@traced('evaluate', attrs=lambda model, data, split_name="Test", *a, **k: {'split': split_name})
+def evaluate_model(model, data, split_name="Test", verbose=True) -> dict:
     """FIX #8: Proper evaluation"""
-    print("\n" + "="*90)
-    print(f"📊 {split_name.upper()} EVALUATION")
-    print("="*90)
-    
     X = data['X']
     y_week_dir = data['y_week_dir']
     
     preds = model.predict(X, verbose=0)
     week_dir_probs = preds[2].flatten()
     
-    print(f"\n📈 WEEKLY DIRECTION (Priority):")
-    print(f"   Probability spread: [{week_dir_probs.min():.3f}, {week_dir_probs.max():.3f}]")
-    print(f"   Mean: {week_dir_probs.mean():.3f}, Std: {week_dir_probs.std():.3f}")
+    results = {
+        'n_samples': len(week_dir_probs),
+        'prob_min': float(week_dir_probs.min()),
+        'prob_max': float(week_dir_probs.max()),
+        'prob_mean': float(week_dir_probs.mean()),
+        'prob_std': float(week_dir_probs.std()),
+        'thresholds': {}
+    }
     
-    for thresh in [0.52, 0.55, 0.58]:
+    for thresh in EVAL_THRESHOLDS:
         has_signal = (week_dir_probs >= thresh) | (week_dir_probs <= (1 - thresh))
-        n_sig = np.sum(has_signal)
-        
-        if n_sig > 0:
-            acc = np.mean((week_dir_probs[has_signal] >= 0.5) == y_week_dir[has_signal])
-            print(f"   Threshold {thresh:.0%}: {n_sig} signals, {acc:.1%} accuracy")
+        n_sig = int(np.sum(has_signal))
+        acc = float(np.mean((week_dir_probs[has_signal] >= 0.5) == y_week_dir[has_signal])) if n_sig > 0 else np.nan
+        results['thresholds'][thresh] = {'signals': n_sig, 'accuracy': acc}
+    
+    if verbose:
+        print("\n" + "="*90)
+        print(f"📊 {split_name.upper()} EVALUATION")
+        print("="*90)
+        print(f"\n📈 WEEKLY DIRECTION (Priority):")
+        print(f"   Probability spread: [{results['prob_min']:.3f}, {results['prob_max']:.3f}]")
+        print(f"   Mean: {results['prob_mean']:.3f}, Std: {results['prob_std']:.3f}")
+        for thresh, r in results['thresholds'].items():
+            if r['signals'] > 0:
+                print(f"   Threshold {thresh:.0%}: {r['signals']} signals, {r['accuracy']:.1%} accuracy")
+        print("="*90)
+    
+    return results
+
+@traced('sequences')
+def prepare_sequences(train_data, val_data, test_data, seq_len=60):
+    """Fit scaler on train only, then build 60-day sequences for every split"""
+    scaler = RobustScaler()
+    train_data['X'] = scaler.fit_transform(train_data['X'])
+    val_data['X'] = scaler.transform(val_data['X'])
+    if test_data is not None:
+        test_data['X'] = scaler.transform(test_data['X'])
     
-    print("="*90)
+    train_seq = create_sequences(train_data, seq_len)
+    val_seq = create_sequences(val_data, seq_len)
+    test_seq = create_sequences(test_data, seq_len) if test_data is not None else None
+    
+    return train_seq, val_seq, test_seq, scaler
 
-def train():
-    """FIX #8: Full retraining"""
+@traced('fit')
+def fit_model(train_seq, val_seq, epochs=50, batch_size=32,
+              checkpoint_path='models/stock_model_fixed.keras', verbose=1,
+              run_dir=None, resume_state=None, checkpoint_every=1,
+              model_params=None, extra_callbacks=None):
+    """
+    Build and fit the multi-task model on prepared sequences.
+    With run_dir, full training state is checkpointed every `checkpoint_every`
+    epochs; with resume_state, training continues from that checkpoint.
+    """
+    from src.checkpointing import ResumableCheckpoint, load_checkpoint_model
+    
+    if resume_state:
+        model = load_checkpoint_model(run_dir)
+    else:
+        model = build_model(train_seq['X'].shape[1:], **(model_params or {}))
+    
+    early_stop = tf.keras.callbacks.EarlyStopping(monitor='val_week_direction_accuracy', mode='max',
+                                                  patience=12, restore_best_weights=True)
+    reduce_lr = tf.keras.callbacks.ReduceLROnPlateau(monitor='val_week_direction_loss', mode='min',
+                                                     factor=0.5, patience=6, min_lr=1e-6)
+    best_checkpoint = tf.keras.callbacks.ModelCheckpoint(str(checkpoint_path), 
+                                                         monitor='val_week_direction_accuracy', mode='max',
+                                                         save_best_only=True)
+    callbacks = [early_stop, reduce_lr, best_checkpoint] + list(extra_callbacks or [])
+    
+    if run_dir is not None:
+        # Must come last: restores the counters the callbacks above reset on train begin
+        callbacks.append(ResumableCheckpoint(
+            run_dir, tracked_callbacks=[early_stop, reduce_lr, best_checkpoint],
+            every_n_epochs=checkpoint_every, resume_state=resume_state
+        ))
+    
+    history = model.fit(
+        train_seq['X'],
+        [train_seq['y_tom_dir'], train_seq['y_tom_price'], 
+         train_seq['y_week_dir'], train_seq['y_week_price']],
+        validation_data=(
+            val_seq['X'],
+            [val_seq['y_tom_dir'], val_seq['y_tom_price'], 
+             val_seq['y_week_dir'], val_seq['y_week_price']]
+        ),
+        epochs=epochs, batch_size=batch_size, callbacks=callbacks, verbose=verbose,
+        initial_epoch=resume_state['epoch'] if resume_state else 0
+    )
+    
+    return model, history
+
+@traced('export')
+def export_model(model, val_seq, model_path=None):
+    """Export frozen SavedModel/TFLite artifacts, parity-checked on the validation windows"""
+    from src.inference import export_inference_artifacts
+    
+    return export_inference_artifacts(
+        model, Config.INFERENCE_DIR, validation_windows=val_seq['X'],
+        source_path=model_path or Config.MODEL_PATH, quantize=Config.INFERENCE_QUANTIZE
+    )
+
+@traced('calibration')
+def fit_calibration(model, val_seq, method='temperature'):
+    """Fit per-head probability calibration on the validation windows into the model bundle"""
+    from src.calibration import fit_calibrator, head_probs, save_calibration
+    
+    preds = model.predict(val_seq['X'], verbose=0)
+    heads = {
+        'tomorrow': (head_probs(preds, 'tomorrow'), val_seq['y_tom_dir']),
+        'week': (head_probs(preds, 'week'), val_seq['y_week_dir']),
+    }
+    calibrators = {head: fit_calibrator(p, y, method) for head, (p, y) in heads.items()}
+    val_accuracy = {head: float(np.mean((p >= 0.5) == y)) for head, (p, y) in heads.items()}
+    path = save_calibration(calibrators, val_accuracy=val_accuracy)
+    
+    print(f"\n🎚️  Calibration ({method}): " + ", ".join(f"{h}={c}" for h, c in calibrators.items()))
+    print(f"   Saved: {path}")
+    return calibrators
+
+def train(run_id=None, resume=False, checkpoint_every=1):
+    """FIX #8: Full retraining (resumable via runs/<run_id>/)"""
+    from src.checkpointing import load_resume_state
+    
     print("\n🎯 FIXED STOCK PREDICTION MODEL - 8 CRITICAL IMPROVEMENTS\n")
     
+    resume_state = None
+    if resume:
+        run_dir = Config.RUNS_DIR / run_id
+        if not run_dir.exists():
+            raise FileNotFoundError(f"No run directory to resume: {run_dir}")
+        resume_state = load_resume_state(run_dir)
+        if resume_state is None:
+            print(f"⚠️  {run_id} has no checkpoint yet - starting from epoch 0")
+    else:
+        run_id = run_id or f"train_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        run_dir = Config.RUNS_DIR / run_id
+    
+    print(f"📁 Run: {run_id} (resume with: python train.py --resume {run_id})")
+    
     train_data, val_data, test_data = load_and_split_data()
     
     if not train_data:
         raise ValueError("No training data")
     
     print("\n🔧 Normalizing...")
-    scaler = RobustScaler()
-    train_data['X'] = scaler.fit_transform(train_data['X'])
-    val_data['X'] = scaler.transform(val_data['X'])
-    test_data['X'] = scaler.transform(test_data['X'])
-    
     print("🔧 Creating sequences (60-day lookback)...")
     seq_len = 60
-    train_seq = create_sequences(train_data, seq_len)
-    val_seq = create_sequences(val_data, seq_len)
-    test_seq = create_sequences(test_data, seq_len)
+    train_seq, val_seq, test_seq, scaler = prepare_sequences(train_data, val_data, test_data, seq_len)
     
     print(f"   Train: {len(train_seq['X']):,} | Val: {len(val_seq['X']):,} | Test: {len(test_seq['X']):,}")
     
@@ -507,42 +677,82 @@ def train():
     
     print(f"\n📊 Class weights: {class_weight}")
     
-    model = build_model((seq_len, len(get_final_features())))
-    
-    callbacks = [
-        tf.keras.callbacks.EarlyStopping(monitor='val_week_direction_accuracy', 
-                                        patience=12, restore_best_weights=True),
-        tf.keras.callbacks.ReduceLROnPlateau(monitor='val_week_direction_loss', 
-                                            factor=0.5, patience=6, min_lr=1e-6),
-        tf.keras.callbacks.ModelCheckpoint('models/stock_model_fixed.keras', 
-                                          monitor='val_week_direction_accuracy', 
-                                          save_best_only=True)
-    ]
-    
     print("\n🚀 TRAINING (50 epochs, strong moves only)\n")
     
-    history = model.fit(
-        train_seq['X'],
-        [train_seq['y_tom_dir'], train_seq['y_tom_price'], 
-         train_seq['y_week_dir'], train_seq['y_week_price']],
-        validation_data=(
-            val_seq['X'],
-            [val_seq['y_tom_dir'], val_seq['y_tom_price'], 
-             val_seq['y_week_dir'], val_seq['y_week_price']]
-        ),
-        epochs=50, batch_size=32, callbacks=callbacks, verbose=1
-    )
+    model, history = fit_model(train_seq, val_seq, epochs=50, batch_size=32,
+                               run_dir=run_dir, resume_state=resume_state,
+                               checkpoint_every=checkpoint_every)
     
     # FIX #8: Full evaluation
     evaluate_model(model, val_seq, "Validation")
     evaluate_model(model, test_seq, "Test (Out-of-Sample)")
     
     print(f"\n✅ Model saved: models/stock_model_fixed.keras")
+    fit_calibration(model, val_seq)
+    export_model(model, val_seq)
     print("\n🎯 EXPECTED RESULTS: 55-60% accuracy, cleaner probability distribution")
     
     return model
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Train the multi-task LSTM stock model")
+    parser.add_argument("--walk-forward", action="store_true",
+                        help="Run the walk-forward evaluation harness instead of a single split")
+    parser.add_argument("--folds", type=int, default=None, help="Walk-forward folds (default: Config.WF_N_FOLDS)")
+    parser.add_argument("--mode", choices=["expanding", "rolling"], default=None,
+                        help="Walk-forward window mode (default: Config.WF_MODE)")
+    parser.add_argument("--sweep", nargs="?", const="", metavar="SPEC_JSON",
+                        help="Run a hyperparameter sweep (optional JSON spec; default: random over src.sweep.DEFAULT_SPACE)")
+    parser.add_argument("--strategy", choices=["grid", "random", "halving"], default=None,
+                        help="Sweep search strategy (overrides the spec)")
+    parser.add_argument("--trials", type=int, default=None, help="Random/halving sweep trial count")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Parallel fold/trial workers (default: one per fold/trial, capped by CPU count)")
+    parser.add_argument("--export", action="store_true",
+                        help="Re-export inference artifacts for the saved model (no training)")
+    parser.add_argument("--run-id", help="Name of the run directory under runs/ (default: timestamp)")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume an interrupted run from its last checkpoint")
+    parser.add_argument("--checkpoint-every", type=int, default=1,
+                        help="Epochs between resumable checkpoints (default: 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage latency table and append spans to runs/traces.jsonl")
+    parser.add_argument("-u", "--universe",
+                        help=f"Training universe (default: {Config.TRAIN_UNIVERSE}, see src/universe.py)")
+    args = parser.parse_args()
+    
+    if args.profile:
+        tracing.enable()
+    
+    if args.universe:
+        # Environment too, so walk-forward / sweep worker processes train on the same symbols
+        os.environ['STOCK_TRAIN_UNIVERSE'] = args.universe
+        TRAIN_STOCKS = load_universe(args.universe)
+    
+    if args.walk_forward:
+        from src.walk_forward import run_walk_forward
+        run_walk_forward(n_folds=args.folds, mode=args.mode, workers=args.workers)
+        raise SystemExit(0)
+    
+    if args.export:
+        train_data, val_data, test_data = load_and_split_data()
+        _, val_seq, _, _ = prepare_sequences(train_data, val_data, None)
+        model = tf.keras.models.load_model(str(Config.MODEL_PATH), compile=False)
+        export_model(model, val_seq)
+        raise SystemExit(0)
+    
+    if args.sweep is not None:
+        from src.sweep import run_sweep, load_space
+        spec = load_space(args.sweep) if args.sweep else {}
+        if args.strategy:
+            spec['strategy'] = args.strategy
+        if args.trials:
+            spec['n_trials'] = args.trials
+        run_sweep(spec, workers=args.workers)
+        raise SystemExit(0)
+    
     gpus = tf.config.list_physical_devices('GPU')
     if gpus:
         try:
@@ -556,4 +766,8 @@ if __name__ == "__main__":
     tf.random.set_seed(42)
     Path("models").mkdir(exist_ok=True)
     
-    model = train()
\ No newline at end of file
+    model = train(run_id=args.resume or args.run_id, resume=bool(args.resume),
+                  checkpoint_every=args.checkpoint_every)
+    
+    if args.profile:
+        tracing.print_profile(tracing.flush(), group='symbol', title="TRAINING STAGE LATENCY")
\ No newline at end of file
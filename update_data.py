@@ -13,14 +13,20 @@ import time
 import sys
 import argparse
 
-# Your portfolio
-DEFAULT_STOCKS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA']
+from config import Config
+from src import tracing
+from src.tracing import span, traced
+from src.universe import resolve_symbols
+
+# Your portfolio (universes/<Config.DEFAULT_UNIVERSE>.txt)
+DEFAULT_STOCKS = Config.SUPPORTED_STOCKS
 
 # Data directory
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
 
+@traced('update', attrs=lambda symbol: {'symbol': symbol})
 def update_stock_csv(symbol: str) -> bool:
     """Update CSV with ALL missing data from yfinance"""
     
@@ -43,7 +49,8 @@ def update_stock_csv(symbol: str) -> bool:
     
     try:
         # Load CSV
-        df = pd.read_csv(csv_path)
+        with span('csv_read'):
+            df = pd.read_csv(csv_path)
         original_len = len(df)
         df.columns = df.columns.str.lower()
         
@@ -89,12 +96,13 @@ def update_stock_csv(symbol: str) -> bool:
         start_date = last_date - timedelta(days=2)  # 2 days before for safety
         end_date = datetime.now() + timedelta(days=1)  # Tomorrow for safety
         
-        # Try history with date range first
-        new_data = ticker.history(start=start_date, end=end_date)
-        
-        # If empty, try period
-        if new_data.empty:
-            new_data = ticker.history(period='1mo')
+        with span('yf_fetch'):
+            # Try history with date range first
+            new_data = ticker.history(start=start_date, end=end_date)
+            
+            # If empty, try period
+            if new_data.empty:
+                new_data = ticker.history(period='1mo')
         
         if new_data.empty:
             print(" ✗")
@@ -151,7 +159,8 @@ def update_stock_csv(symbol: str) -> bool:
         combined = combined.sort_values(date_col)
         
         # Save
-        combined.to_csv(csv_path, index=False)
+        with span('csv_write'):
+            combined.to_csv(csv_path, index=False)
         
         added = len(combined) - original_len
         latest = combined[date_col].max()
@@ -172,15 +181,23 @@ def update_stock_csv(symbol: str) -> bool:
 def main():
     parser = argparse.ArgumentParser(description="Update stock CSVs with missing data")
     parser.add_argument("-s", "--stocks", nargs="+", help="Stocks to update")
+    parser.add_argument("-u", "--universe", help="Named universe, list file or comma list (see src/universe.py)")
+    parser.add_argument("--no-resolve", action="store_true",
+                        help="Skip scoring logged predictions against the new prices")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage latency table and append spans to runs/traces.jsonl")
     args = parser.parse_args()
     
-    symbols = [s.upper() for s in args.stocks] if args.stocks else DEFAULT_STOCKS
+    if args.profile:
+        tracing.enable()
+    
+    symbols = resolve_symbols(args.stocks, args.universe)
     
     print("\n" + "="*70)
     print("📊 STOCK CSV UPDATER")
     print("="*70)
     print(f"⏰ {datetime.now().strftime('%A, %B %d, %Y - %I:%M %p')}")
-    print(f"📈 Stocks: {', '.join(symbols)}")
+    print(f"📈 Stocks: {', '.join(symbols) if len(symbols) <= 20 else f'{len(symbols)} symbols'}")
     
     # Show market status
     now = datetime.now()
@@ -213,6 +230,19 @@ def main():
         print(f"❌ Failed: {failed}/{len(symbols)}")
     print("="*70)
     
+    # Score every logged prediction whose 5-session horizon is now covered
+    if success > 0 and not args.no_resolve:
+        try:
+            from src.outcome_resolver import resolve_outcomes
+            print()
+            with span('resolve'):
+                resolve_outcomes()
+        except Exception as e:
+            print(f"⚠️  Outcome resolver failed: {e}")
+    
+    if args.profile:
+        tracing.print_profile(tracing.flush(), title="UPDATE STAGE LATENCY")
+    
     if success > 0:
         print("\n💡 Next: python predict.py --portfolio\n")
 